@@ -0,0 +1,120 @@
+"""
+Compares decoding of Zephyr search results with dataclasses_json and with the decoders from zephyr.model.decoders.
+Run from the repository root: python -m benchmarks.decoders [--items N] [--repeat N]
+"""
+import argparse
+import dataclasses
+import timeit
+from typing import Callable, Any
+
+from test_management_sync.zephyr.model.decoders import decode_search_result, decode_execution, \
+    decode_testcase_in_tree, decode_requirement
+from test_management_sync.zephyr.model.planning import Execution
+from test_management_sync.zephyr.model.requirements import Requirement
+from test_management_sync.zephyr.model.search import SearchResult
+from test_management_sync.zephyr.model.testcases import TestCaseInTree
+
+
+def raw_testcase_in_tree(index: int) -> dict:
+    return {
+        'id': 500_000 + index,
+        'tcrCatalogTreeId': 42,
+        'testcase': {
+            'id': 100_000 + index,
+            'testcaseId': 200_000 + index,
+            'name': f'test case {index}',
+            'description': f'checks that feature {index} works as expected',
+            'projectId': 1,
+            'releaseId': 2,
+            'writerId': 3,
+            'automated': True,
+            'requirementIds': list(range(index % 10)),
+            'comments': 'created by test-management-sync',
+            'customProperties': {'component': 'core', 'priority': 'high'},
+        },
+        'revision': 1,
+        'stateFlag': 0,
+    }
+
+
+def raw_execution(index: int) -> dict:
+    return {
+        'id': 900_000 + index,
+        'testerId': 7,
+        'cyclePhaseId': 11,
+        'tcrTreeTestcase': raw_testcase_in_tree(index),
+        'lastTestResult': {
+            'id': 800_000 + index,
+            'executionStatus': '1',
+            'executionDate': 1700000000000,
+            'testerId': 7,
+        },
+    }
+
+
+def raw_requirement(index: int) -> dict:
+    return {
+        'id': 300_000 + index,
+        'name': f'requirement {index}',
+        'details': f'feature {index} must work as expected',
+        'requirementTreeId': 5,
+        'releaseIds': [2],
+        'requirementTreeIds': [5],
+        'customProperties': {'component': 'core', 'priority': 'high'},
+    }
+
+
+def raw_search_result(items: list[dict]) -> dict:
+    return {'firstResult': 0, 'resultSize': len(items), 'pageNumber': 1, 'results': items}
+
+
+def skip_unused(value: Any) -> Any:
+    """
+    Resets the fields that fast decoders do not read so the results can be compared
+    """
+    if isinstance(value, Execution):
+        return dataclasses.replace(value, tcr_tree_testcase=skip_unused(value.tcr_tree_testcase))
+    if isinstance(value, TestCaseInTree):
+        return dataclasses.replace(value, testcase=dataclasses.replace(value.testcase, requirement_ids=[]))
+    if isinstance(value, Requirement):
+        return dataclasses.replace(value, release_ids=[], requirement_tree_ids=[], custom_properties={})
+    return value
+
+
+def bench(name: str, raw_items: list[dict], slow: Callable[[dict], Any], fast: Callable[[dict], Any], repeat: int):
+    raw_page = raw_search_result(raw_items)
+
+    def decode_slow():
+        return [slow(item) for item in SearchResult.schema().from_dict(raw_page).results]
+
+    def decode_fast():
+        return [fast(item) for item in decode_search_result(raw_page).results]
+
+    expected = [skip_unused(item) for item in decode_slow()]
+    actual = [skip_unused(item) for item in decode_fast()]
+    if expected != actual:
+        raise AssertionError(f'{name}: fast decoders produce different objects')
+
+    slow_time = min(timeit.repeat(decode_slow, number=1, repeat=repeat))
+    fast_time = min(timeit.repeat(decode_fast, number=1, repeat=repeat))
+    print(f'{name:<16} {len(raw_items):>8} {slow_time * 1000:>20.1f} {fast_time * 1000:>13.1f} '
+          f'{slow_time / fast_time:>7.1f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--items', type=int, default=10_000, help='number of items in one page')
+    parser.add_argument('--repeat', type=int, default=5, help='number of measurements, the best one is printed')
+    args = parser.parse_args()
+
+    print(f'{"model":<16} {"items":>8} {"dataclasses_json, ms":>20} {"decoders, ms":>13} {"speedup":>8}')
+    bench('Execution', [raw_execution(i) for i in range(args.items)],
+          Execution.from_dict, decode_execution, args.repeat)
+    bench('TestCaseInTree', [raw_testcase_in_tree(i) for i in range(args.items)],
+          TestCaseInTree.from_dict, decode_testcase_in_tree, args.repeat)
+    bench('Requirement', [raw_requirement(i) for i in range(args.items)],
+          Requirement.from_dict, decode_requirement, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
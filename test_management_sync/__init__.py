@@ -1,5 +1,6 @@
 # SPDX-FileCopyrightText: Copyright 2024-present Exactpro (Exactpro Systems Limited)
 #
 # SPDX-License-Identifier: Apache-2.0
+from test_management_sync.async_manager import AsyncManager
 from test_management_sync.manager import Manager
-from test_management_sync.model import Requirement, TestCase, Cycle, RootFolder, ExecutionStatus
+from test_management_sync.model import Requirement, TestCase, Cycle, RootFolder, ExecutionStatus, Reconciliation
@@ -0,0 +1,201 @@
+import asyncio
+from pathlib import Path
+from typing import Any, Awaitable, Callable, TypeVar
+
+from test_management_sync.async_service import AsyncService
+from test_management_sync.model import Requirement, Folder, TestCase, Cycle, RootFolder, ExecutionStatus, \
+    AttachedFile, Reconciliation
+from test_management_sync.util import group_tc_by_folder, group_req_by_folder, reconcile
+
+K = TypeVar("K")
+
+
+class AsyncManager:
+    """
+    AsyncManager class provides asyncio API for test management.
+    It mirrors the Manager API, but independent folders and items are processed concurrently
+    """
+
+    def __init__(self, service: AsyncService):
+        if service is None:
+            raise TypeError("service is none")
+        self.service = service
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self.service is not None:
+            await self.service.close()
+
+    async def close(self):
+        await self.service.close()
+
+    async def create_requirements(self, requirements: list[Requirement],
+                                  force: bool = False) -> Reconciliation[Requirement]:
+        """
+        Creates requirements that do not exist yet.
+        Returns the requirements that were created, that already existed
+        and the existing requirements in the same folders that were not requested
+        """
+        async def create_in_folder(folder: Folder, reqs: list[Requirement]) -> Reconciliation[Requirement]:
+            await self.service.create_requirement_folder_if_not_exists(folder)
+            if force:
+                await self.service.remove_requirements(folder)
+                folder_result = reconcile(reqs, [])
+            else:
+                existing_req = await self.service.get_requirements(folder)
+                folder_result = reconcile(reqs, existing_req)
+
+            if folder_result.to_create:
+                await self.service.create_requirements(folder, folder_result.to_create)
+            return folder_result
+
+        req_by_folder = group_req_by_folder(requirements)
+        result = Reconciliation[Requirement]()
+        for folder_result in await asyncio.gather(*(create_in_folder(folder, reqs)
+                                                    for folder, reqs in req_by_folder.items())):
+            result.update(folder_result)
+        return result
+
+    async def create_test_cases(self, test_cases: list[TestCase], force: bool = False) -> Reconciliation[TestCase]:
+        """
+        Creates test cases that do not exist yet.
+        Returns the test cases that were created, that already existed
+        and the existing test cases in the same folders that were not requested
+        """
+        async def create_in_folder(folder: Folder, tcs: list[TestCase]) -> Reconciliation[TestCase]:
+            await self.service.create_testcase_folder_if_not_exists(folder)
+            if force:
+                await self.service.remove_testcases(folder)
+                folder_result = reconcile(tcs, [])
+            else:
+                existing_tc = await self.service.get_testcases(folder)
+                folder_result = reconcile(tcs, existing_tc)
+
+            if folder_result.to_create:
+                await self.service.create_testcases(folder, folder_result.to_create)
+            return folder_result
+
+        tcs_by_folder = group_tc_by_folder(test_cases)
+        result = Reconciliation[TestCase]()
+        for folder_result in await asyncio.gather(*(create_in_folder(folder, tcs)
+                                                    for folder, tcs in tcs_by_folder.items())):
+            result.update(folder_result)
+        return result
+
+    async def map_test_cases_to_requirements(self, mapping: dict[Requirement, list[TestCase]]):
+        await asyncio.gather(*(
+            self.service.map_testcases_to_requirement(req, tc_folder, tcs)
+            for req, testcases in mapping.items()
+            for tc_folder, tcs in group_tc_by_folder(testcases).items()
+        ))
+
+    async def create_cycle(self, cycle: Cycle, force: bool = False):
+        await self.service.create_cycle_if_not_exist(cycle, force)
+
+    async def create_phase_from_testcase_tree(self, cycle: Cycle, phase_root: RootFolder):
+        await self.service.create_phase_if_not_exist(cycle, phase_root)
+        await self.service.assign_test_cases_in_phase(cycle, phase_root.name)
+
+    async def create_phase_from_testcases(self, cycle: Cycle, phase_name: str, test_cases: list[TestCase]):
+        await self.service.create_free_phase_if_not_exist(cycle, phase_name, test_cases)
+        await self.service.assign_test_cases_in_phase(cycle, phase_name)
+
+    async def execution_statuses(self) -> list[ExecutionStatus]:
+        return await self.service.execution_statuses()
+
+    async def execution_status_for_name(self, name: str) -> ExecutionStatus:
+        name_casefold = name.casefold()
+        return next((status for status in await self.execution_statuses()
+                     if status.name.casefold() == name_casefold), None)
+
+    async def execute_testcases(self, cycle: Cycle, status: ExecutionStatus, test_cases: list[TestCase]):
+        tc_by_folder = group_tc_by_folder(test_cases)
+        await self.service.execute_all_test_cases(cycle, status, tc_by_folder)
+
+    async def execute_results(self, cycle: Cycle, results: dict[TestCase, ExecutionStatus]):
+        """
+        Sets the status of each test case in the cycle, the test cases can have different statuses
+        """
+        await self.service.execute_results(cycle, results)
+
+    async def get_last_execution_status_for_testcases(self, cycle: Cycle,
+                                                      test_cases: list[TestCase]) -> dict[TestCase, ExecutionStatus]:
+        tc_by_folder = group_tc_by_folder(test_cases)
+        last_statuses = dict[TestCase, ExecutionStatus]()
+        for result in await asyncio.gather(*(self.service.get_executions_for_test_cases(cycle, folder, tcs)
+                                             for folder, tcs in tc_by_folder.items())):
+            last_statuses.update(result)
+
+        return last_statuses
+
+    async def get_last_execution_status_for_cycle_testcases(self, cycle: Cycle) -> dict[TestCase, ExecutionStatus]:
+        return await self.service.get_executions_for_cycle(cycle)
+
+    async def attach_files_to_requirements(self, attachments: dict[Requirement, list[Path]],
+                                           replace_existing: bool = False):
+        AsyncManager.__check_all_files_unique(attachments)
+        remove_old = dict[Requirement, list[AttachedFile]]()
+        if replace_existing:
+            remove_old = await AsyncManager.__find_old_files(attachments, self.service.get_requirement_attachments)
+
+        await self.service.attache_files_to_requirements(attachments)
+        await asyncio.gather(*(self.service.remove_requirement_attachment(req, old_file)
+                               for req, old_files in remove_old.items() for old_file in old_files))
+
+    async def attach_files_to_testcases(self, attachments: dict[TestCase, list[Path]], replace_existing: bool = False):
+        AsyncManager.__check_all_files_unique(attachments)
+        remove_old = dict[TestCase, list[AttachedFile]]()
+        if replace_existing:
+            remove_old = await AsyncManager.__find_old_files(attachments, self.service.get_testcase_attachments)
+
+        await self.service.attache_files_to_testcases(attachments)
+        await asyncio.gather(*(self.service.remove_testcase_attachment(tc, old_file)
+                               for tc, old_files in remove_old.items() for old_file in old_files))
+
+    async def attach_files_to_executions(self, cycle: Cycle, attachments: dict[TestCase, list[Path]],
+                                         replace_existing: bool = False):
+        AsyncManager.__check_all_files_unique(attachments)
+        remove_old = dict[TestCase, list[AttachedFile]]()
+        if replace_existing:
+            remove_old = await AsyncManager.__find_old_files(
+                attachments, lambda tc: self.service.get_execution_attachments(cycle, tc))
+
+        await self.service.attache_files_to_testcases_executions(cycle, attachments)
+        await asyncio.gather(*(self.service.remove_execution_attachment(cycle, tc, old_file)
+                               for tc, old_files in remove_old.items() for old_file in old_files))
+
+    @staticmethod
+    async def __find_old_files(
+            attachments: dict[K, list[Path]],
+            get_attachments: Callable[[K], Awaitable[list[AttachedFile]]],
+    ) -> dict[K, list[AttachedFile]]:
+        items = list(attachments.keys())
+        existing = await asyncio.gather(*(get_attachments(item) for item in items))
+        return {item: AsyncManager.__find_attached_files(attachments[item], item_attachments)
+                for item, item_attachments in zip(items, existing)}
+
+    @staticmethod
+    def __find_attached_files(files: list[Path], attachments: list[AttachedFile]) -> list[AttachedFile]:
+        attached_files = []
+        for attachment in attachments:
+            for file in files:
+                if file.name == attachment.name:
+                    attached_files.append(attachment)
+                    break
+        return attached_files
+
+    @staticmethod
+    def __check_all_files_unique(attachments: dict[Any, list[Path]]):
+        for key, files in attachments.items():
+            unique_files = set[Path]()
+            duplicates = list[Path]()
+            for f in files:
+                if f in unique_files:
+                    duplicates.append(f)
+                else:
+                    unique_files.add(f)
+            if duplicates:
+                duplicated_paths = list(map(lambda d: str(d), duplicates))
+                raise ValueError(f'duplicated files in attachments: {duplicated_paths}')
@@ -0,0 +1,107 @@
+from abc import ABC
+from pathlib import Path
+
+from test_management_sync.model import Folder, Requirement, TestCase, Cycle, RootFolder, ExecutionStatus, AttachedFile
+from test_management_sync.util import group_tc_by_folder, group_by_status
+
+
+class AsyncService(ABC):
+    """
+    AsyncService class provides asyncio API to access the test management platform.
+    Methods of one instance can be called concurrently from the same event loop
+    """
+
+    async def create_requirement_folder_if_not_exists(self, folder: Folder):
+        pass
+
+    async def create_requirements(self, folder: Folder, requirements: list[Requirement]):
+        pass
+
+    async def get_requirements(self, folder: Folder) -> list[Requirement]:
+        pass
+
+    async def remove_requirements(self, folder: Folder):
+        pass
+
+    async def create_testcase_folder_if_not_exists(self, folder: Folder):
+        pass
+
+    async def remove_testcases(self, folder: Folder):
+        pass
+
+    async def get_testcases(self, folder: Folder) -> list[TestCase]:
+        pass
+
+    async def create_testcases(self, folder: Folder, tc_to_create: list[TestCase]):
+        pass
+
+    async def map_testcases_to_requirement(self, req: Requirement, tc_folder: Folder, tcs: list[TestCase]):
+        pass
+
+    async def create_cycle_if_not_exist(self, cycle: Cycle, delete_if_exist: bool):
+        pass
+
+    async def create_phase_if_not_exist(self, cycle: Cycle, phase_root: RootFolder):
+        pass
+
+    async def create_free_phase_if_not_exist(self, cycle: Cycle, phase_name: str, test_cases: list[TestCase]):
+        pass
+
+    async def execution_statuses(self) -> list[ExecutionStatus]:
+        pass
+
+    async def execute_test_case(self, cycle: Cycle, status: ExecutionStatus, folder: Folder, tcs: list[TestCase]):
+        pass
+
+    async def execute_all_test_cases(self, cycle: Cycle, status: ExecutionStatus,
+                                     tcs_by_folder: dict[Folder, list[TestCase]]):
+        pass
+
+    async def execute_results(self, cycle: Cycle, results: dict[TestCase, ExecutionStatus]):
+        """
+        Sets the status of each test case in the cycle.
+        By default, test cases with the same status are executed together
+        """
+        for status, tcs in group_by_status(results):
+            await self.execute_all_test_cases(cycle, status, group_tc_by_folder(tcs))
+
+    async def close(self):
+        pass
+
+    async def assign_test_cases_in_phase(self, cycle: Cycle, phase_name: str):
+        pass
+
+    async def attache_files_to_requirements(self, attachments: dict[Requirement, list[Path]]):
+        pass
+
+    async def attache_files_to_testcases(self, attachments: dict[TestCase, list[Path]]):
+        pass
+
+    async def attache_files_to_testcases_executions(self, cycle: Cycle, attachments: dict[TestCase, list[Path]]):
+        pass
+
+    async def get_requirement_attachments(self, req: Requirement) -> list[AttachedFile]:
+        pass
+
+    async def remove_requirement_attachment(self, req: Requirement, old_file: AttachedFile):
+        pass
+
+    async def get_testcase_attachments(self, tc: TestCase) -> list[AttachedFile]:
+        pass
+
+    async def remove_testcase_attachment(self, tc: TestCase, old_file: AttachedFile):
+        pass
+
+    async def get_execution_attachments(self, cycle: Cycle, tc: TestCase) -> list[AttachedFile]:
+        pass
+
+    async def remove_execution_attachment(self, cycle: Cycle, tc: TestCase, old_file: AttachedFile):
+        pass
+
+    async def get_executions_for_test_cases(self, cycle: Cycle, folder: Folder,
+                                      tcs: list[TestCase]) -> dict[TestCase, ExecutionStatus]:
+        pass
+
+    async def get_executions_for_cycle(self, cycle: Cycle) -> dict[TestCase, ExecutionStatus]:
+        pass
+
@@ -2,9 +2,10 @@ from collections import defaultdict
 from pathlib import Path
 from typing import Any
 
-from test_management_sync.model import Requirement, Folder, TestCase, Cycle, RootFolder, ExecutionStatus, AttachedFile
+from test_management_sync.model import Requirement, Folder, TestCase, Cycle, RootFolder, ExecutionStatus, \
+    AttachedFile, Reconciliation
 from test_management_sync.service import Service
-from test_management_sync.util import group_tc_by_folder
+from test_management_sync.util import group_tc_by_folder, reconcile
 
 
 class Manager:
@@ -27,37 +28,53 @@ class Manager:
     def close(self):
         self.service.close()
 
-    def create_requirements(self, requirements: list[Requirement], force: bool = False):
+    def create_requirements(self, requirements: list[Requirement], force: bool = False) -> Reconciliation[Requirement]:
+        """
+        Creates requirements that do not exist yet.
+        Returns the requirements that were created, that already existed
+        and the existing requirements in the same folders that were not requested
+        """
         req_by_folder = defaultdict[Folder, list[Requirement]](list)
         for req in requirements:
             req_by_folder[req.folder].append(req)
 
+        result = Reconciliation[Requirement]()
         for folder, reqs in req_by_folder.items():
             self.service.create_requirement_folder_if_not_exists(folder)
             if force:
                 self.service.remove_requirements(folder)
-                req_to_create = reqs
+                folder_result = reconcile(reqs, [])
             else:
                 existing_req = self.service.get_requirements(folder)
-                req_to_create = [req for req in reqs if req not in existing_req]
-
-            if req_to_create:
-                self.service.create_requirements(folder, req_to_create)
-
-    def create_test_cases(self, test_cases: list[TestCase], force: bool = False):
+                folder_result = reconcile(reqs, existing_req)
+
+            if folder_result.to_create:
+                self.service.create_requirements(folder, folder_result.to_create)
+            result.update(folder_result)
+        return result
+
+    def create_test_cases(self, test_cases: list[TestCase], force: bool = False) -> Reconciliation[TestCase]:
+        """
+        Creates test cases that do not exist yet.
+        Returns the test cases that were created, that already existed
+        and the existing test cases in the same folders that were not requested
+        """
         tcs_by_folder = group_tc_by_folder(test_cases)
 
+        result = Reconciliation[TestCase]()
         for folder, tcs in tcs_by_folder.items():
             self.service.create_testcase_folder_if_not_exists(folder)
             if force:
                 self.service.remove_testcases(folder)
-                tc_to_create = tcs
+                folder_result = reconcile(tcs, [])
             else:
                 existing_tc = self.service.get_testcases(folder)
-                tc_to_create = [tc for tc in tcs if tc not in existing_tc]
+                folder_result = reconcile(tcs, existing_tc)
 
-            if tc_to_create:
-                self.service.create_testcases(folder, tc_to_create)
+            if folder_result.to_create:
+                self.service.create_testcases(folder, folder_result.to_create)
+            result.update(folder_result)
+        return result
 
     def map_test_cases_to_requirements(self, mapping: dict[Requirement, list[TestCase]]):
         for req, testcases in mapping.items():
@@ -87,6 +104,12 @@ class Manager:
         tc_by_folder = group_tc_by_folder(test_cases)
         self.service.execute_all_test_cases(cycle, status, tc_by_folder)
 
+    def execute_results(self, cycle: Cycle, results: dict[TestCase, ExecutionStatus]):
+        """
+        Sets the status of each test case in the cycle, the test cases can have different statuses
+        """
+        self.service.execute_results(cycle, results)
+
     def get_last_execution_status_for_testcases(self, cycle: Cycle,
                                                 test_cases: list[TestCase]) -> dict[TestCase, ExecutionStatus]:
         tc_by_folder = group_tc_by_folder(test_cases)
@@ -1,5 +1,8 @@
 from dataclasses import dataclass, field
 from datetime import date
+from typing import TypeVar, Generic
+
+T = TypeVar("T")
 
 
 @dataclass(unsafe_hash=True, frozen=True)
@@ -68,3 +71,21 @@ class RootFolder(Folder):
 class AttachedFile:
     id: str
     name: str
+
+
+@dataclass
+class Reconciliation(Generic[T]):
+    """
+    Result of comparing the requested items with the items existing in the test management platform
+    """
+    # requested items that do not exist
+    to_create: list[T] = field(default_factory=list)
+    # requested items that already exist
+    present: list[T] = field(default_factory=list)
+    # existing items that were not requested
+    extra: list[T] = field(default_factory=list)
+
+    def update(self, other: 'Reconciliation[T]'):
+        self.to_create.extend(other.to_create)
+        self.present.extend(other.present)
+        self.extra.extend(other.extra)
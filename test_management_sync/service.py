@@ -2,6 +2,7 @@ from abc import ABC
 from pathlib import Path
 
 from test_management_sync.model import Folder, Requirement, TestCase, Cycle, RootFolder, ExecutionStatus, AttachedFile
+from test_management_sync.util import group_tc_by_folder, group_by_status
 
 
 class Service(ABC):
@@ -54,6 +55,14 @@ class Service(ABC):
     def execute_all_test_cases(self, cycle: Cycle, status: ExecutionStatus, tcs_by_folder: dict[Folder, list[TestCase]]):
         pass
 
+    def execute_results(self, cycle: Cycle, results: dict[TestCase, ExecutionStatus]):
+        """
+        Sets the status of each test case in the cycle.
+        By default, test cases with the same status are executed together
+        """
+        for status, tcs in group_by_status(results):
+            self.execute_all_test_cases(cycle, status, group_tc_by_folder(tcs))
+
     def close(self):
         pass
 
@@ -1,6 +1,9 @@
 from collections import defaultdict
+from typing import TypeVar, Union
 
-from test_management_sync.model import TestCase, Folder, Requirement
+from test_management_sync.model import TestCase, Folder, Requirement, Reconciliation, ExecutionStatus
+
+T = TypeVar("T", bound=Union[TestCase, Requirement])
 
 
 def group_tc_by_folder(test_cases: list[TestCase]) -> dict[Folder, list[TestCase]]:
@@ -15,3 +18,34 @@ def group_req_by_folder(requirements: list[Requirement]) -> dict[Folder, list[Re
     for req in requirements:
         req_by_folder[req.folder].append(req)
     return req_by_folder
+
+
+def group_by_status(results: dict[TestCase, ExecutionStatus]) -> list[tuple[ExecutionStatus, list[TestCase]]]:
+    """
+    Groups test cases by the id of their status in the order of the first occurrence of each status
+    """
+    groups = dict[str, tuple[ExecutionStatus, list[TestCase]]]()
+    for tc, status in results.items():
+        groups.setdefault(status.id, (status, []))[1].append(tc)
+    return list(groups.values())
+
+
+def reconcile(requested: list[T], existing: list[T]) -> Reconciliation[T]:
+    """
+    Compares requested and existing items from the same folder by name and description.
+    Duplicated requested items are reported only once
+    """
+    existing_by_key = {(item.name, item.description): item for item in existing}
+    requested_keys = set[tuple[str, str]]()
+    result = Reconciliation[T]()
+    for item in requested:
+        key = (item.name, item.description)
+        if key in requested_keys:
+            continue
+        requested_keys.add(key)
+        if key in existing_by_key:
+            result.present.append(item)
+        else:
+            result.to_create.append(item)
+    result.extra.extend(item for key, item in existing_by_key.items() if key not in requested_keys)
+    return result
@@ -1,4 +1,10 @@
 # SPDX-FileCopyrightText: Copyright 2024-present Exactpro (Exactpro Systems Limited)
 #
 # SPDX-License-Identifier: Apache-2.0
+from test_management_sync.zephyr.actions.search import SearchOptions, SearchEndpoint, PageSize, AdaptivePageSize
+from test_management_sync.zephyr.filters import CycleFilter
+from test_management_sync.zephyr.http_cache import CacheOptions
 from test_management_sync.zephyr.service import ZephyrService
+from test_management_sync.zephyr.session import ConnectionOptions
+from test_management_sync.zephyr.throttling import ThrottlingOptions
+from test_management_sync.zephyr.tree import TreeLoadingStrategy
@@ -1,10 +1,15 @@
+from typing import Callable, Iterator, TypeVar
+
 from requests import Session
 
-from test_management_sync.zephyr.actions.search import find
+from test_management_sync.zephyr.actions.search import iter_find, SearchOptions
+from test_management_sync.zephyr.model.decoders import decode_execution
 from test_management_sync.zephyr.model.testcases import TestCaseTreeNode
 from test_management_sync.zephyr.model.planning import Cycle, Phase, Execution, AssignmentTree, \
     TestCasesAssignment, ExecutionsStatusUpdate
 
+K = TypeVar("K")
+
 
 def create_cycle(session: Session, cycle: Cycle) -> Cycle:
     r = session.post(
@@ -22,12 +27,39 @@ def delete_cycle(session: Session, cycle: Cycle):
     r.raise_for_status()
 
 
-def get_cycles_for_release(session: Session, release_id: int) -> list[Cycle]:
+def get_cycles_for_release(session: Session, release_id: int,
+                           predicate: Callable[[dict], bool] = None) -> list[Cycle]:
+    """
+    :param predicate: if set only the cycles which JSON representation matches the predicate are decoded
+    """
+    r = session.get(
+        f'/flex/services/rest/v3/cycle/release/{release_id}',
+    )
+    r.raise_for_status()
+    raw_cycles = r.json()
+    if predicate is not None:
+        raw_cycles = [raw_cycle for raw_cycle in raw_cycles if predicate(raw_cycle)]
+    return Cycle.schema().load(raw_cycles, many=True)
+
+
+def get_cycle_ids_for_release(session: Session, release_id: int, key: Callable[[dict], K]) -> dict[K, int]:
+    """
+    Returns ids of the cycles in the release by the key of their JSON representation.
+    The cycles and their phases are not decoded
+    """
     r = session.get(
         f'/flex/services/rest/v3/cycle/release/{release_id}',
     )
     r.raise_for_status()
-    return Cycle.schema().load(r.json(), many=True)
+    return {key(raw_cycle): raw_cycle['id'] for raw_cycle in r.json()}
+
+
+def get_cycle(session: Session, cycle_id: int) -> Cycle:
+    r = session.get(
+        f'/flex/services/rest/v3/cycle/{cycle_id}',
+    )
+    r.raise_for_status()
+    return Cycle.from_dict(r.json())
 
 
 def create_cycle_phase_from_test_case_tree(
@@ -89,8 +121,14 @@ def assign_all_unassigned_to_user(session: Session, phase: Phase, assignment_nod
     r.raise_for_status()
 
 
-def get_executions_for_cycle_phase(session: Session, release_id: int, phase: Phase) -> list[Execution]:
-    return find(
+def get_executions_for_cycle_phase(session: Session, release_id: int, phase: Phase,
+                                   options: SearchOptions = None) -> list[Execution]:
+    return list(iter_executions_for_cycle_phase(session, release_id, phase, options))
+
+
+def iter_executions_for_cycle_phase(session: Session, release_id: int, phase: Phase,
+                                    options: SearchOptions = None) -> Iterator[Execution]:
+    return iter_find(
         session=session,
         uri='/flex/services/rest/v3/execution',
         extra_params={
@@ -100,7 +138,8 @@ def get_executions_for_cycle_phase(session: Session, release_id: int, phase: Pha
             'isascorder': True,
             'order': 'orderId',
         },
-        mapper=Execution.from_dict,
+        mapper=decode_execution,
+        options=options,
     )
 
 
@@ -1,6 +1,7 @@
 from requests import Session
 
-from test_management_sync.zephyr.actions.search import find
+from test_management_sync.zephyr.actions.search import find, SearchOptions
+from test_management_sync.zephyr.model.decoders import decode_requirement
 from test_management_sync.zephyr.model.requirements import Requirement, RequirementTreeNode, \
     BulkRequirementTestCasesMapping, TreePath, DeleteAllRequest
 from test_management_sync.zephyr.model.testcases import TestCaseInTree, TestCaseTreeNode
@@ -15,7 +16,8 @@ def new_requirement(session: Session, requirement: Requirement) -> Requirement:
     return Requirement.from_dict(r.json())
 
 
-def find_requirements(session: Session, release_id: int, node: RequirementTreeNode) -> list[Requirement]:
+def find_requirements(session: Session, release_id: int, node: RequirementTreeNode,
+                      options: SearchOptions = None) -> list[Requirement]:
     return find(
         session,
         uri='/flex/services/rest/v3/requirement',
@@ -23,7 +25,8 @@ def find_requirements(session: Session, release_id: int, node: RequirementTreeNo
             'requirementtreeid': node.id,
             'releaseid': release_id,
         },
-        mapper=Requirement.from_dict,
+        mapper=decode_requirement,
+        options=options,
     )
 
 
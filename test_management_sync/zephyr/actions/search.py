@@ -1,33 +1,324 @@
-from typing import TypeVar, Callable
+import enum
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from contextlib import closing
+from dataclasses import dataclass, field
+from typing import TypeVar, Callable, Iterator, Optional, Generator, NamedTuple
 
-from requests import Session
+from requests import Session, RequestException, HTTPError
 
-from test_management_sync.zephyr.model.search import SearchResult
+from test_management_sync.zephyr.metrics import operation, current_operation, endpoint_template
+from test_management_sync.zephyr.model.decoders import decode_search_result
 
 T = TypeVar("T")
 
 
-def find(session: Session, uri: str, extra_params: dict, mapper: Callable[[dict], T]) -> list[T]:
-    result = []
-    offset = 0
-    next_request = True
-    page_size = 100
+class SearchEndpoint(enum.Enum):
+    EXECUTIONS = 'executions'
+    TESTCASES = 'testcases'
+    RELEASE_TESTCASES = 'release_testcases'
+    REQUIREMENTS = 'requirements'
 
-    while next_request:
+
+@dataclass(frozen=True)
+class PageStats:
+    """
+    Statistics of the pages requested with one page size
+    """
+    # page size that is used for the next request
+    page_size: int
+    pages: int
+    items: int
+    errors: int
+    # total time in seconds spent on successful requests
+    latency: float
+    # total size of successful responses in bytes
+    payload_bytes: int
+
+    @property
+    def mean_latency(self) -> float:
+        return self.latency / self.pages if self.pages else 0.0
+
+    @property
+    def items_per_second(self) -> float:
+        return self.items / self.latency if self.latency else 0.0
+
+
+class PageSize:
+    """
+    Fixed page size of paginated searches. Collects statistics of the requested pages
+    """
+
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError(f'page size must be positive but was {size}')
+        self._size = size
+        self._lock = threading.Lock()
+        self.__pages = 0
+        self.__items = 0
+        self.__errors = 0
+        self.__latency = 0.0
+        self.__payload_bytes = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def on_page(self, size: int, items: int, latency: float, payload_bytes: int):
+        with self._lock:
+            self.__pages += 1
+            self.__items += items
+            self.__latency += latency
+            self.__payload_bytes += payload_bytes
+            self._adjust(size, items, latency, payload_bytes)
+
+    def on_error(self, size: int) -> bool:
+        """
+        :return: True if the page size was decreased and the page can be requested again with the new size
+        """
+        with self._lock:
+            self.__errors += 1
+            return self._shrink(size)
+
+    def stats(self) -> PageStats:
+        with self._lock:
+            return PageStats(page_size=self._size, pages=self.__pages, items=self.__items, errors=self.__errors,
+                             latency=self.__latency, payload_bytes=self.__payload_bytes)
+
+    def _adjust(self, size: int, items: int, latency: float, payload_bytes: int):
+        pass
+
+    def _shrink(self, size: int) -> bool:
+        return False
+
+
+class AdaptivePageSize(PageSize):
+    """
+    Page size that grows while the responses are fast and small enough
+    and shrinks when the server slows down, the responses are too big or the requests fail.
+    Only the pages requested with the current size are taken into account.
+    Sizes that failed are not used again
+    """
+
+    def __init__(self, initial_size: int = 100, min_size: int = 25, max_size: int = 2000,
+                 target_latency: float = 2.0, max_payload_bytes: int = 8 * 1024 * 1024,
+                 growth_factor: float = 2.0, shrink_factor: float = 0.5, stable_pages: int = 3):
+        """
+        :param target_latency: max time in seconds of one page request
+        :param max_payload_bytes: max size of one page response
+        :param stable_pages: number of consecutive fast full pages required to increase the size
+        """
+        super().__init__(initial_size)
+        if not min_size <= initial_size <= max_size:
+            raise ValueError(f'initial size {initial_size} must be in range [{min_size}, {max_size}]')
+        if growth_factor <= 1 or not 0 < shrink_factor < 1:
+            raise ValueError(f'growth factor must be greater than 1 and shrink factor must be in range (0, 1) '
+                             f'but were {growth_factor} and {shrink_factor}')
+        self.__min_size = min_size
+        self.__max_size = max_size
+        self.__target_latency = target_latency
+        self.__max_payload_bytes = max_payload_bytes
+        self.__growth_factor = growth_factor
+        self.__shrink_factor = shrink_factor
+        self.__stable_pages = stable_pages
+        self.__fast_pages = 0
+        # the largest size that was requested successfully
+        self.__succeeded_size = 0
+
+    def _adjust(self, size: int, items: int, latency: float, payload_bytes: int):
+        if size != self._size:
+            return
+        self.__succeeded_size = max(self.__succeeded_size, size)
+        if latency > self.__target_latency or payload_bytes > self.__max_payload_bytes:
+            self.__resize(int(size * self.__shrink_factor))
+        elif items == size and latency * 2 < self.__target_latency and payload_bytes * 2 < self.__max_payload_bytes:
+            # short pages say nothing about how the server handles bigger ones
+            self.__fast_pages += 1
+            if self.__fast_pages >= self.__stable_pages:
+                self.__resize(int(size * self.__growth_factor))
+
+    def _shrink(self, size: int) -> bool:
+        if size != self._size:
+            # already decreased by another request
+            return self._size < size
+        smaller_size = int(size * self.__shrink_factor)
+        if self.__succeeded_size < size:
+            # the size is not increased up to the failed one again
+            self.__max_size = max(self.__min_size, self.__succeeded_size, smaller_size)
+        self.__resize(smaller_size)
+        return self._size < size
+
+    def __resize(self, size: int):
+        self._size = min(self.__max_size, max(self.__min_size, size))
+        self.__fast_pages = 0
+
+
+@dataclass(frozen=True)
+class SearchOptions:
+    """
+    Options of paginated searches
+    """
+    # the next page is requested in background while the current one is consumed.
+    # Each search that uses it starts its own thread, so it is disabled by default
+    prefetch: bool = False
+    # if greater than one the total number of results is taken from the first page
+    # and the remaining pages are requested concurrently by at most this number of threads.
+    # The page size is fixed for the concurrently requested pages and failed pages are not requested again
+    parallel_pages: int = 1
+    # if not set the default page size of the request is used
+    page_size: Optional[PageSize] = field(default=None)
+
+    def __post_init__(self):
+        if self.parallel_pages < 1:
+            raise ValueError(f'parallel pages must be positive but was {self.parallel_pages}')
+
+
+def find(session: Session, uri: str, extra_params: dict, mapper: Callable[[dict], T], page_size: int = 100,
+         options: SearchOptions = None) -> list[T]:
+    return list(iter_find(session, uri, extra_params, mapper, page_size, options))
+
+
+def iter_find(session: Session, uri: str, extra_params: dict, mapper: Callable[[dict], T],
+              page_size: int = 100, options: SearchOptions = None) -> Iterator[T]:
+    """
+    Yields found items page by page so only the pages that are being requested or consumed are kept in memory.
+    Pages are yielded in order regardless of the options
+    """
+    if options is None:
+        options = SearchOptions()
+    sizer = options.page_size if options.page_size is not None else PageSize(page_size)
+    # pages can be requested by other threads, so the operation is passed explicitly
+    label = current_operation() or f'find {endpoint_template(uri)}'
+    request = _PageRequest(session, uri, extra_params, mapper, sizer, label)
+    first_page, first_size = request.get_with_retries(0)
+    if len(first_page.items) < first_size:
+        yield from first_page.items
+        return
+
+    if options.parallel_pages > 1:
+        pages = _iter_pages_parallel(request, first_page, first_size, options)
+    else:
+        pages = _iter_pages(request, first_page.items, first_size, options.prefetch)
+    with closing(pages):
+        for page in pages:
+            yield from page
+
+
+class _Page(NamedTuple):
+    result_size: int
+    items: list
+
+
+class _PageRequest:
+    def __init__(self, session: Session, uri: str, extra_params: dict, mapper: Callable[[dict], T],
+                 sizer: PageSize, label: str):
+        self.session = session
+        self.uri = uri
+        self.extra_params = extra_params
+        self.mapper = mapper
+        self.sizer = sizer
+        self.label = label
+
+    def get_with_retries(self, offset: int) -> tuple[_Page, int]:
+        """
+        Requests the page with the current page size.
+        If the request fails and the page size is decreased the page is requested again with the new size
+        """
+        while True:
+            size = self.sizer.size
+            try:
+                return self.get(offset, size), size
+            except RequestException as e:
+                if isinstance(e, HTTPError) and e.response is not None and e.response.status_code < 500:
+                    raise
+                if not self.sizer.on_error(size):
+                    raise
+
+    def get(self, offset: int, size: int) -> _Page:
         search_params = {
             'offset': offset,
-            'pagesize': page_size,
+            'pagesize': size,
         }
-        search_params.update(extra_params)
-        r = session.get(uri, params=search_params)
+        search_params.update(self.extra_params)
+        start = time.monotonic()
+        with operation(self.label):
+            r = self.session.get(self.uri, params=search_params)
         r.raise_for_status()
+        latency = time.monotonic() - start
+        search_result = decode_search_result(r.json())
+        self.sizer.on_page(size, len(search_result.results), latency, len(r.content))
+        return _Page(result_size=search_result.result_size, items=list(map(self.mapper, search_result.results)))
+
+
+def _iter_pages(request: _PageRequest, page: list, size: int, prefetch: bool,
+                 offset: int = 0) -> Generator[list, None, None]:
+    """
+    Yields the given page and the following ones until a page is not full.
+    The next page is known only after the current one is received
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='zephyr-find') if prefetch else None
+    try:
+        while True:
+            has_next = len(page) == size
+            offset += len(page)
+            next_page: Optional[Future] = None
+            if has_next and executor is not None:
+                next_page = executor.submit(request.get_with_retries, offset)
+
+            yield page
+
+            if not has_next:
+                return
+            if next_page is not None:
+                search_page, size = next_page.result()
+            else:
+                search_page, size = request.get_with_retries(offset)
+            page = search_page.items
+    finally:
+        if executor is not None:
+            # the generator can be closed before all pages are consumed
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _iter_pages_parallel(request: _PageRequest, first_page: _Page, size: int,
+                          options: SearchOptions) -> Generator[list, None, None]:
+    """
+    Yields the first page and requests the remaining ones concurrently using the total from the first page
+    """
+    offsets = iter(range(size, first_page.result_size, size))
+    executor = ThreadPoolExecutor(max_workers=options.parallel_pages, thread_name_prefix='zephyr-find')
+    try:
+        pending = deque[tuple[int, Future]]()
+
+        def submit_next():
+            next_offset = next(offsets, None)
+            if next_offset is not None:
+                pending.append((next_offset, executor.submit(request.get, next_offset, size)))
+
+        for _ in range(options.parallel_pages):
+            submit_next()
 
-        search_result = SearchResult.schema().from_dict(r.json())
-        search_result_objects = search_result.results
-        next_request = len(search_result_objects) == page_size
-        for r in search_result_objects:
-            result.append(mapper(r))
-        offset += page_size
+        yield first_page.items
 
-    return result
+        offset, page = 0, first_page.items
+        while pending:
+            offset, future = pending.popleft()
+            try:
+                page = future.result().items
+            except RequestException:
+                request.sizer.on_error(size)
+                raise
+            submit_next()
+            yield page
+            if len(page) < size:
+                return
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
+    if len(page) == size:
+        # results were added after the first page was received
+        offset += size
+        search_page, next_size = request.get_with_retries(offset)
+        yield from _iter_pages(request, search_page.items, next_size, options.prefetch, offset)
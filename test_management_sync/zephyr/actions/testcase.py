@@ -1,6 +1,9 @@
+from typing import Iterator
+
 from requests import Session
 
-from test_management_sync.zephyr.actions.search import find
+from test_management_sync.zephyr.actions.search import iter_find, SearchOptions
+from test_management_sync.zephyr.model.decoders import decode_testcase_in_tree
 from test_management_sync.zephyr.model.testcases import TestCaseInTree, TestCaseTreeNode, DeleteAllRequest
 
 
@@ -22,8 +25,14 @@ def new_test_cases(session: Session, test_cases: list[TestCaseInTree]) -> list[T
     return TestCaseInTree.schema().load(r.json(), many=True)
 
 
-def get_test_cases_for_node(session: Session, node: TestCaseTreeNode) -> list[TestCaseInTree]:
-    return find(
+def get_test_cases_for_node(session: Session, node: TestCaseTreeNode,
+                            options: SearchOptions = None) -> list[TestCaseInTree]:
+    return list(iter_test_cases_for_node(session, node, options))
+
+
+def iter_test_cases_for_node(session: Session, node: TestCaseTreeNode,
+                             options: SearchOptions = None) -> Iterator[TestCaseInTree]:
+    return iter_find(
         session=session,
         uri=f'/flex/services/rest/v3/testcase/tree/{node.id}',
         extra_params={
@@ -31,7 +40,30 @@ def get_test_cases_for_node(session: Session, node: TestCaseTreeNode) -> list[Te
             'order': 'orderId',
             'isascorder': True,
         },
-        mapper=TestCaseInTree.from_dict,
+        mapper=decode_testcase_in_tree,
+        options=options,
+    )
+
+
+def get_test_cases_for_release(session: Session, release_id: int, page_size: int = 1000,
+                               options: SearchOptions = None) -> list[TestCaseInTree]:
+    return list(iter_test_cases_for_release(session, release_id, page_size, options))
+
+
+def iter_test_cases_for_release(session: Session, release_id: int, page_size: int = 1000,
+                                options: SearchOptions = None) -> Iterator[TestCaseInTree]:
+    return iter_find(
+        session=session,
+        uri='/flex/services/rest/v3/testcase',
+        extra_params={
+            'releaseid': release_id,
+            'dbsearch': True,
+            'order': 'orderId',
+            'isascorder': True,
+        },
+        mapper=decode_testcase_in_tree,
+        page_size=page_size,
+        options=options,
     )
 
 
@@ -25,6 +25,13 @@ def get_test_case_tree_sub_nodes(session: Session, release_id: int, parent: Test
     return _get_test_case_tree_node(session, release_id, 'Module', parent.id)
 
 
+def get_all_test_case_tree_sub_nodes(session: Session, release_id: int) -> list[TestCaseTreeNode]:
+    """
+    Returns all nodes that are not root nodes in the release. Nodes should be linked using the parent id
+    """
+    return _get_test_case_tree_node(session, release_id, 'Module')
+
+
 def _get_test_case_tree_node(session: Session, release_id: int, note_type: str, parent_id: int = None):
     params = {
         'type': note_type,
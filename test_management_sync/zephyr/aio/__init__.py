@@ -0,0 +1,5 @@
+# SPDX-FileCopyrightText: Copyright 2024-present Exactpro (Exactpro Systems Limited)
+#
+# SPDX-License-Identifier: Apache-2.0
+from test_management_sync.zephyr.aio.service import AsyncZephyrService
+from test_management_sync.zephyr.aio.session import AsyncZephyrSession
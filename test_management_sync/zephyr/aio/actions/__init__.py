@@ -0,0 +1,3 @@
+# SPDX-FileCopyrightText: Copyright 2024-present Exactpro (Exactpro Systems Limited)
+#
+# SPDX-License-Identifier: Apache-2.0
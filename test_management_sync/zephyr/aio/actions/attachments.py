@@ -0,0 +1,78 @@
+import asyncio
+from pathlib import Path
+
+import aiohttp
+
+from test_management_sync.zephyr.actions.attachments import ItemType
+from test_management_sync.zephyr.aio.session import AsyncZephyrSession
+from test_management_sync.zephyr.model.attachments import UploadResult, AttachmentRequest, Attachment
+
+
+async def upload_files(session: AsyncZephyrSession, item_type: ItemType,
+                       files_to_upload: list[Path]) -> dict[Path, UploadResult]:
+    """
+    Files are uploaded in batches of about 1MB, the batches are uploaded concurrently
+    """
+    field_name_to_file = dict[str, Path]()
+    batches = list[aiohttp.FormData]()
+    batch_limit = 1024 * 1024  # 1MB
+    batch_size_bytes = 0
+    form = aiohttp.FormData()
+
+    async def upload(data: aiohttp.FormData) -> list[UploadResult]:
+        r = await session.post(
+            '/flex/upload/document/genericattachment',
+            data=data,
+        )
+        r.raise_for_status()
+        return UploadResult.schema().load(r.json(), many=True)
+
+    for index, file in enumerate(files_to_upload):
+        field_name = f'{item_type.http_type}{index}'
+        form.add_field(field_name, file.read_bytes(), filename=file.name, content_type='text/plain')
+        field_name_to_file[field_name] = file
+        batch_size_bytes += file.stat().st_size
+        if batch_size_bytes < batch_limit:
+            continue
+        batches.append(form)
+        form = aiohttp.FormData()
+        batch_size_bytes = 0
+
+    if batch_size_bytes > 0:
+        batches.append(form)
+
+    file_to_result = dict[Path, UploadResult]()
+    for upload_results in await asyncio.gather(*(upload(batch) for batch in batches)):
+        for upload_result in upload_results:
+            file = field_name_to_file[upload_result.field_name]
+            file_to_result[file] = upload_result
+    return file_to_result
+
+
+async def attach_files(session: AsyncZephyrSession, attachments: list[AttachmentRequest]):
+    r = await session.post(
+        '/flex/services/rest/v3/attachment/list',
+        json=AttachmentRequest.schema().dump(attachments, many=True),
+    )
+    r.raise_for_status()
+
+
+async def get_attached_files(session: AsyncZephyrSession, item_type: ItemType, item_id: int,
+                             is_link: bool) -> list[Attachment]:
+    r = await session.get(
+        '/flex/services/rest/v3/attachment',
+        params={
+            'itemid': item_id,
+            'type': item_type.http_type,
+            'isLink': is_link,
+        }
+    )
+    r.raise_for_status()
+    return Attachment.schema().load(r.json(), many=True)
+
+
+async def delete_attachment(session: AsyncZephyrSession, attachment_id: int):
+    r = await session.delete(
+        f'/flex/services/rest/v3/attachment/{attachment_id}'
+    )
+    r.raise_for_status()
@@ -0,0 +1,153 @@
+from typing import Callable
+
+from test_management_sync.zephyr.actions.search import SearchOptions
+from test_management_sync.zephyr.aio.actions.search import find
+from test_management_sync.zephyr.aio.session import AsyncZephyrSession
+from test_management_sync.zephyr.model.decoders import decode_execution
+from test_management_sync.zephyr.model.testcases import TestCaseTreeNode
+from test_management_sync.zephyr.model.planning import Cycle, Phase, Execution, AssignmentTree, \
+    TestCasesAssignment, ExecutionsStatusUpdate
+
+
+async def create_cycle(session: AsyncZephyrSession, cycle: Cycle) -> Cycle:
+    r = await session.post(
+        '/flex/services/rest/v3/cycle',
+        json=cycle.to_dict(),
+    )
+    r.raise_for_status()
+    return Cycle.from_dict(r.json())
+
+
+async def delete_cycle(session: AsyncZephyrSession, cycle: Cycle):
+    r = await session.delete(
+        f'/flex/services/rest/v3/cycle/{cycle.id}',
+    )
+    r.raise_for_status()
+
+
+async def get_cycles_for_release(session: AsyncZephyrSession, release_id: int,
+                                 predicate: Callable[[dict], bool] = None) -> list[Cycle]:
+    """
+    :param predicate: if set only the cycles which JSON representation matches the predicate are decoded
+    """
+    r = await session.get(
+        f'/flex/services/rest/v3/cycle/release/{release_id}',
+    )
+    r.raise_for_status()
+    raw_cycles = r.json()
+    if predicate is not None:
+        raw_cycles = [raw_cycle for raw_cycle in raw_cycles if predicate(raw_cycle)]
+    return Cycle.schema().load(raw_cycles, many=True)
+
+
+async def get_cycle(session: AsyncZephyrSession, cycle_id: int) -> Cycle:
+    r = await session.get(
+        f'/flex/services/rest/v3/cycle/{cycle_id}',
+    )
+    r.raise_for_status()
+    return Cycle.from_dict(r.json())
+
+
+async def create_cycle_phase_from_test_case_tree(
+        session: AsyncZephyrSession,
+        cycle: Cycle,
+        tree_node: TestCaseTreeNode,
+) -> Phase:
+    r = await session.post(
+        f'/flex/services/rest/v3/cycle/{cycle.id}/phase',
+        json=Phase(
+            phase_start_date=cycle.cycle_start_date,
+            phase_end_date=cycle.cycle_end_date,
+            cycle_id=cycle.id,
+            release_id=cycle.release_id,
+            name=tree_node.name,
+            tcr_catalog_tree_id=tree_node.id,
+            free_form=False,
+        ).to_dict()
+    )
+    r.raise_for_status()
+    return Phase.from_dict(r.json())
+
+
+async def create_cycle_phase_free_form(
+        session: AsyncZephyrSession,
+        cycle: Cycle,
+        name: str,
+) -> Phase:
+    r = await session.post(
+        f'/flex/services/rest/v3/cycle/{cycle.id}/phase',
+        json=Phase(
+            phase_start_date=cycle.cycle_start_date,
+            phase_end_date=cycle.cycle_end_date,
+            cycle_id=cycle.id,
+            release_id=cycle.release_id,
+            name=name,
+            free_form=True,
+        ).to_dict()
+    )
+    r.raise_for_status()
+    return Phase.from_dict(r.json())
+
+
+async def assign_all_unassigned_to_user(session: AsyncZephyrSession, phase: Phase, assignment_node: AssignmentTree,
+                                        user_id: int):
+    r = await session.put(
+        f'/flex/services/rest/v3/assignmenttree/{phase.id}/bulk/tree/{assignment_node.id}/from/-1/to/{user_id}',
+        params={
+            'cascade': True,
+            'easmode': 2,
+        }
+    )
+    r.raise_for_status()
+
+
+async def get_executions_for_cycle_phase(session: AsyncZephyrSession, release_id: int, phase: Phase,
+                                         options: SearchOptions = None) -> list[Execution]:
+    return await find(
+        session=session,
+        uri='/flex/services/rest/v3/execution',
+        extra_params={
+            'releaseid': release_id,
+            'cyclephaseid': phase.id,
+            'dbsearch': True,
+            'isascorder': True,
+            'order': 'orderId',
+        },
+        mapper=decode_execution,
+        options=options,
+    )
+
+
+async def get_assignment_tree(session: AsyncZephyrSession, phase: Phase) -> AssignmentTree:
+    r = await session.get(
+        f'/flex/services/rest/v3/assignmenttree/{phase.id}'
+    )
+    r.raise_for_status()
+    return AssignmentTree.from_dict(r.json())
+
+
+async def assign_test_cases_to_phase(session: AsyncZephyrSession, phase: Phase,
+                                     assignments: list[TestCasesAssignment], include_hierarchy: bool = True):
+    r = await session.post(
+        f'/flex/services/rest/v3/assignmenttree/{phase.id}/assign/bytree/{phase.tcr_catalog_tree_id}',
+        params={'includehierarchy': include_hierarchy},
+        json=TestCasesAssignment.schema().dump(assignments, many=True),
+    )
+    r.raise_for_status()
+
+
+async def execute_test_cases(session: AsyncZephyrSession, status: str, tester_id: int, execution_ids: list[int]):
+    r = await session.put(
+        '/flex/services/rest/v3/execution/bulk',
+        params={
+            'status': status,
+            'testerid': tester_id,
+            'allExecutions': True,
+        },
+        json=ExecutionsStatusUpdate(
+            ids=execution_ids,
+            teststep_update=False,
+            teststep_status_id=1,
+        ).to_dict()
+    )
+    r.raise_for_status()
@@ -0,0 +1,10 @@
+from test_management_sync.zephyr.aio.session import AsyncZephyrSession
+from test_management_sync.zephyr.model.preferences import Preference
+
+
+async def get_system_preferences(session: AsyncZephyrSession) -> list[Preference]:
+    r = await session.get(
+        '/flex/services/rest/v4/admin/preference/all/system',
+    )
+    r.raise_for_status()
+    return Preference.schema().load(r.json(), many=True)
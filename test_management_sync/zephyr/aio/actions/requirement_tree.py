@@ -0,0 +1,33 @@
+from test_management_sync.zephyr.aio.session import AsyncZephyrSession
+from test_management_sync.zephyr.model.requirements import RequirementTreeNode
+
+
+async def new_requirement_tree_node(session: AsyncZephyrSession, node: RequirementTreeNode) -> RequirementTreeNode:
+    r = await session.post(
+        '/flex/services/rest/v3/requirementtree/add',
+        json=node.to_dict(),
+    )
+    r.raise_for_status()
+    return RequirementTreeNode.from_dict(r.json())
+
+
+async def get_requirement_tree_root_nodes(session: AsyncZephyrSession, project_id: int,
+                                          release_id: int = None) -> list[RequirementTreeNode]:
+    query_params = {'projectId': project_id}
+    if release_id is not None:
+        query_params['releaseid'] = release_id
+    r = await session.get(
+        '/flex/services/rest/v4/requirementtree',
+        params=query_params,
+    )
+    r.raise_for_status()
+    return RequirementTreeNode.schema().load(r.json(), many=True)
+
+
+async def get_requirement_tree_node_details(session: AsyncZephyrSession,
+                                            requirement_tree_node_id: int) -> RequirementTreeNode:
+    r = await session.get(
+        f'/flex/services/rest/v4/requirementtree/{requirement_tree_node_id}'
+    )
+    r.raise_for_status()
+    return RequirementTreeNode.from_dict(r.json())
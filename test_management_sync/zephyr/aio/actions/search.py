@@ -0,0 +1,67 @@
+import asyncio
+import time
+from typing import TypeVar, Callable, NamedTuple
+
+from test_management_sync.zephyr.actions.search import SearchOptions, PageSize
+from test_management_sync.zephyr.aio.session import AsyncZephyrSession
+from test_management_sync.zephyr.metrics import operation, current_operation, endpoint_template
+from test_management_sync.zephyr.model.decoders import decode_search_result
+
+T = TypeVar("T")
+
+
+class _Page(NamedTuple):
+    result_size: int
+    items: list
+
+
+async def find(session: AsyncZephyrSession, uri: str, extra_params: dict, mapper: Callable[[dict], T],
+               page_size: int = 100, options: SearchOptions = None) -> list[T]:
+    """
+    Requests the first page and then the remaining pages concurrently using the total from the first page.
+    At most parallel_pages of the options are requested at once. The page size is fixed during one search.
+    Items are returned in order
+    """
+    if options is None:
+        options = SearchOptions()
+    sizer = options.page_size if options.page_size is not None else PageSize(page_size)
+    size = sizer.size
+    label = current_operation() or f'find {endpoint_template(uri)}'
+    limit = asyncio.Semaphore(options.parallel_pages)
+
+    async def get(offset: int) -> _Page:
+        search_params = {
+            'offset': offset,
+            'pagesize': size,
+        }
+        search_params.update(extra_params)
+        async with limit:
+            start = time.monotonic()
+            with operation(label):
+                r = await session.get(uri, params=search_params)
+            r.raise_for_status()
+            latency = time.monotonic() - start
+        search_result = decode_search_result(r.json())
+        sizer.on_page(size, len(search_result.results), latency, len(r.content))
+        return _Page(result_size=search_result.result_size, items=list(map(mapper, search_result.results)))
+
+    first_page = await get(0)
+    items = list(first_page.items)
+    if len(first_page.items) < size:
+        return items
+
+    offset = size
+    offsets = range(size, first_page.result_size, size)
+    for page in await asyncio.gather(*(get(page_offset) for page_offset in offsets)):
+        items.extend(page.items)
+        if len(page.items) < size:
+            return items
+        offset += size
+
+    # results were added after the first page was received
+    while True:
+        page = await get(offset)
+        items.extend(page.items)
+        if len(page.items) < size:
+            return items
+        offset += size
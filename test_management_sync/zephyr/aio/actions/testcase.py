@@ -0,0 +1,43 @@
+from test_management_sync.zephyr.actions.search import SearchOptions
+from test_management_sync.zephyr.aio.actions.search import find
+from test_management_sync.zephyr.aio.session import AsyncZephyrSession
+from test_management_sync.zephyr.model.decoders import decode_testcase_in_tree
+from test_management_sync.zephyr.model.testcases import TestCaseInTree, TestCaseTreeNode, DeleteAllRequest
+
+
+async def new_test_cases(session: AsyncZephyrSession, test_cases: list[TestCaseInTree]) -> list[TestCaseInTree]:
+    r = await session.post(
+        'flex/services/rest/v3/testcase/bulk',
+        json=TestCaseInTree.schema().dump(test_cases, many=True),
+    )
+    r.raise_for_status()
+    return TestCaseInTree.schema().load(r.json(), many=True)
+
+
+async def get_test_cases_for_node(session: AsyncZephyrSession, node: TestCaseTreeNode,
+                                  options: SearchOptions = None) -> list[TestCaseInTree]:
+    return await find(
+        session=session,
+        uri=f'/flex/services/rest/v3/testcase/tree/{node.id}',
+        extra_params={
+            'dbsearch': True,
+            'order': 'orderId',
+            'isascorder': True,
+        },
+        mapper=decode_testcase_in_tree,
+        options=options,
+    )
+
+
+async def delete_all_for_tree(session: AsyncZephyrSession, node: TestCaseTreeNode):
+    r = await session.delete(
+        '/flex/services/rest/v3/testcase',
+        params={
+            'tcrCatalogTreeId': node.id,
+        },
+        json=DeleteAllRequest(
+            ids=[],
+            selected_all=0,
+        ).to_dict()
+    )
+    r.raise_for_status()
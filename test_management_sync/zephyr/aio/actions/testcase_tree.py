@@ -0,0 +1,41 @@
+from test_management_sync.zephyr.aio.session import AsyncZephyrSession
+from test_management_sync.zephyr.model.testcases import TestCaseTreeNode
+
+
+async def create_test_case_tree_node(session: AsyncZephyrSession, node: TestCaseTreeNode,
+                                     parent: TestCaseTreeNode = None) -> TestCaseTreeNode:
+    parent_id = 0 if parent is None else parent.id
+    if parent is not None:
+        node.type = 'Module'
+    r = await session.post(
+        '/flex/services/rest/v3/testcasetree',
+        params={'parentid': parent_id},
+        json=node.to_dict(),
+    )
+    r.raise_for_status()
+    return TestCaseTreeNode.from_dict(r.json())
+
+
+async def get_test_case_tree_root_nodes(session: AsyncZephyrSession, release_id: int) -> list[TestCaseTreeNode]:
+    return await _get_test_case_tree_node(session, release_id, 'Phase')
+
+
+async def get_test_case_tree_sub_nodes(session: AsyncZephyrSession, release_id: int,
+                                       parent: TestCaseTreeNode) -> list[TestCaseTreeNode]:
+    return await _get_test_case_tree_node(session, release_id, 'Module', parent.id)
+
+
+async def _get_test_case_tree_node(session: AsyncZephyrSession, release_id: int, note_type: str,
+                                   parent_id: int = None) -> list[TestCaseTreeNode]:
+    params = {
+        'type': note_type,
+        'releaseid': release_id
+    }
+    if parent_id is not None:
+        params['parentid'] = parent_id
+    r = await session.get(
+        '/flex/services/rest/v3/testcasetree/lite',
+        params=params
+    )
+    r.raise_for_status()
+    return TestCaseTreeNode.schema().load(r.json(), many=True)
@@ -0,0 +1,9 @@
+from test_management_sync.zephyr.aio.session import AsyncZephyrSession
+from test_management_sync.zephyr.model.user import UserInfo
+
+
+async def get_user_id(session: AsyncZephyrSession) -> int:
+    res = await session.get('/flex/services/rest/latest/user/current')
+    res.raise_for_status()
+    user_info = UserInfo.from_dict(res.json())
+    return user_info.id
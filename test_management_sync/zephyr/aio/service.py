@@ -0,0 +1,613 @@
+import asyncio
+import json
+import logging
+from datetime import date, datetime
+from pathlib import Path
+from typing import Optional, Awaitable, Callable, Hashable, TypeVar, Iterable
+
+from test_management_sync.async_service import AsyncService
+from test_management_sync.model import ExecutionStatus, Cycle, TestCase, RootFolder, Requirement, Folder, AttachedFile
+from test_management_sync.util import group_tc_by_folder, group_by_status
+from test_management_sync.zephyr.actions.attachments import ItemType
+from test_management_sync.zephyr.actions.search import SearchOptions
+from test_management_sync.zephyr.aio.actions import (user, planning, testcase, testcase_tree, requirement_tree,
+                                                     requirement, attachments as file_attachment, preferences)
+from test_management_sync.zephyr.aio.session import AsyncZephyrSession
+from test_management_sync.zephyr.cache import ZephyrCache, FolderItems, CachedTestCase, CachedRequirement
+from test_management_sync.zephyr.metrics import RequestMetrics
+from test_management_sync.zephyr.model.attachments import AttachmentRequest, Attachment
+from test_management_sync.zephyr.model.planning import Cycle as ZephyrCycle, Phase, TestCasesAssignment
+from test_management_sync.zephyr.model.requirements import RequirementTreeNode, Requirement as ZephyrRequirement
+from test_management_sync.zephyr.model.testcases import TestCaseTreeNode, TestCaseInTree, TestCase as ZephyrTestCase
+from test_management_sync.zephyr.session import ConnectionOptions
+from test_management_sync.zephyr.tree import TreeLevel
+
+_EXECUTION_STATUSES_PREFERENCE_NAME = 'testresult.testresultStatus.LOV'
+
+_logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AsyncZephyrService(AsyncService):
+    """
+    Zephyr Enterprise service for asyncio.
+    The trees and cycles are loaded on creation, each level of the trees is loaded concurrently.
+    Independent requests (folders, pages, phases and batches) are sent concurrently,
+    the number of concurrent requests is limited by pool_size of the connection options
+    """
+    __batch_size: int = 1000
+
+    def __init__(self, session: AsyncZephyrSession, project_id: int, release_id: int,
+                 search_options: SearchOptions = None):
+        """
+        Use AsyncZephyrService.create to create the service with the existing data loaded
+        """
+        self.__session = session
+        self.__project_id = project_id
+        self.__release_id = release_id
+        self.__search_options = search_options if search_options is not None else SearchOptions(parallel_pages=4)
+        self.__cache = ZephyrCache()
+        self.__folder_loads = dict[Hashable, asyncio.Future]()
+        # folders are created one at a time, so the same parent folder is not created twice
+        self.__req_tree_lock = asyncio.Lock()
+        self.__tc_tree_lock = asyncio.Lock()
+        self.__execution_statuses = dict[str, ExecutionStatus]()
+        self.__tester_id: Optional[int] = None
+
+    @classmethod
+    async def create(cls, zephyr_url: str, api_token: str, project_id: int, release_id: int,
+                     execution_statuses: list[ExecutionStatus] = None, search_options: SearchOptions = None,
+                     connection_options: ConnectionOptions = None) -> 'AsyncZephyrService':
+        """
+        :param search_options: options of paginated requests. By default, up to 4 pages of one search
+            are requested concurrently
+        :param connection_options: options of HTTP connections. Requests are not coalesced by the asyncio backend
+        """
+        if len(zephyr_url) == 0:
+            raise ValueError('empty zephyr url')
+        if len(api_token) == 0:
+            raise ValueError('empty api token')
+        session = AsyncZephyrSession(prefix_url=zephyr_url, api_token=api_token, options=connection_options)
+        service = cls(session, project_id, release_id, search_options)
+        try:
+            await service.__load_existing_data(execution_statuses)
+        except BaseException:
+            await session.close()
+            raise
+        return service
+
+    async def close(self):
+        self.__cache.clear()
+        await self.__session.close()
+
+    @property
+    def metrics(self) -> RequestMetrics:
+        """
+        Metrics of HTTP requests sent by this service grouped by endpoint and by logical operation
+        """
+        return self.__session.metrics
+
+    async def create_requirement_folder_if_not_exists(self, folder: Folder):
+        async with self.__req_tree_lock:
+            await self.__create_requirement_folder(folder)
+
+    async def create_requirements(self, folder: Folder, requirements: list[Requirement]):
+        _logger.info('creating %s requirement(s) in folder %s', len(requirements), folder.name)
+        req_folder = self.__req_node(folder)
+
+        async def create(req: Requirement) -> ZephyrRequirement:
+            _logger.debug("creating requirement %s", req)
+            zephyr_req = ZephyrRequirement(
+                requirement_tree_id=req_folder.id,
+                name=req.name,
+                details=req.description,
+                release_ids=[self.__release_id],
+            )
+            return await requirement.new_requirement(self.__session, zephyr_req)
+
+        created_reqs = await asyncio.gather(*(create(req) for req in requirements))
+        self.__cache.requirements.add(folder, map(CachedRequirement.of, created_reqs))
+
+    async def get_requirements(self, folder: Folder) -> list[Requirement]:
+        _logger.info("getting requirements in folder %s", folder.name)
+        zephyr_reqs = await self.__get_zephyr_requirements(folder)
+        return [Requirement(name=req.name, description=req.description, folder=folder) for req in zephyr_reqs]
+
+    async def remove_requirements(self, folder: Folder):
+        _logger.info("removing requirements in folder %s", folder.name)
+        req_node = self.__cache.requirement_tree.get(folder, None)
+        if req_node is None:
+            return
+        await requirement.delete_all_for_tree(self.__session, self.__release_id, req_node)
+        self.__cache.requirements.put(folder, [])
+
+    async def create_testcase_folder_if_not_exists(self, folder: Folder):
+        async with self.__tc_tree_lock:
+            await self.__create_testcase_folder(folder)
+
+    async def remove_testcases(self, folder: Folder):
+        _logger.info("removing test cases in folder %s", folder.name)
+        tc_node = self.__cache.testcase_tree.get(folder, None)
+        if tc_node is None:
+            return
+        await testcase.delete_all_for_tree(self.__session, tc_node)
+        self.__cache.testcases.put(folder, [])
+
+    async def get_testcases(self, folder: Folder) -> list[TestCase]:
+        _logger.info("getting test cases in folder %s", folder.name)
+        zephyr_testcases = await self.__get_zephyr_testcases(folder)
+        return AsyncZephyrService.__to_model_tcs(folder, zephyr_testcases)
+
+    async def create_testcases(self, folder: Folder, tc_to_create: list[TestCase]):
+        if not tc_to_create:
+            return
+        _logger.info("creating %s test case(s) in folder %s", len(tc_to_create), folder.name)
+        zephyr_tc_node = self.__tc_node(folder)
+        zephyr_tcs_in_tree = list(map(
+            lambda tc: TestCaseInTree(
+                tcr_catalog_tree_id=zephyr_tc_node.id,
+                testcase=ZephyrTestCase(name=tc.name, description=tc.description, project_id=self.__project_id,
+                                        comments=tc.description if len(tc.description) > 0 else None)),
+            tc_to_create,
+        ))
+        created_tcs = await testcase.new_test_cases(self.__session, zephyr_tcs_in_tree)
+        self.__cache.testcases.add(folder, map(CachedTestCase.of, created_tcs))
+
+    async def map_testcases_to_requirement(self, req: Requirement, tc_folder: Folder, tcs: list[TestCase]):
+        _logger.info("mapping requirement %s to %s test case(s) in folder %s", req.name, len(tcs), tc_folder.name)
+        zephyr_reqs, zephyr_tcs = await asyncio.gather(self.__get_zephyr_requirements(req.folder),
+                                                       self.__get_zephyr_testcases(tc_folder))
+        zephyr_req = zephyr_reqs.find((req.name, req.description))
+        if zephyr_req is None:
+            raise Exception(f'cannot find requirement {req}')
+
+        tc_tree_nodes = []
+        start = tc_folder
+        while start is not None:
+            tc_tree_nodes.append(self.__tc_node(start))
+            start = start.parent
+        tc_tree_nodes.reverse()
+
+        found_test_cases = dict[int, TestCaseInTree]()
+        for tc in tcs:
+            # all test cases with the same name and description are mapped
+            for zephyr_tc in zephyr_tcs.find_all((tc.name, tc.description)):
+                found_test_cases[zephyr_tc.id] = zephyr_tc.to_zephyr(self.__project_id)
+        await requirement.map_requirement_to_test_cases(self.__session, self.__release_id, zephyr_req.to_zephyr(),
+                                                        list(found_test_cases.values()), tc_tree_nodes)
+
+    async def create_cycle_if_not_exist(self, cycle: Cycle, delete_if_exist: bool):
+        zephyr_cycle = self.__cache.cycles.get(cycle, None)
+        if zephyr_cycle is not None:
+            if delete_if_exist:
+                await planning.delete_cycle(self.__session, zephyr_cycle)
+                del self.__cache.cycles[cycle]
+                self.__cache.phases.pop(cycle, None)
+            else:
+                return
+        zephyr_cycle = ZephyrCycle(
+            name=cycle.name,
+            cycle_start_date=AsyncZephyrService.__format_date(cycle.start_date),
+            cycle_end_date=AsyncZephyrService.__format_date(cycle.end_date),
+            release_id=self.__release_id,
+        )
+        self.__cache.cycles[cycle] = await planning.create_cycle(self.__session, zephyr_cycle)
+
+    async def create_phase_if_not_exist(self, cycle: Cycle, phase_root: RootFolder):
+        if self.__find_phase(cycle, phase_root.name) is not None:
+            return
+        zephyr_cycle = self.__cache.cycles[cycle]
+        tc_tree_node = self.__cache.testcase_tree.get(phase_root, None)
+        if tc_tree_node is None:
+            raise KeyError(f'cannot find folder with name {phase_root.name}')
+        phase = await planning.create_cycle_phase_from_test_case_tree(self.__session, zephyr_cycle, tc_tree_node)
+        self.__cache.phases[cycle][phase_root.name] = phase
+
+    async def create_free_phase_if_not_exist(self, cycle: Cycle, phase_name: str, test_cases: list[TestCase]):
+        _logger.info("creating phase %s in cycle %s with %s test case(s)", phase_name, cycle.name, len(test_cases))
+        phase = self.__find_phase(cycle, phase_name)
+        if phase is None:
+            zephyr_cycle = self.__cache.cycles[cycle]
+            phase = await planning.create_cycle_phase_free_form(self.__session, zephyr_cycle, phase_name)
+            self.__cache.phases[cycle][phase_name] = phase
+
+        tc_by_folder = group_tc_by_folder(test_cases)
+        folders = list(tc_by_folder.keys())
+        tc_ids = await asyncio.gather(*(self.__collect_testcase_ids(folder, tc_by_folder[folder])
+                                        for folder in folders))
+        batches = list[list[TestCasesAssignment]]()
+        tcs_in_assignment: int = 0
+        for folder, ids in zip(folders, tc_ids):
+            if not batches or tcs_in_assignment >= self.__batch_size:
+                batches.append([])
+                tcs_in_assignment = 0
+            testcase_ids = list(ids.keys())
+            batches[-1].append(
+                TestCasesAssignment(
+                    tree_id=self.__tc_node(folder).id,
+                    testcase_ids=testcase_ids,
+                    is_exclusion=True,
+                )
+            )
+            tcs_in_assignment += len(testcase_ids)
+
+        await asyncio.gather(*(planning.assign_test_cases_to_phase(self.__session, phase, assignments,
+                                                                   include_hierarchy=True)
+                               for assignments in batches))
+
+    async def assign_test_cases_in_phase(self, cycle: Cycle, phase_name: str):
+        _logger.info("assigning test cases from %s phase in cycle %s to execution", phase_name, cycle.name)
+        phase = self.__find_phase(cycle, phase_name)
+        if phase is None:
+            raise KeyError(f'cannot find phase {phase_name} in cycle {cycle.name}')
+        assignment_tree = await planning.get_assignment_tree(self.__session, phase)
+        await planning.assign_all_unassigned_to_user(self.__session, phase=phase,
+                                                     assignment_node=assignment_tree, user_id=self.__tester_id)
+
+    async def execution_statuses(self) -> list[ExecutionStatus]:
+        return [s for s in self.__execution_statuses.values()]
+
+    async def execute_test_case(self, cycle: Cycle, status: ExecutionStatus, folder: Folder, tcs: list[TestCase]):
+        await self.execute_all_test_cases(cycle, status, {folder: tcs})
+
+    async def execute_all_test_cases(self, cycle: Cycle, status: ExecutionStatus,
+                                     tcs_by_folder: dict[Folder, list[TestCase]]):
+        _logger.info("executing test cases in %s folder(s) from cycle %s with status %s",
+                     len(tcs_by_folder), cycle.name, status.name)
+        execution_id_by_testcase = await self.__resolve_execution_ids(cycle, tcs_by_folder)
+        await self.__execute_by_ids(status, list(execution_id_by_testcase.values()))
+
+    async def execute_results(self, cycle: Cycle, results: dict[TestCase, ExecutionStatus]):
+        """
+        Resolves execution ids of all test cases at once and executes them grouped by status
+        """
+        _logger.info("executing %s test case(s) from cycle %s", len(results), cycle.name)
+        execution_id_by_testcase = await self.__resolve_execution_ids(cycle, group_tc_by_folder(list(results.keys())))
+        await asyncio.gather(*(self.__execute_by_ids(status, [execution_id_by_testcase[tc] for tc in tcs])
+                               for status, tcs in group_by_status(results)))
+
+    async def get_executions_for_test_cases(self, cycle: Cycle, folder: Folder,
+                                            tcs: list[TestCase]) -> dict[TestCase, ExecutionStatus]:
+        tcs_ids = await self.__collect_testcase_ids(folder, tcs)
+        return await self.__get_executions(cycle, tcs_ids)
+
+    async def get_executions_for_cycle(self, cycle: Cycle) -> dict[TestCase, ExecutionStatus]:
+        folders = list(self.__cache.testcase_tree.keys())
+        tcs_by_id = dict[int, TestCase]()
+        for folder, zephyr_tcs in zip(folders, await asyncio.gather(*map(self.__get_zephyr_testcases, folders))):
+            for tc in zephyr_tcs:
+                tcs_by_id[tc.id] = TestCase(name=tc.name, description=tc.description, folder=folder)
+        return await self.__get_executions(cycle, tcs_by_id)
+
+    async def attache_files_to_requirements(self, attachments: dict[Requirement, list[Path]]):
+        _logger.info("attaching files to %s requirements", len(attachments))
+
+        async def attach(req: Requirement, files: list[Path]):
+            upload_results, zephyr_reqs = await asyncio.gather(
+                file_attachment.upload_files(self.__session, ItemType.REQUIREMENT, files),
+                self.__get_zephyr_requirements(req.folder),
+            )
+            zephyr_req = AsyncZephyrService.__find_req(req, zephyr_reqs)
+            await file_attachment.attach_files(self.__session, AsyncZephyrService.__attachment_requests(
+                ItemType.REQUIREMENT, zephyr_req.id, files, upload_results))
+
+        await asyncio.gather(*(attach(req, files) for req, files in attachments.items()))
+
+    async def attache_files_to_testcases(self, attachments: dict[TestCase, list[Path]]):
+        _logger.info("attaching files to %s test case(s)", len(attachments))
+
+        async def attach(tc: TestCase, files: list[Path]):
+            upload_results, zephyr_tcs = await asyncio.gather(
+                file_attachment.upload_files(self.__session, ItemType.TEST_CASE, files),
+                self.__get_zephyr_testcases(tc.folder),
+            )
+            zephyr_tc = AsyncZephyrService.__find_tc(tc, zephyr_tcs)
+            await file_attachment.attach_files(self.__session, AsyncZephyrService.__attachment_requests(
+                ItemType.TEST_CASE, zephyr_tc.testcase_id, files, upload_results))
+
+        await asyncio.gather(*(attach(tc, files) for tc, files in attachments.items()))
+
+    async def attache_files_to_testcases_executions(self, cycle: Cycle, attachments: dict[TestCase, list[Path]]):
+        _logger.info("attaching files to %s executions(s) in cycle %s", len(attachments), cycle.name)
+        tcs_by_id = await self.__collect_all_requested_ids(group_tc_by_folder(list(attachments.keys())))
+        execution_id_for_tc = await self.__find_execution_ids(cycle, tcs_by_id)
+
+        async def upload(tc: TestCase, files: list[Path]) -> list[AttachmentRequest]:
+            upload_results = await file_attachment.upload_files(self.__session, ItemType.RELEASE_TEST_SCHEDULE, files)
+            return AsyncZephyrService.__attachment_requests(ItemType.RELEASE_TEST_SCHEDULE, execution_id_for_tc[tc],
+                                                            files, upload_results)
+
+        attachment_requests = [request for requests in
+                               await asyncio.gather(*(upload(tc, files) for tc, files in attachments.items()))
+                               for request in requests]
+        await asyncio.gather(*(file_attachment.attach_files(self.__session,
+                                                            attachment_requests[start:start + self.__batch_size])
+                               for start in range(0, len(attachment_requests), self.__batch_size)))
+
+    async def get_requirement_attachments(self, req: Requirement) -> list[AttachedFile]:
+        zephyr_reqs = await self.__get_zephyr_requirements(req.folder)
+        zephyr_req = AsyncZephyrService.__find_req(req, zephyr_reqs)
+        files = await file_attachment.get_attached_files(self.__session, ItemType.REQUIREMENT, zephyr_req.id,
+                                                         is_link=False)
+        return AsyncZephyrService.__to_attached_files(files)
+
+    async def remove_requirement_attachment(self, req: Requirement, old_file: AttachedFile):
+        await file_attachment.delete_attachment(self.__session, int(old_file.id))
+
+    async def get_testcase_attachments(self, tc: TestCase) -> list[AttachedFile]:
+        zephyr_tcs = await self.__get_zephyr_testcases(tc.folder)
+        zephyr_tc = AsyncZephyrService.__find_tc(tc, zephyr_tcs)
+        files = await file_attachment.get_attached_files(self.__session, ItemType.TEST_CASE, zephyr_tc.testcase_id,
+                                                         is_link=False)
+        return AsyncZephyrService.__to_attached_files(files)
+
+    async def remove_testcase_attachment(self, tc: TestCase, old_file: AttachedFile):
+        await file_attachment.delete_attachment(self.__session, int(old_file.id))
+
+    async def get_execution_attachments(self, cycle: Cycle, tc: TestCase) -> list[AttachedFile]:
+        tcs_by_id = await self.__collect_testcase_ids(tc.folder, [tc])
+        exec_ids = await self.__find_execution_ids(cycle, tcs_by_id)
+        files = await file_attachment.get_attached_files(self.__session, ItemType.RELEASE_TEST_SCHEDULE,
+                                                         exec_ids[tc], is_link=False)
+        return AsyncZephyrService.__to_attached_files(files)
+
+    async def remove_execution_attachment(self, cycle: Cycle, tc: TestCase, old_file: AttachedFile):
+        await file_attachment.delete_attachment(self.__session, int(old_file.id))
+
+    async def __resolve_execution_ids(self, cycle: Cycle,
+                                      tcs_by_folder: dict[Folder, list[TestCase]]) -> dict[TestCase, int]:
+        tcs_by_id = await self.__collect_all_requested_ids(tcs_by_folder)
+        execution_id_by_testcase = await self.__find_execution_ids(cycle, tcs_by_id)
+
+        if len(execution_id_by_testcase) != len(tcs_by_id):
+            missing_test_cases = [tc for tc in tcs_by_id.values() if tc not in execution_id_by_testcase]
+            raise Exception(f'executions for some test cases were not found: {missing_test_cases}')
+        return execution_id_by_testcase
+
+    async def __execute_by_ids(self, status: ExecutionStatus, ids: list[int]):
+        await asyncio.gather(*(planning.execute_test_cases(self.__session, status.id, self.__tester_id,
+                                                           ids[start:start + self.__batch_size])
+                               for start in range(0, len(ids), self.__batch_size)))
+
+    async def __create_requirement_folder(self, folder: Folder):
+        if folder in self.__cache.requirement_tree:
+            _logger.debug('folder %s found in cache', folder)
+            return
+        if folder.parent is not None:
+            await self.__create_requirement_folder(folder.parent)
+
+        parent = None if folder.parent is None else self.__req_node(folder.parent)
+        node = RequirementTreeNode(name=folder.name, description='', project_id=self.__project_id,
+                                   release_ids=[str(self.__release_id)], parent_id=0 if parent is None else parent.id)
+        self.__cache.requirement_tree[folder] = \
+            await requirement_tree.new_requirement_tree_node(self.__session, node)
+
+    async def __create_testcase_folder(self, folder: Folder):
+        if folder in self.__cache.testcase_tree:
+            return
+        if folder.parent is not None:
+            await self.__create_testcase_folder(folder.parent)
+        parent = None if folder.parent is None else self.__tc_node(folder.parent)
+        node = TestCaseTreeNode(name=folder.name, release_id=self.__release_id)
+        self.__cache.testcase_tree[folder] = \
+            await testcase_tree.create_test_case_tree_node(self.__session, node, parent)
+
+    async def __get_zephyr_testcases(self, folder: Folder) -> FolderItems[CachedTestCase]:
+        zephyr_testcases = self.__cache.testcases.get(folder)
+        if zephyr_testcases is None:
+            zephyr_testcases = await self.__load_once(('testcases', folder),
+                                                      lambda: self.__load_zephyr_testcases(folder))
+        return zephyr_testcases
+
+    async def __load_zephyr_testcases(self, folder: Folder) -> FolderItems[CachedTestCase]:
+        tc_folder = self.__tc_node(folder)
+        zephyr_tcs = await testcase.get_test_cases_for_node(self.__session, tc_folder, self.__search_options)
+        return self.__cache.testcases.put(folder, map(CachedTestCase.of, zephyr_tcs))
+
+    async def __get_zephyr_requirements(self, folder: Folder) -> FolderItems[CachedRequirement]:
+        zephyr_reqs = self.__cache.requirements.get(folder)
+        if zephyr_reqs is None:
+            zephyr_reqs = await self.__load_once(('requirements', folder),
+                                                 lambda: self.__load_zephyr_requirements(folder))
+        return zephyr_reqs
+
+    async def __load_zephyr_requirements(self, folder: Folder) -> FolderItems[CachedRequirement]:
+        req_folder = self.__req_node(folder)
+        zephyr_reqs = await requirement.find_requirements(self.__session, self.__release_id, req_folder,
+                                                          self.__search_options)
+        return self.__cache.requirements.put(folder, map(CachedRequirement.of, zephyr_reqs))
+
+    async def __load_once(self, key: Hashable, load: Callable[[], Awaitable[T]]) -> T:
+        """
+        Tasks that request the same key while it is loading wait for one load
+        """
+        future = self.__folder_loads.get(key, None)
+        if future is None:
+            future = asyncio.ensure_future(load())
+            self.__folder_loads[key] = future
+            future.add_done_callback(lambda _: self.__folder_loads.pop(key, None))
+        # cancellation of one waiter does not cancel the load for the others
+        return await asyncio.shield(future)
+
+    async def __get_executions(self, cycle: Cycle,
+                               tcs_by_id: dict[int, TestCase]) -> dict[TestCase, ExecutionStatus]:
+        tcs_last_status = dict[TestCase, ExecutionStatus]()
+        for phase_executions in await self.__get_phase_executions(cycle):
+            for execution in phase_executions:
+                testcase_id = execution.tcr_tree_testcase.testcase.id
+                if testcase_id not in tcs_by_id:
+                    continue
+                last_execution_result = execution.last_test_result
+                if last_execution_result is None:
+                    continue
+                status = self.__execution_statuses.get(last_execution_result.execution_status, None)
+                if status is None:
+                    continue
+                tcs_last_status[tcs_by_id[testcase_id]] = status
+        return tcs_last_status
+
+    async def __find_execution_ids(self, cycle: Cycle, tc_by_id: dict[int, TestCase]) -> dict[TestCase, int]:
+        execution_id_by_testcase: dict[TestCase, int] = {}
+        for phase_executions in await self.__get_phase_executions(cycle):
+            for execution in phase_executions:
+                testcase_id = execution.tcr_tree_testcase.testcase.id
+                if testcase_id in tc_by_id:
+                    execution_id_by_testcase[tc_by_id[testcase_id]] = execution.id
+        return execution_id_by_testcase
+
+    async def __get_phase_executions(self, cycle: Cycle) -> list[list]:
+        """
+        Returns executions of each phase of the cycle, the phases are requested concurrently
+        """
+        phases = list(self.__cache.phases.get(cycle, {}).values()) if cycle in self.__cache.cycles else []
+        return await asyncio.gather(*(
+            planning.get_executions_for_cycle_phase(self.__session, self.__release_id, phase, self.__search_options)
+            for phase in phases
+        ))
+
+    async def __collect_testcase_ids(self, folder: Folder, testcases: list[TestCase]) -> dict[int, TestCase]:
+        known_tcs = await self.__get_zephyr_testcases(folder)
+        tc_ids = {}
+        for tc in testcases:
+            zephyr_tc = known_tcs.find((tc.name, tc.description))
+            if zephyr_tc is None:
+                raise KeyError(f'cannot find test case {tc}')
+            tc_ids[zephyr_tc.id] = tc
+        return tc_ids
+
+    async def __collect_all_requested_ids(self, tcs_by_folder: dict[Folder, list[TestCase]]) -> dict[int, TestCase]:
+        tcs_by_id = dict[int, TestCase]()
+        for ids in await asyncio.gather(*(self.__collect_testcase_ids(folder, tcs)
+                                          for folder, tcs in tcs_by_folder.items())):
+            tcs_by_id.update(ids)
+        return tcs_by_id
+
+    async def __load_existing_data(self, execution_statuses: Optional[list[ExecutionStatus]]):
+        async def load_statuses():
+            statuses = execution_statuses if execution_statuses is not None else await self.__load_execution_statuses()
+            self.__execution_statuses = {status.id: status for status in statuses}
+
+        async def load_tester_id():
+            self.__tester_id = await user.get_user_id(self.__session)
+
+        await asyncio.gather(load_statuses(), load_tester_id(), self.__load_requirement_tree(),
+                             self.__load_testcase_tree(), self.__load_cycles())
+        _logger.info("loading existing data complete")
+
+    async def __load_requirement_tree(self):
+        _logger.info("loading existing requirement folders")
+        root_req_nodes = await requirement_tree.get_requirement_tree_root_nodes(self.__session, self.__project_id,
+                                                                                self.__release_id)
+
+        async def expand(folder: Folder, node_id: int) -> TreeLevel[int]:
+            node_details = await requirement_tree.get_requirement_tree_node_details(self.__session, node_id)
+            self.__cache.requirement_tree[folder] = node_details
+            return [(folder / sub_node.name, sub_node.id) for sub_node in node_details.categories]
+
+        await AsyncZephyrService.__walk_breadth_first(
+            [(RootFolder(root_node.name), root_node.id) for root_node in root_req_nodes], expand)
+        _logger.info("loaded %s requirement folder(s)", len(self.__cache.requirement_tree))
+
+    async def __load_testcase_tree(self):
+        _logger.info("loading existing test case folders")
+        root_tc_tree_nodes = await testcase_tree.get_test_case_tree_root_nodes(self.__session, self.__release_id)
+
+        async def expand(folder: Folder, node: TestCaseTreeNode) -> TreeLevel[TestCaseTreeNode]:
+            self.__cache.testcase_tree[folder] = node
+            sub_nodes = await testcase_tree.get_test_case_tree_sub_nodes(self.__session, self.__release_id, node)
+            return [(folder / sub_node.name, sub_node) for sub_node in sub_nodes]
+
+        await AsyncZephyrService.__walk_breadth_first(
+            [(RootFolder(root_node.name), root_node) for root_node in root_tc_tree_nodes], expand)
+        _logger.info("loaded %s test case folder(s)", len(self.__cache.testcase_tree))
+
+    async def __load_cycles(self):
+        _logger.info("loading existing cycles")
+        for zephyr_cycle in await planning.get_cycles_for_release(self.__session, self.__release_id):
+            cycle = Cycle(
+                name=zephyr_cycle.name,
+                start_date=AsyncZephyrService.__parse_date(zephyr_cycle.cycle_start_date),
+                end_date=AsyncZephyrService.__parse_date(zephyr_cycle.cycle_end_date),
+            )
+            self.__cache.cycles[cycle] = zephyr_cycle
+            self.__cache.phases[cycle] = {zephyr_phase.name: zephyr_phase for zephyr_phase in zephyr_cycle.cycle_phases}
+        _logger.info("loaded %s cycle(s)", len(self.__cache.cycles))
+
+    async def __load_execution_statuses(self) -> list[ExecutionStatus]:
+        for pref in await preferences.get_system_preferences(self.__session):
+            if pref.name == _EXECUTION_STATUSES_PREFERENCE_NAME:
+                return [ExecutionStatus(name=status['value'], id=str(status['id']))
+                        for status in json.loads(pref.value)]
+        raise Exception(f'could not found {_EXECUTION_STATUSES_PREFERENCE_NAME} preference in the list')
+
+    def __find_phase(self, cycle: Cycle, phase_name: str) -> Optional[Phase]:
+        if cycle not in self.__cache.cycles:
+            return None
+        return self.__cache.phases[cycle].get(phase_name, None)
+
+    def __req_node(self, folder: Folder) -> RequirementTreeNode:
+        node = self.__cache.requirement_tree.get(folder, None)
+        if node is None:
+            raise KeyError(f'cannot find requirement folder {folder}')
+        return node
+
+    def __tc_node(self, folder: Folder) -> TestCaseTreeNode:
+        node = self.__cache.testcase_tree.get(folder, None)
+        if node is None:
+            raise KeyError(f'cannot find test case folder {folder}')
+        return node
+
+    @staticmethod
+    async def __walk_breadth_first(roots: TreeLevel, expand: Callable[[Folder, T], Awaitable[TreeLevel]]):
+        """
+        Walks the tree level by level, all items of one level are expanded concurrently
+        """
+        level = roots
+        while level:
+            expanded = await asyncio.gather(*(expand(folder, item) for folder, item in level))
+            level = [child for children in expanded for child in children]
+
+    @staticmethod
+    def __attachment_requests(item_type: ItemType, item_id: int, files: list[Path],
+                              upload_results: dict) -> list[AttachmentRequest]:
+        return [
+            AttachmentRequest(
+                name=upload_results[file].file_name,
+                content_type=upload_results[file].content_type,
+                item_type=item_type.http_type,
+                temp_path=upload_results[file].temp_file_path,
+                item_id=item_id,
+            )
+            for file in files
+        ]
+
+    @staticmethod
+    def __to_model_tcs(folder: Folder, zephyr_testcases: Iterable[CachedTestCase]) -> list[TestCase]:
+        return [TestCase(name=tc.name, description=tc.description, folder=folder) for tc in zephyr_testcases]
+
+    @staticmethod
+    def __format_date(value: date) -> str:
+        return value.strftime('%m/%d/%Y')
+
+    @staticmethod
+    def __parse_date(date_str: str) -> date:
+        return datetime.strptime(date_str, '%m/%d/%Y').date()
+
+    @staticmethod
+    def __find_req(req: Requirement, requirements: FolderItems[CachedRequirement]) -> CachedRequirement:
+        zephyr_req = requirements.find((req.name, req.description))
+        if zephyr_req is None:
+            raise KeyError(f'cannot find requirement {req}')
+        return zephyr_req
+
+    @staticmethod
+    def __find_tc(tc: TestCase, testcases: FolderItems[CachedTestCase]) -> CachedTestCase:
+        zephyr_tc = testcases.find((tc.name, tc.description))
+        if zephyr_tc is None:
+            raise KeyError(f'cannot find testcase {tc}')
+        return zephyr_tc
+
+    @staticmethod
+    def __to_attached_files(attachments: list[Attachment]) -> list[AttachedFile]:
+        return list(AttachedFile(id=str(f.id), name=f.name) for f in attachments)
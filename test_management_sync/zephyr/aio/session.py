@@ -0,0 +1,132 @@
+import gzip
+import json
+import re
+import time
+from typing import Any, Optional
+from urllib.parse import urljoin, urlsplit
+
+try:
+    import aiohttp
+except ImportError as e:
+    raise ImportError('asyncio backend requires aiohttp, install it with the "async" extra: '
+                      'pip install test-management-sync[async]') from e
+
+from test_management_sync.zephyr.metrics import RequestMetrics, RequestRecord, current_operation, endpoint_template
+from test_management_sync.zephyr.session import ConnectionOptions
+
+
+class Response:
+    """
+    Response with the content read, so it can be used after the connection is returned to the pool
+    """
+
+    def __init__(self, method: str, url: str, status: int, reason: Optional[str], headers, content: bytes,
+                 request_info: aiohttp.RequestInfo, history: tuple):
+        self.method = method
+        self.url = url
+        self.status_code = status
+        self.reason = reason
+        self.headers = headers
+        self.content = content
+        self.__request_info = request_info
+        self.__history = history
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise aiohttp.ClientResponseError(self.__request_info, self.__history, status=self.status_code,
+                                              message=self.reason or '', headers=self.headers)
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class AsyncZephyrSession:
+    """
+    HTTP session for the asyncio backend.
+    pool_size of the options limits the number of concurrent requests, requests over the limit wait for a connection.
+    Concurrent GET requests are not coalesced
+    """
+    __gzip_paths = re.compile(r'/(execution/bulk|testcase/bulk|attachment/list)/?$')
+
+    def __init__(self, prefix_url: str, api_token: str, options: ConnectionOptions = None):
+        """
+        Must be created in a running event loop
+        """
+        self.prefix_url = prefix_url
+        self.options = options if options is not None else ConnectionOptions()
+        self.metrics = RequestMetrics()
+        headers = {
+            'Authorization': f'Bearer {api_token}'
+        }
+        if not self.options.compress_responses:
+            headers['Accept-Encoding'] = 'identity'
+        connector = aiohttp.TCPConnector(limit=self.options.pool_size, force_close=not self.options.keep_alive)
+        self.__session = aiohttp.ClientSession(headers=headers, connector=connector)
+
+    async def get(self, url: str, params: dict = None) -> Response:
+        return await self.request('GET', url, params=params)
+
+    async def post(self, url: str, params: dict = None, json: Any = None, data: Any = None) -> Response:
+        return await self.request('POST', url, params=params, json=json, data=data)
+
+    async def put(self, url: str, params: dict = None, json: Any = None) -> Response:
+        return await self.request('PUT', url, params=params, json=json)
+
+    async def delete(self, url: str, params: dict = None, json: Any = None) -> Response:
+        return await self.request('DELETE', url, params=params, json=json)
+
+    async def request(self, method: str, url: str, params: dict = None, json: Any = None,
+                      data: Any = None) -> Response:
+        """
+        :param json: body encoded as JSON
+        :param data: raw body or aiohttp.FormData, ignored if json is set
+        """
+        url = urljoin(self.prefix_url, url)
+        headers = {}
+        if json is not None:
+            data = self.__encode_json(url, json, headers)
+        start = time.monotonic()
+        response = None
+        try:
+            async with self.__session.request(method, url, params=AsyncZephyrSession.__params(params),
+                                              data=data, headers=headers) as r:
+                content = await r.read()
+                response = Response(method, str(r.url), r.status, r.reason, r.headers, content,
+                                    r.request_info, r.history)
+            return response
+        finally:
+            self.metrics.record(RequestRecord(
+                method=method.upper(),
+                endpoint=endpoint_template(url),
+                operation=current_operation(),
+                status=None if response is None else response.status_code,
+                latency=time.monotonic() - start,
+                request_bytes=len(data) if isinstance(data, bytes) else 0,
+                response_bytes=0 if response is None else AsyncZephyrSession.__response_bytes(response),
+            ))
+
+    async def close(self):
+        await self.__session.close()
+
+    def __encode_json(self, url: str, value: Any, headers: dict[str, str]) -> bytes:
+        body = json.dumps(value, allow_nan=False).encode()
+        headers['Content-Type'] = 'application/json'
+        if self.options.gzip_request_min_size is not None and len(body) >= self.options.gzip_request_min_size \
+                and AsyncZephyrSession.__gzip_paths.search(urlsplit(url).path) is not None:
+            body = gzip.compress(body)
+            headers['Content-Encoding'] = 'gzip'
+        return body
+
+    @staticmethod
+    def __params(params: Optional[dict]) -> Optional[dict]:
+        if params is None:
+            return None
+        # aiohttp does not accept boolean values, they are sent the same way as requests sends them
+        return {name: str(value) if isinstance(value, bool) else value for name, value in params.items()}
+
+    @staticmethod
+    def __response_bytes(response: Response) -> int:
+        content_length = response.headers.get('Content-Length', None)
+        if content_length is not None and content_length.isdigit():
+            return int(content_length)
+        return len(response.content)
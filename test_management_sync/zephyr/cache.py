@@ -0,0 +1,366 @@
+import threading
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import TypeVar, Generic, Optional, Iterable, Callable, Hashable, Iterator, Union
+
+from test_management_sync.model import Folder, Cycle
+from test_management_sync.zephyr.model.planning import Cycle as ZephyrCycle, Phase, Execution
+from test_management_sync.zephyr.model.requirements import RequirementTreeNode, Requirement as ZephyrRequirement
+from test_management_sync.zephyr.model.testcases import TestCaseTreeNode, TestCaseInTree, TestCase as ZephyrTestCase
+
+T = TypeVar("T")
+
+ItemKey = tuple[str, str]
+
+
+@dataclass(frozen=True)
+class CachedTestCase:
+    """
+    Part of a Zephyr test case that is required to find it and to resolve its ids
+    """
+    __slots__ = ('id', 'testcase_id', 'tcr_catalog_tree_id', 'name', 'description')
+    # id of the test case in the tree (used by executions)
+    id: int
+    # id of the test case (used by attachments and requirement mapping)
+    testcase_id: int
+    tcr_catalog_tree_id: int
+    name: str
+    description: str
+
+    @staticmethod
+    def of(zephyr_tc: TestCaseInTree) -> 'CachedTestCase':
+        return CachedTestCase(
+            id=zephyr_tc.testcase.id,
+            testcase_id=zephyr_tc.testcase.testcase_id,
+            tcr_catalog_tree_id=zephyr_tc.tcr_catalog_tree_id,
+            name=zephyr_tc.testcase.name,
+            description=zephyr_tc.testcase.description,
+        )
+
+    def to_zephyr(self, project_id: int) -> TestCaseInTree:
+        """
+        Creates Zephyr test case that contains only cached fields
+        """
+        return TestCaseInTree(
+            tcr_catalog_tree_id=self.tcr_catalog_tree_id,
+            testcase=ZephyrTestCase(name=self.name, description=self.description, project_id=project_id,
+                                    testcase_id=self.testcase_id, id=self.id),
+        )
+
+
+@dataclass(frozen=True)
+class CachedRequirement:
+    """
+    Part of a Zephyr requirement that is required to find it and to resolve its id
+    """
+    __slots__ = ('id', 'requirement_tree_id', 'name', 'description')
+    id: int
+    requirement_tree_id: int
+    name: str
+    description: str
+
+    @staticmethod
+    def of(zephyr_req: ZephyrRequirement) -> 'CachedRequirement':
+        return CachedRequirement(
+            id=zephyr_req.id,
+            requirement_tree_id=zephyr_req.requirement_tree_id,
+            name=zephyr_req.name,
+            description=zephyr_req.details,
+        )
+
+    def to_zephyr(self) -> ZephyrRequirement:
+        """
+        Creates Zephyr requirement that contains only cached fields
+        """
+        return ZephyrRequirement(name=self.name, details=self.description,
+                                 requirement_tree_id=self.requirement_tree_id, id=self.id)
+
+
+@dataclass(frozen=True)
+class CachedExecution:
+    """
+    Part of a Zephyr execution that is required to resolve its id and its last status
+    """
+    __slots__ = ('id', 'testcase_id', 'status')
+    id: int
+    # id of the test case in the tree
+    testcase_id: int
+    # id of the last execution status, None if the test case was not executed yet
+    status: Optional[str]
+
+    @staticmethod
+    def of(execution: Execution) -> 'CachedExecution':
+        return CachedExecution(
+            id=execution.id,
+            testcase_id=execution.tcr_tree_testcase.testcase.id,
+            status=None if execution.last_test_result is None else execution.last_test_result.execution_status,
+        )
+
+
+class PhaseExecutions:
+    """
+    Executions of one phase indexed by test case id.
+    If a test case has several executions in the phase the last one is found,
+    its last status is taken from the last execution that has a result
+    """
+    __slots__ = ('__by_testcase', '__executed_by_testcase', '__testcase_by_id')
+
+    def __init__(self, executions: Iterable[CachedExecution]):
+        self.__by_testcase = dict[int, CachedExecution]()
+        self.__executed_by_testcase = dict[int, CachedExecution]()
+        self.__testcase_by_id = dict[int, int]()
+        for execution in executions:
+            self.__by_testcase[execution.testcase_id] = execution
+            if execution.status is not None:
+                self.__executed_by_testcase[execution.testcase_id] = execution
+            self.__testcase_by_id[execution.id] = execution.testcase_id
+
+    def __len__(self) -> int:
+        return len(self.__by_testcase)
+
+    def find(self, testcase_id: int) -> Optional[CachedExecution]:
+        return self.__by_testcase.get(testcase_id, None)
+
+    def last_status(self, testcase_id: int) -> Optional[str]:
+        """
+        Returns the status of the last execution of the test case that has a result
+        """
+        execution = self.__executed_by_testcase.get(testcase_id, None)
+        return None if execution is None else execution.status
+
+    def execution_ids(self) -> Iterable[int]:
+        """
+        Ids of all executions of the phase including the ones that are not the last for their test cases
+        """
+        return self.__testcase_by_id.keys()
+
+    def status(self, execution_id: int) -> Optional[str]:
+        testcase_id = self.__testcase_by_id.get(execution_id, None)
+        if testcase_id is None:
+            return None
+        execution = self.__by_testcase[testcase_id]
+        return execution.status if execution.id == execution_id else None
+
+    def set_status(self, execution_id: int, status: str):
+        testcase_id = self.__testcase_by_id.get(execution_id, None)
+        if testcase_id is None:
+            return
+        execution = self.__by_testcase[testcase_id]
+        if execution.id == execution_id:
+            execution = CachedExecution(id=execution_id, testcase_id=testcase_id, status=status)
+            self.__by_testcase[testcase_id] = execution
+            self.__executed_by_testcase[testcase_id] = execution
+
+
+class FolderItems(Generic[T]):
+    """
+    Items of one folder with an index by key.
+    If several items have the same key the first one is found and all of them are found by find_all
+    """
+    __slots__ = ('__items', '__index', '__duplicates', '__key')
+
+    def __init__(self, items: Iterable[T], key: Callable[[T], Hashable]):
+        self.__items = list[T]()
+        self.__index = dict[Hashable, T]()
+        # all items of the keys that have several items
+        self.__duplicates = dict[Hashable, list[T]]()
+        self.__key = key
+        self.extend(items)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self.__items)
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    def find(self, key: Hashable) -> Optional[T]:
+        return self.__index.get(key, None)
+
+    def find_all(self, key: Hashable) -> list[T]:
+        duplicates = self.__duplicates.get(key, None)
+        if duplicates is not None:
+            return list(duplicates)
+        item = self.__index.get(key, None)
+        return [] if item is None else [item]
+
+    def extend(self, items: Iterable[T]):
+        for item in items:
+            self.__items.append(item)
+            key = self.__key(item)
+            first = self.__index.setdefault(key, item)
+            if first is not item:
+                self.__duplicates.setdefault(key, [first]).append(item)
+
+
+class FolderItemsCache(Generic[T]):
+    """
+    Cache of items (test cases or requirements) grouped by folder.
+    Items in each folder are indexed by the key.
+    If max_items is set the least recently used folders are evicted when the total number of items exceeds it
+    """
+
+    def __init__(self, key: Callable[[T], Hashable], max_items: Optional[int] = None):
+        if max_items is not None and max_items < 1:
+            raise ValueError(f'max items must be positive but was {max_items}')
+        self.__key = key
+        self.__max_items = max_items
+        self.__items = OrderedDict[Folder, FolderItems[T]]()
+        self.__size = 0
+        self.__evictions = 0
+        self.__lock = threading.RLock()
+
+    def __contains__(self, folder: Folder) -> bool:
+        with self.__lock:
+            return folder in self.__items
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return self.__size
+
+    @property
+    def evictions(self) -> int:
+        return self.__evictions
+
+    def get(self, folder: Folder) -> Optional[FolderItems[T]]:
+        with self.__lock:
+            items = self.__items.get(folder, None)
+            if items is not None:
+                self.__items.move_to_end(folder)
+            return items
+
+    def put(self, folder: Folder, items: Iterable[T]) -> FolderItems[T]:
+        with self.__lock:
+            self.invalidate(folder)
+            cached = FolderItems(items, self.__key)
+            self.__items[folder] = cached
+            self.__size += len(cached)
+            self.__evict(keep=folder)
+            return cached
+
+    def add(self, folder: Folder, items: Iterable[T]):
+        """
+        Adds items to the folder if the folder is cached. Otherwise, the folder is loaded on the next request
+        """
+        with self.__lock:
+            cached = self.__items.get(folder, None)
+            if cached is None:
+                return
+            added = list(items)
+            cached.extend(added)
+            self.__size += len(added)
+            self.__items.move_to_end(folder)
+            self.__evict(keep=folder)
+
+    def invalidate(self, folder: Folder):
+        with self.__lock:
+            cached = self.__items.pop(folder, None)
+            if cached is not None:
+                self.__size -= len(cached)
+
+    def clear(self):
+        with self.__lock:
+            self.__items.clear()
+            self.__size = 0
+
+    def __evict(self, keep: Folder):
+        if self.__max_items is None:
+            return
+        while self.__size > self.__max_items and len(self.__items) > 1:
+            folder = next(iter(self.__items))
+            if folder == keep:
+                self.__items.move_to_end(folder)
+                continue
+            self.invalidate(folder)
+            self.__evictions += 1
+
+
+def item_key(item: Union[CachedTestCase, CachedRequirement]) -> ItemKey:
+    return item.name, item.description
+
+
+class ZephyrCache:
+    """
+    Cache of Zephyr entities that belongs to one service instance
+    """
+
+    def __init__(self, max_items: Optional[int] = None):
+        self.requirement_tree: dict[Folder, RequirementTreeNode] = {}
+        self.testcase_tree: dict[Folder, TestCaseTreeNode] = {}
+        self.testcases = FolderItemsCache[CachedTestCase](item_key, max_items)
+        self.requirements = FolderItemsCache[CachedRequirement](item_key, max_items)
+        self.cycles: dict[Cycle, ZephyrCycle] = {}
+        self.phases: dict[Cycle, dict[str, Phase]] = defaultdict(dict)
+        # keys are ids of the phases, changed only by put_executions and invalidate_executions
+        self.executions: dict[int, PhaseExecutions] = {}
+        # executions of the phases by execution id
+        self.__executions_by_id = dict[int, PhaseExecutions]()
+        self.__executions_lock = threading.Lock()
+        # folders which test cases can be in the phase, the keys are ids of the phases.
+        # A phase from a test case tree contains all sub folders of its root folder.
+        # Free form phases that were not created by the service have no folders
+        self.phase_folders: dict[int, set[Folder]] = {}
+
+    def put_executions(self, phase_id: int, executions: PhaseExecutions):
+        with self.__executions_lock:
+            self.__remove_executions(phase_id)
+            self.executions[phase_id] = executions
+            for execution_id in executions.execution_ids():
+                self.__executions_by_id[execution_id] = executions
+
+    def set_execution_statuses(self, execution_ids: Iterable[int], status: str):
+        """
+        Updates the last status of the cached executions after they were executed
+        """
+        with self.__executions_lock:
+            for execution_id in execution_ids:
+                executions = self.__executions_by_id.get(execution_id, None)
+                if executions is not None:
+                    executions.set_status(execution_id, status)
+
+    def execution_status(self, execution_id: int) -> Optional[str]:
+        """
+        Returns the last status of the cached execution, None if it was not executed yet or is not cached
+        """
+        with self.__executions_lock:
+            executions = self.__executions_by_id.get(execution_id, None)
+            return None if executions is None else executions.status(execution_id)
+
+    def invalidate_executions(self, phases: Iterable[Phase]):
+        with self.__executions_lock:
+            for phase in phases:
+                self.__remove_executions(phase.id)
+
+    def __remove_executions(self, phase_id: int):
+        executions = self.executions.pop(phase_id, None)
+        if executions is None:
+            return
+        for execution_id in executions.execution_ids():
+            # the execution can be in another phase if it was loaded after this one
+            if self.__executions_by_id.get(execution_id, None) is executions:
+                del self.__executions_by_id[execution_id]
+
+    def may_contain(self, phase: Phase, folders: Iterable[Folder]) -> bool:
+        """
+        Returns False only if the phase is known not to contain test cases from the folders
+        """
+        phase_folders = self.phase_folders.get(phase.id, None)
+        if phase_folders is None:
+            return True
+        for folder in folders:
+            while folder is not None:
+                if folder in phase_folders:
+                    return True
+                folder = folder.parent
+        return False
+
+    def clear(self):
+        self.requirement_tree.clear()
+        self.testcase_tree.clear()
+        self.testcases.clear()
+        self.requirements.clear()
+        self.cycles.clear()
+        self.phases.clear()
+        with self.__executions_lock:
+            self.executions.clear()
+            self.__executions_by_id.clear()
+        self.phase_folders.clear()
@@ -0,0 +1,37 @@
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Optional, Collection
+
+
+@dataclass(frozen=True)
+class CycleFilter:
+    """
+    Defines which cycles are loaded on start.
+    Cycles that do not match the filter are loaded from the server when they are requested.
+    All conditions that are set must match
+    """
+    # cycles that end before that date are not loaded
+    start_date: Optional[date] = field(default=None)
+    # cycles that start after that date are not loaded
+    end_date: Optional[date] = field(default=None)
+    # regular expression that must match the cycle name
+    name_pattern: Optional[str] = field(default=None)
+    # names of the cycles to load, empty collection means that no cycle is loaded on start
+    names: Optional[Collection[str]] = field(default=None)
+
+    def __post_init__(self):
+        if self.start_date is not None and self.end_date is not None and self.start_date > self.end_date:
+            raise ValueError(f'start date {self.start_date} must be less or equal to end date {self.end_date}')
+
+    def matches(self, name: str, start_date: date, end_date: date) -> bool:
+        name = name.strip()
+        if self.names is not None and name not in self.names:
+            return False
+        if self.name_pattern is not None and re.search(self.name_pattern, name) is None:
+            return False
+        if self.start_date is not None and end_date < self.start_date:
+            return False
+        if self.end_date is not None and start_date > self.end_date:
+            return False
+        return True
@@ -0,0 +1,160 @@
+import copy
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Collection, Hashable
+from urllib.parse import urlsplit
+
+from requests import Response
+
+_SAFE_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+_FAMILY = re.compile(r'/rest/(?:v\d+|latest)/([^/?]+)')
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CacheOptions:
+    """
+    Options of the cache of GET responses for read-mostly endpoints.
+    Cached responses are invalidated when a request that changes the same resource family
+    (e.g. testcasetree or cycle) is sent through the same session.
+    The cache is kept in memory, so it helps only with requests repeated by one session while the process runs
+    """
+    max_entries: int = field(default=256)
+    # seconds during which a cached response is used without a request.
+    # After that the response is revalidated if the server sent ETag or Last-Modified, otherwise it is requested again
+    ttl: float = field(default=60.0)
+    # regular expressions of the cacheable paths
+    paths: Collection[str] = field(default=(
+        r'/testcasetree/lite$',
+        r'/v4/requirementtree(/\d+)?$',
+        r'/admin/preference/',
+        r'/user/current$',
+    ))
+
+    def __post_init__(self):
+        if self.max_entries < 1:
+            raise ValueError(f'max entries must be positive but was {self.max_entries}')
+
+
+@dataclass
+class _Entry:
+    response: Response
+    family: str
+    stored_at: float
+
+
+class ResponseCache:
+    def __init__(self, options: CacheOptions):
+        self.__options = options
+        self.__paths = [re.compile(path) for path in options.paths]
+        self.__entries = OrderedDict[Hashable, _Entry]()
+        # incremented on each invalidation so responses requested before it are not stored
+        self.__generations = defaultdict[str, int](int)
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__revalidations = 0
+
+    @property
+    def hits(self) -> int:
+        """
+        Number of responses returned without a request
+        """
+        return self.__hits
+
+    @property
+    def revalidations(self) -> int:
+        """
+        Number of responses confirmed by the server as not modified
+        """
+        return self.__revalidations
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    def request(self, method: str, url: str, kwargs: dict, send: Callable[[dict], Response]) -> Response:
+        """
+        :param send: sends the request with the given keyword arguments
+        """
+        method = method.upper()
+        path = urlsplit(url).path
+        if method not in _SAFE_METHODS:
+            self.__invalidate(ResponseCache.__family(path))
+            return send(kwargs)
+        if method != 'GET' or kwargs.get('stream', False) or not any(p.search(path) for p in self.__paths):
+            return send(kwargs)
+
+        key = ResponseCache.__key(url, kwargs.get('params', None))
+        family = ResponseCache.__family(path)
+        with self.__lock:
+            generation = self.__generations[family]
+            entry = self.__entries.get(key, None)
+            if entry is not None:
+                self.__entries.move_to_end(key)
+            if entry is not None and time.monotonic() - entry.stored_at < self.__options.ttl:
+                self.__hits += 1
+                return copy.copy(entry.response)
+
+        validators = {} if entry is None else ResponseCache.__validators(entry.response)
+        if validators:
+            kwargs = dict(kwargs)
+            kwargs['headers'] = {**(kwargs.get('headers', None) or {}), **validators}
+        response = send(kwargs)
+        if response.status_code == 304 and entry is not None:
+            with self.__lock:
+                self.__revalidations += 1
+            self.__store(key, entry.response, family, generation)
+            return copy.copy(entry.response)
+        if 200 <= response.status_code < 300:
+            # the content is read so the response can be returned several times
+            _ = response.content
+            self.__store(key, response, family, generation)
+            return copy.copy(response)
+        return response
+
+    def __store(self, key: Hashable, response: Response, family: str, generation: int):
+        with self.__lock:
+            if self.__generations[family] != generation:
+                return
+            self.__entries[key] = _Entry(response=response, family=family, stored_at=time.monotonic())
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__options.max_entries:
+                self.__entries.popitem(last=False)
+
+    def __invalidate(self, family: str):
+        with self.__lock:
+            self.__generations[family] += 1
+            keys = [key for key, entry in self.__entries.items() if entry.family == family]
+            for key in keys:
+                del self.__entries[key]
+        if keys:
+            _logger.debug('invalidated %s cached response(s) of %s', len(keys), family)
+
+    @staticmethod
+    def __key(url: str, params) -> Hashable:
+        if not params:
+            return url
+        items = params.items() if isinstance(params, dict) else params
+        return url, tuple(sorted((str(name), str(value)) for name, value in items))
+
+    @staticmethod
+    def __family(path: str) -> str:
+        match = _FAMILY.search(path)
+        return path if match is None else match.group(1)
+
+    @staticmethod
+    def __validators(response: Response) -> dict[str, str]:
+        validators = {}
+        etag = response.headers.get('ETag', None)
+        if etag is not None:
+            validators['If-None-Match'] = etag
+        last_modified = response.headers.get('Last-Modified', None)
+        if last_modified is not None:
+            validators['If-Modified-Since'] = last_modified
+        return validators
@@ -0,0 +1,183 @@
+import contextvars
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Optional, Callable, Iterator
+from urllib.parse import urlsplit
+
+from requests import Response
+
+# upper bounds of latency histogram buckets in seconds, the last bucket is unbounded
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_ID_SEGMENT = re.compile(r'^(\d+|-\d+)$')
+
+_logger = logging.getLogger(__name__)
+
+# context variables are local to a thread and to an asyncio task
+_operation = contextvars.ContextVar[Optional[str]]('operation', default=None)
+
+
+@dataclass(frozen=True)
+class RequestRecord:
+    """
+    Measurements of one HTTP request
+    """
+    method: str
+    # path of the request with numeric segments replaced with {id}
+    endpoint: str
+    # logical operation the request belongs to, e.g. all pages of one search
+    operation: Optional[str]
+    # None if no response was received
+    status: Optional[int]
+    latency: float
+    request_bytes: int
+    response_bytes: int
+
+    @property
+    def failed(self) -> bool:
+        return self.status is None or self.status >= 400
+
+
+@dataclass(frozen=True)
+class EndpointMetrics:
+    calls: int = field(default=0)
+    errors: int = field(default=0)
+    # total latency in seconds
+    latency: float = field(default=0.0)
+    # number of calls in each bucket of LATENCY_BUCKETS plus the unbounded one
+    latency_histogram: tuple[int, ...] = field(default=(0,) * (len(LATENCY_BUCKETS) + 1))
+    request_bytes: int = field(default=0)
+    response_bytes: int = field(default=0)
+
+    @property
+    def mean_latency(self) -> float:
+        return self.latency / self.calls if self.calls else 0.0
+
+    def add(self, record: RequestRecord) -> 'EndpointMetrics':
+        histogram = list(self.latency_histogram)
+        histogram[bisect_left(LATENCY_BUCKETS, record.latency)] += 1
+        return EndpointMetrics(
+            calls=self.calls + 1,
+            errors=self.errors + (1 if record.failed else 0),
+            latency=self.latency + record.latency,
+            latency_histogram=tuple(histogram),
+            request_bytes=self.request_bytes + record.request_bytes,
+            response_bytes=self.response_bytes + record.response_bytes,
+        )
+
+
+@dataclass(frozen=True)
+class MetricsSnapshot:
+    # keys are method and endpoint, e.g. 'GET /flex/services/rest/v3/execution'
+    endpoints: dict[str, EndpointMetrics]
+    # keys are names of logical operations
+    operations: dict[str, EndpointMetrics]
+
+
+def current_operation() -> Optional[str]:
+    return _operation.get()
+
+
+@contextmanager
+def operation(name: str) -> Iterator[None]:
+    """
+    Groups requests sent by the current thread or asyncio task in the block under the logical operation
+    """
+    token = _operation.set(name)
+    try:
+        yield
+    finally:
+        _operation.reset(token)
+
+
+def endpoint_template(url: str) -> str:
+    path = urlsplit(url).path
+    return '/'.join('{id}' if _ID_SEGMENT.match(segment) else segment for segment in path.split('/'))
+
+
+class RequestMetrics:
+    """
+    Collects metrics of HTTP requests per endpoint and per logical operation
+    """
+
+    def __init__(self):
+        self.__endpoints = dict[str, EndpointMetrics]()
+        self.__operations = dict[str, EndpointMetrics]()
+        self.__listeners = list[Callable[[RequestRecord], None]]()
+        self.__lock = threading.Lock()
+
+    def add_listener(self, listener: Callable[[RequestRecord], None]):
+        """
+        The listener is called for each request in the thread that sent it
+        """
+        with self.__lock:
+            self.__listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[RequestRecord], None]):
+        with self.__lock:
+            self.__listeners.remove(listener)
+
+    def snapshot(self) -> MetricsSnapshot:
+        with self.__lock:
+            return MetricsSnapshot(endpoints=dict(self.__endpoints), operations=dict(self.__operations))
+
+    def reset(self):
+        with self.__lock:
+            self.__endpoints.clear()
+            self.__operations.clear()
+
+    def measure(self, method: str, url: str, send: Callable[[], Response], stream: bool = False) -> Response:
+        start = time.monotonic()
+        response = None
+        try:
+            response = send()
+            return response
+        finally:
+            self.record(RequestRecord(
+                method=method.upper(),
+                endpoint=endpoint_template(url),
+                operation=current_operation(),
+                status=None if response is None else response.status_code,
+                latency=time.monotonic() - start,
+                request_bytes=0 if response is None else RequestMetrics.__request_bytes(response),
+                response_bytes=0 if response is None else RequestMetrics.__response_bytes(response, stream),
+            ))
+
+    def record(self, record: RequestRecord):
+        key = f'{record.method} {record.endpoint}'
+        with self.__lock:
+            self.__endpoints[key] = self.__endpoints.get(key, EndpointMetrics()).add(record)
+            if record.operation is not None:
+                self.__operations[record.operation] = \
+                    self.__operations.get(record.operation, EndpointMetrics()).add(record)
+            listeners = list(self.__listeners)
+        for listener in listeners:
+            try:
+                listener(record)
+            except Exception as e:
+                _logger.warning('metrics listener %s failed: %s', listener, e)
+
+    @staticmethod
+    def __request_bytes(response: Response) -> int:
+        body = response.request.body if response.request is not None else None
+        if body is None:
+            return 0
+        if isinstance(body, (bytes, str)):
+            return len(body)
+        return int(response.request.headers.get('Content-Length', 0))
+
+    @staticmethod
+    def __response_bytes(response: Response, stream: bool) -> int:
+        content_length = response.headers.get('Content-Length', None)
+        if content_length is not None and content_length.isdigit():
+            # size on the wire, it differs from the size of decoded content if the response is compressed
+            return int(content_length)
+        if stream:
+            # reading the content here would consume the stream
+            return 0
+        return len(response.content)
@@ -0,0 +1,108 @@
+"""
+Decoders for the models that are received in large numbers (search results, executions, test cases, requirements).
+They build objects directly from JSON and skip the fields that are not used when the items are read:
+requirement ids of test cases, release ids, tree ids and custom properties of requirements.
+If JSON does not have the expected structure the dataclasses_json decoding is used
+"""
+import logging
+from typing import Callable, TypeVar
+
+from test_management_sync.zephyr.model.planning import Execution, ExecutionTestResult
+from test_management_sync.zephyr.model.requirements import Requirement
+from test_management_sync.zephyr.model.search import SearchResult
+from test_management_sync.zephyr.model.testcases import TestCaseInTree, TestCase
+
+T = TypeVar("T")
+
+_logger = logging.getLogger(__name__)
+
+
+def decode_search_result(raw: dict) -> SearchResult:
+    return _decode(raw, _decode_search_result, SearchResult.from_dict)
+
+
+def decode_execution(raw: dict) -> Execution:
+    return _decode(raw, _decode_execution, Execution.from_dict)
+
+
+def decode_testcase_in_tree(raw: dict) -> TestCaseInTree:
+    return _decode(raw, _decode_testcase_in_tree, TestCaseInTree.from_dict)
+
+
+def decode_requirement(raw: dict) -> Requirement:
+    return _decode(raw, _decode_requirement, Requirement.from_dict)
+
+
+def _decode(raw: dict, decoder: Callable[[dict], T], fallback: Callable[[dict], T]) -> T:
+    try:
+        return decoder(raw)
+    except (KeyError, TypeError, AttributeError) as e:
+        _logger.debug('cannot decode %s: %r, using dataclasses_json', raw, e)
+        return fallback(raw)
+
+
+def _new(cls: type[T], **fields) -> T:
+    # __init__ generated by dataclasses_json for Undefined.EXCLUDE inspects the signature on every call,
+    # so the instances are created directly. All fields must be set
+    instance = cls.__new__(cls)
+    instance.__dict__.update(fields)
+    return instance
+
+
+def _decode_search_result(raw: dict) -> SearchResult:
+    results = raw['results']
+    if not isinstance(results, list):
+        raise TypeError(f'results must be a list but was {type(results)}')
+    return _new(
+        SearchResult,
+        first_result=raw['firstResult'],
+        result_size=raw['resultSize'],
+        page_number=raw['pageNumber'],
+        results=results,
+    )
+
+
+def _decode_execution(raw: dict) -> Execution:
+    raw_result = raw.get('lastTestResult', None)
+    return _new(
+        Execution,
+        id=raw['id'],
+        tester_id=raw['testerId'],
+        tcr_tree_testcase=_decode_testcase_in_tree(raw['tcrTreeTestcase']),
+        last_test_result=None if raw_result is None
+        else _new(ExecutionTestResult, execution_status=raw_result['executionStatus']),
+    )
+
+
+def _decode_testcase_in_tree(raw: dict) -> TestCaseInTree:
+    raw_testcase = raw['testcase']
+    return _new(
+        TestCaseInTree,
+        tcr_catalog_tree_id=raw['tcrCatalogTreeId'],
+        testcase=_new(
+            TestCase,
+            name=raw_testcase['name'],
+            description=raw_testcase['description'],
+            project_id=raw_testcase['projectId'],
+            release_id=raw_testcase.get('releaseId', None),
+            writer_id=raw_testcase.get('writerId', None),
+            testcase_id=raw_testcase.get('testcaseId', None),
+            automated=raw_testcase.get('automated', False),
+            requirement_ids=[],
+            id=raw_testcase.get('id', None),
+            comments=raw_testcase.get('comments', None),
+        ),
+    )
+
+
+def _decode_requirement(raw: dict) -> Requirement:
+    return _new(
+        Requirement,
+        name=raw['name'],
+        details=raw['details'],
+        requirement_tree_id=raw.get('requirementTreeId', None),
+        id=raw.get('id', None),
+        release_ids=[],
+        requirement_tree_ids=[],
+        custom_properties={},
+    )
@@ -47,6 +47,7 @@ class TestCaseTreeNode(DataClassJsonMixin):
     linked_tcp_catalog_tree_id: Optional[int] =\
         field(default=None, metadata=config(exclude=exclude_if_none, field_name='linkedTCRCatalogTreeId'))
     type: str = field(default='Phase')
+    parent_id: Optional[int] = field(default=None, metadata=config(exclude=exclude_if_none))
 
 
 @dataclass_json(letter_case=LetterCase.CAMEL, undefined=Undefined.EXCLUDE)
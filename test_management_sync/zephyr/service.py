@@ -1,49 +1,175 @@
+import dataclasses
+import hashlib
 import json
 import logging
+import threading
+import time
 from collections import defaultdict
-from datetime import date, datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from pathlib import Path
+from typing import Optional, Callable, TypeVar, Iterable, Union
+
+from requests import HTTPError
 
 from test_management_sync.model import ExecutionStatus, Cycle, TestCase, RootFolder, Requirement, Folder, AttachedFile
 from test_management_sync.service import Service
-from test_management_sync.util import group_tc_by_folder
+from test_management_sync.util import group_tc_by_folder, group_by_status
 from test_management_sync.zephyr.actions import (user, planning, testcase, testcase_tree, requirement_tree,
                                                  attachments as file_attachment, preferences)
 from test_management_sync.zephyr.actions import requirement
+from test_management_sync.zephyr.actions.search import SearchOptions, SearchEndpoint, PageSize, PageStats
+from test_management_sync.zephyr.cache import ZephyrCache, FolderItems, CachedTestCase, CachedRequirement, \
+    CachedExecution, PhaseExecutions
+from test_management_sync.zephyr.filters import CycleFilter
+from test_management_sync.zephyr.http_cache import CacheOptions
+from test_management_sync.zephyr.metrics import RequestMetrics
 from test_management_sync.zephyr.model.attachments import AttachmentRequest, Attachment
 from test_management_sync.zephyr.model.planning import Cycle as ZephyrCycle, Phase, TestCasesAssignment
 from test_management_sync.zephyr.model.requirements import RequirementTreeNode, Requirement as ZephyrRequirement
 from test_management_sync.zephyr.model.testcases import TestCaseTreeNode, TestCaseInTree, TestCase as ZephyrTestCase
-from test_management_sync.zephyr.session import ZephyrSession
+from test_management_sync.zephyr.session import ZephyrSession, ConnectionOptions
+from test_management_sync.zephyr.single_flight import SingleFlight
+from test_management_sync.zephyr.snapshot import ReleaseSnapshot, read_snapshot, write_snapshot
+from test_management_sync.zephyr.throttling import ThrottlingOptions
+from test_management_sync.zephyr.tree import walk_breadth_first, TreeLevel, TreeLoadingStrategy
 
 _EXECUTION_STATUSES_PREFERENCE_NAME = 'testresult.testresultStatus.LOV'
 
 _logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 class ZephyrService(Service):
-    __req_tree_cache: dict[Folder, RequirementTreeNode] = {}
-    __tc_tree_cache: dict[Folder, TestCaseTreeNode] = {}
-    __tc_cache: dict[Folder, list[TestCaseInTree]] = defaultdict(list)
-    __req_cache: dict[Folder, list[ZephyrRequirement]] = defaultdict(list)
-    __cycle_cache: dict[Cycle, ZephyrCycle] = {}
-    __phase_cache: dict[Cycle, dict[str, Phase]] = defaultdict(dict)
     __batch_size: int = 1000
+    __default_page_sizes: dict[SearchEndpoint, int] = {
+        SearchEndpoint.EXECUTIONS: 100,
+        SearchEndpoint.TESTCASES: 100,
+        SearchEndpoint.RELEASE_TESTCASES: 1000,
+        SearchEndpoint.REQUIREMENTS: 100,
+    }
 
     def __init__(self, zephyr_url: str, api_token: str, project_id: int,
-                 release_id: int, execution_statuses: list[ExecutionStatus] = None):
+                 release_id: int, execution_statuses: list[ExecutionStatus] = None, loader_workers: int = 1,
+                 lazy: bool = False, snapshot_path: Path = None, snapshot_max_age: timedelta = None,
+                 cycle_filter: CycleFilter = None, max_cached_items: int = None,
+                 tree_loading: TreeLoadingStrategy = TreeLoadingStrategy.PER_NODE,
+                 bulk_testcase_loading: bool = False,
+                 search_options: Union[SearchOptions, dict[SearchEndpoint, SearchOptions]] = None,
+                 connection_options: ConnectionOptions = None, throttling_options: ThrottlingOptions = None,
+                 cache_options: CacheOptions = None, execution_workers: int = 1,
+                 skip_unchanged_executions: bool = False):
+        """
+        :param loader_workers: number of concurrent requests used to load existing data on start.
+            If greater than 1 the requirement tree, test case tree and cycles are loaded in parallel
+            and each level of the trees is loaded concurrently
+        :param lazy: if True the requirement and test case trees are not loaded on start.
+            Only the folders on the path from the requested folder to its root are loaded when they are used
+        :param snapshot_path: path to the SQLite file where the state of the release is stored between runs.
+            On start the state is loaded from the snapshot and only the trees which root nodes changed are reloaded.
+            Other folders and cycles from the snapshot are checked on the server when they are used for the first time.
+            Folders and cycles missing in the snapshot are looked up on the server before they are created
+        :param snapshot_max_age: snapshot older than that is ignored
+        :param cycle_filter: limits the cycles loaded on start. Other cycles are loaded when they are requested
+        :param max_cached_items: max number of cached test cases and max number of cached requirements.
+            The least recently used folders are evicted and loaded again when they are requested
+        :param tree_loading: defines how the trees are loaded.
+            With FLAT strategy all test case folders of the release are requested at once
+            and each requirement tree is requested with all nested folders.
+            The trees are assembled locally. The server might omit folders from these responses,
+            so missing folders are looked up one by one before they are created
+        :param bulk_testcase_loading: if True the test cases of all folders are loaded with release-wide requests
+            when the whole test case tree is used (e.g. to get last execution statuses for all test cases in a cycle)
+        :param search_options: options of paginated requests (test cases, requirements and executions)
+            for all endpoints or for each endpoint separately.
+            Pages can be requested concurrently if the server reports the total number of results.
+            The page size can be fixed or adaptive. Statistics of the requested pages are available via search_stats
+        :param connection_options: options of HTTP connections (pool size, keep-alive and compression).
+            By default, the pool is sized for the concurrent requests defined by loader_workers and search_options
+        :param throttling_options: if set the rate and the number of concurrent requests are limited.
+            The concurrency limit adapts to the latency and overload responses (429, 503) of the server
+            and GET requests are retried after such responses
+        :param cache_options: if set responses of read-mostly endpoints (trees, preferences, current user)
+            are cached in memory and revalidated with ETag/Last-Modified when they expire.
+            Changes made by this service invalidate the cached responses of the changed resources.
+            The cache is not kept between runs, use snapshot_path for that
+        :param execution_workers: number of concurrent requests used to set execution statuses.
+            If greater than 1 the batches of executions are sent in parallel. All batches are sent even if some of them
+            fail and the error lists the test cases of the failed batches
+        :param skip_unchanged_executions: if True executions which last status already equals the requested one
+            are not sent. The last status is taken from the executions loaded by this service
+            and updated by its own executions. The number of skipped executions is logged
+            and counted by skipped_executions
+        """
         if len(zephyr_url) == 0:
             raise ValueError('empty zephyr url')
         if len(api_token) == 0:
             raise ValueError('empty api token')
-        self.__session = ZephyrSession(prefix_url=zephyr_url, api_token=api_token)
+        if loader_workers < 1:
+            raise ValueError(f'loader workers must be positive but was {loader_workers}')
+        self.__loader_workers = loader_workers
+        if execution_workers < 1:
+            raise ValueError(f'execution workers must be positive but was {execution_workers}')
+        self.__execution_workers = execution_workers
+        self.__skip_unchanged_executions = skip_unchanged_executions
+        self.__skipped_executions = 0
+        self.__skipped_executions_lock = threading.Lock()
+        self.__lazy = lazy
+        self.__tree_loading = tree_loading
+        self.__bulk_testcase_loading = bulk_testcase_loading
+        self.__search_options = ZephyrService.__resolve_search_options(search_options)
+        self.__cache = ZephyrCache(max_cached_items)
+        self.__folder_loads = SingleFlight[FolderItems]()
+        self.__execution_loads = SingleFlight[PhaseExecutions]()
+        self.__zephyr_url = zephyr_url
+        self.__snapshot_path = snapshot_path
+        self.__token_digest = hashlib.sha256(api_token.encode()).hexdigest()
+        if connection_options is None:
+            connection_options = ConnectionOptions(
+                pool_size=ZephyrService.__required_connections(loader_workers, execution_workers,
+                                                              self.__search_options))
+        self.__session = ZephyrSession(prefix_url=zephyr_url, api_token=api_token, options=connection_options,
+                                       throttling=throttling_options, cache=cache_options)
         self.__project_id = project_id
         self.__release_id = release_id
+        snapshot = None if snapshot_path is None \
+            else read_snapshot(snapshot_path, zephyr_url, project_id, release_id, snapshot_max_age)
+        if snapshot is not None:
+            _logger.info("using snapshot created at %s", datetime.fromtimestamp(snapshot.created_at))
+        self.__snapshot_created_at = snapshot.created_at if snapshot is not None else time.time()
+        # folders which sub folders are already loaded (None is used for root folders)
+        self.__req_tree_expanded = set[Optional[Folder]]()
+        self.__tc_tree_expanded = set[Optional[Folder]]()
+        # folders from the snapshot that are not checked on the server yet
+        self.__unverified_req_folders = set[Folder]()
+        self.__unverified_tc_folders = set[Folder]()
+        # if the tree is not complete missing folders are looked up on the server
+        # nested requirement folders might be truncated by the server so missing folders are checked before creation
+        self.__req_tree_complete = not lazy and snapshot is None and tree_loading == TreeLoadingStrategy.PER_NODE
+        self.__tc_tree_complete = not lazy and snapshot is None and tree_loading == TreeLoadingStrategy.PER_NODE
+        # if the tree is not loaded it is reloaded when all folders are used
+        self.__tc_tree_loaded = not lazy and snapshot is None
+        self.__cycle_filter = cycle_filter
+        # if cycles are not complete missing cycles are looked up on the server
+        self.__cycles_complete = snapshot is None and cycle_filter is None
+        # cycles which phases are loaded from the server by this instance.
+        # Other cycles come from the snapshot and are checked on the server when they are used for the first time
+        self.__verified_cycles = set[Cycle]()
+        # ids of all cycles in the release, loaded when a cycle is not found for the first time
+        self.__cycle_ids: Optional[dict[Cycle, int]] = None
+        if execution_statuses is None and snapshot is not None and snapshot.execution_statuses:
+            execution_statuses = snapshot.execution_statuses
         self.__execution_statuses = \
             ZephyrService.__to_dict(
                 execution_statuses if execution_statuses is not None else self.__load_execution_statuses()
             )
-        self.__tester_id = user.get_user_id(self.__session)
-        self.__load_existing_data()
+        if snapshot is not None and snapshot.tester_id is not None and snapshot.token_digest == self.__token_digest:
+            self.__tester_id = snapshot.tester_id
+        else:
+            self.__tester_id = user.get_user_id(self.__session)
+        self.__load_existing_data(snapshot)
+        if snapshot is None:
+            self.__save_snapshot()
 
     def __enter__(self):
         return self
@@ -52,24 +178,27 @@ class ZephyrService(Service):
         self.close()
 
     def close(self):
+        self.__save_snapshot()
+        self.__cache.clear()
         self.__session.close()
 
     def create_requirement_folder_if_not_exists(self, folder: Folder):
-        if folder in self.__req_tree_cache:
+        if self.__find_req_node(folder) is not None:
             _logger.debug('folder %s found in cache', folder)
             return
         if folder.parent is not None:
             self.create_requirement_folder_if_not_exists(folder.parent)
 
-        parent = None if folder.parent is None else self.__req_tree_cache[folder.parent]
+        parent = None if folder.parent is None else self.__req_node(folder.parent)
         node = RequirementTreeNode(name=folder.name, description='', project_id=self.__project_id,
                                    release_ids=[str(self.__release_id)], parent_id=0 if parent is None else parent.id)
         node = requirement_tree.new_requirement_tree_node(self.__session, node)
-        self.__req_tree_cache[folder] = node
+        self.__cache.requirement_tree[folder] = node
+        self.__req_tree_expanded.add(folder)
 
     def create_requirements(self, folder: Folder, requirements: list[Requirement]):
         _logger.info('creating %s requirement(s) in folder %s', len(requirements), folder.name)
-        req_folder = self.__req_tree_cache[folder]
+        req_folder = self.__req_node(folder)
         for req in requirements:
             _logger.debug("creating requirement %s", req)
             zephyr_req = ZephyrRequirement(
@@ -79,44 +208,39 @@ class ZephyrService(Service):
                 release_ids=[self.__release_id],
             )
             zephyr_req = requirement.new_requirement(self.__session, zephyr_req)
-            self.__req_cache[folder].append(zephyr_req)
+            self.__cache.requirements.add(folder, [CachedRequirement.of(zephyr_req)])
 
     def get_requirements(self, folder: Folder) -> list[Requirement]:
         _logger.info("getting requirements in folder %s", folder.name)
-        if folder in self.__req_cache:
-            return ZephyrService.__to_model_req(folder, self.__req_cache[folder])
-        req_folder = self.__req_tree_cache[folder]
-        zephyr_reqs = requirement.find_requirements(self.__session, self.__release_id, req_folder)
-        self.__req_cache[folder].extend(zephyr_reqs)
+        zephyr_reqs = self.__get_zephyr_requirements(folder)
         return ZephyrService.__to_model_req(folder, zephyr_reqs)
 
     def remove_requirements(self, folder: Folder):
         _logger.info("removing requirements in folder %s", folder.name)
-        req_node = self.__req_tree_cache.get(folder, None)
+        req_node = self.__find_req_node(folder)
         if req_node is None:
             return
         requirement.delete_all_for_tree(self.__session, self.__release_id, req_node)
-        if folder in self.__req_cache:
-            del self.__req_cache[folder]
+        self.__cache.requirements.put(folder, [])
 
     def create_testcase_folder_if_not_exists(self, folder: Folder):
-        if folder in self.__tc_tree_cache:
+        if self.__find_tc_node(folder) is not None:
             return
         if folder.parent is not None:
             self.create_testcase_folder_if_not_exists(folder.parent)
-        parent = None if folder.parent is None else self.__tc_tree_cache[folder.parent]
+        parent = None if folder.parent is None else self.__tc_node(folder.parent)
         node = TestCaseTreeNode(name=folder.name, release_id=self.__release_id)
         node = testcase_tree.create_test_case_tree_node(self.__session, node, parent)
-        self.__tc_tree_cache[folder] = node
+        self.__cache.testcase_tree[folder] = node
+        self.__tc_tree_expanded.add(folder)
 
     def remove_testcases(self, folder: Folder):
         _logger.info("removing test cases in folder %s", folder.name)
-        tc_node = self.__tc_tree_cache.get(folder, None)
+        tc_node = self.__find_tc_node(folder)
         if tc_node is None:
             return
         testcase.delete_all_for_tree(self.__session, tc_node)
-        if folder in self.__tc_cache:
-            del self.__tc_cache[folder]
+        self.__cache.testcases.put(folder, [])
 
     def get_testcases(self, folder: Folder) -> list[TestCase]:
         _logger.info("getting test cases in folder %s", folder.name)
@@ -127,7 +251,7 @@ class ZephyrService(Service):
         if not tc_to_create:
             return
         _logger.info("creating %s test case(s) in folder %s", len(tc_to_create), folder.name)
-        zephyr_tc_node = self.__tc_tree_cache[folder]
+        zephyr_tc_node = self.__tc_node(folder)
         zephyr_tcs_in_tree = list(map(
             lambda tc: TestCaseInTree(
                 tcr_catalog_tree_id=zephyr_tc_node.id,
@@ -136,46 +260,38 @@ class ZephyrService(Service):
             tc_to_create,
         ))
         created_tcs = testcase.new_test_cases(self.__session, zephyr_tcs_in_tree)
-        self.__tc_cache[folder].extend(created_tcs)
+        self.__cache.testcases.add(folder, map(CachedTestCase.of, created_tcs))
 
     def map_testcases_to_requirement(self, req: Requirement, tc_folder: Folder, tcs: list[TestCase]):
         _logger.info("mapping requirement %s to %s test case(s) in folder %s", req.name, len(tcs), tc_folder.name)
-        zephyr_reqs = self.__req_cache[req.folder]
-        zephyr_req = None
-        for zephyr_r in zephyr_reqs:
-            if zephyr_r.name == req.name and zephyr_r.details == req.description:
-                zephyr_req = zephyr_r
-                break
+        zephyr_reqs = self.__get_zephyr_requirements(req.folder)
+        zephyr_req = zephyr_reqs.find((req.name, req.description))
         if zephyr_req is None:
             raise Exception(f'cannot find requirement {req}')
 
         tc_tree_nodes = []
         start = tc_folder
         while start is not None:
-            tc_tree_nodes.append(self.__tc_tree_cache[start])
+            tc_tree_nodes.append(self.__tc_node(start))
             start = start.parent
         tc_tree_nodes.reverse()
 
-        zephyr_tcs = self.__tc_cache[tc_folder]
-
-        def find_test_case(zephyr_tc: TestCaseInTree) -> bool:
-            for tc in tcs:
-                if tc.name == zephyr_tc.testcase.name and tc.description == zephyr_tc.testcase.description:
-                    return True
-            return False
-
-        filtered_test_cases = list(filter(find_test_case, zephyr_tcs))
-        requirement.map_requirement_to_test_cases(self.__session, self.__release_id, zephyr_req,
+        zephyr_tcs = self.__get_zephyr_testcases(tc_folder)
+        found_test_cases = dict[int, TestCaseInTree]()
+        for tc in tcs:
+            # all test cases with the same name and description are mapped
+            for zephyr_tc in zephyr_tcs.find_all((tc.name, tc.description)):
+                found_test_cases[zephyr_tc.id] = zephyr_tc.to_zephyr(self.__project_id)
+        filtered_test_cases = list(found_test_cases.values())
+        requirement.map_requirement_to_test_cases(self.__session, self.__release_id, zephyr_req.to_zephyr(),
                                                   filtered_test_cases, tc_tree_nodes)
 
     def create_cycle_if_not_exist(self, cycle: Cycle, delete_if_exist: bool):
-        if cycle in self.__cycle_cache:
+        zephyr_cycle = self.__find_cycle(cycle)
+        if zephyr_cycle is not None:
             if delete_if_exist:
-                zephyr_cycle = self.__cycle_cache.get(cycle, None)
-                if zephyr_cycle is not None:
-                    planning.delete_cycle(self.__session, zephyr_cycle)
-                    del self.__cycle_cache[cycle]
-                    del self.__phase_cache[cycle]
+                planning.delete_cycle(self.__session, zephyr_cycle)
+                self.__forget_cycle(cycle)
             else:
                 return
         zephyr_cycle = ZephyrCycle(
@@ -185,28 +301,33 @@ class ZephyrService(Service):
             release_id=self.__release_id,
         )
         zephyr_cycle = planning.create_cycle(self.__session, zephyr_cycle)
-        self.__cycle_cache[cycle] = zephyr_cycle
+        self.__cache.cycles[cycle] = zephyr_cycle
+        self.__verified_cycles.add(cycle)
+        if self.__cycle_ids is not None:
+            self.__cycle_ids[cycle] = zephyr_cycle.id
 
     def create_phase_if_not_exist(self, cycle: Cycle, phase_root: RootFolder):
-        cycle_phases = self.__phase_cache[cycle]
-        if phase_root.name in cycle_phases:
+        if self.__find_phase(cycle, phase_root.name) is not None:
             return
-        zephyr_cycle = self.__cycle_cache[cycle]
-        if phase_root not in self.__tc_tree_cache:
+        cycle_phases = self.__cache.phases[cycle]
+        zephyr_cycle = self.__cache.cycles[cycle]
+        tc_tree_node = self.__find_tc_node(phase_root)
+        if tc_tree_node is None:
             raise KeyError(f'cannot find folder with name {phase_root.name}')
-        tc_tree_node = self.__tc_tree_cache[phase_root]
         phase = planning.create_cycle_phase_from_test_case_tree(self.__session, zephyr_cycle, tc_tree_node)
         cycle_phases[phase_root.name] = phase
+        self.__cache.phase_folders[phase.id] = {phase_root}
+        self.__cache.invalidate_executions([phase])
 
     def create_free_phase_if_not_exist(self, cycle: Cycle, phase_name: str, test_cases: list[TestCase]):
         _logger.info("creating phase %s in cycle %s with %s test case(s)", phase_name, cycle.name, len(test_cases))
-        cycle_phases = self.__phase_cache[cycle]
-        if phase_name not in cycle_phases:
-            zephyr_cycle = self.__cycle_cache[cycle]
+        phase = self.__find_phase(cycle, phase_name)
+        if phase is None:
+            zephyr_cycle = self.__cache.cycles[cycle]
             phase = planning.create_cycle_phase_free_form(self.__session, zephyr_cycle, phase_name)
-            cycle_phases[phase_name] = phase
-        else:
-            phase = cycle_phases[phase_name]
+            self.__cache.phases[cycle][phase_name] = phase
+            # contents of the phases that existed before are unknown, so they are not routed
+            self.__cache.phase_folders[phase.id] = set()
 
         def assign(assignments: list[TestCasesAssignment]):
             planning.assign_test_cases_to_phase(
@@ -215,12 +336,16 @@ class ZephyrService(Service):
                 assignments,
                 include_hierarchy=True,
             )
+            self.__cache.invalidate_executions([phase])
 
         tc_by_folder = group_tc_by_folder(test_cases)
+        routed_folders = self.__cache.phase_folders.get(phase.id, None)
+        if routed_folders is not None:
+            routed_folders.update(tc_by_folder.keys())
         tc_assignments = list[TestCasesAssignment]()
         tcs_in_assignment: int = 0
         for folder, testcases in tc_by_folder.items():
-            tc_tree_node = self.__tc_tree_cache[folder]
+            tc_tree_node = self.__tc_node(folder)
             tc_ids: dict[int, TestCase] = self.__collect_testcase_ids(folder, testcases)
 
             if tcs_in_assignment >= self.__batch_size:
@@ -245,11 +370,13 @@ class ZephyrService(Service):
 
     def assign_test_cases_in_phase(self, cycle: Cycle, phase_name: str):
         _logger.info("assigning test cases from % phase in cycle %s to execution", phase_name, cycle.name)
-        phases = self.__phase_cache[cycle]
-        phase = phases[phase_name]
+        phase = self.__find_phase(cycle, phase_name)
+        if phase is None:
+            raise KeyError(f'cannot find phase {phase_name} in cycle {cycle.name}')
         assignment_tree = planning.get_assignment_tree(self.__session, phase)
         planning.assign_all_unassigned_to_user(self.__session, phase=phase,
                                                assignment_node=assignment_tree, user_id=self.__tester_id)
+        self.__cache.invalidate_executions([phase])
 
     def execution_statuses(self) -> list[ExecutionStatus]:
         return [s for s in self.__execution_statuses.values()]
@@ -267,29 +394,22 @@ class ZephyrService(Service):
             )
             raise Exception(f'executions for some test cases were not found: {missing_test_cases}')
 
-        self.__execute_by_ids(status, execution_id_by_testcase)
+        self.__execute_by_ids([(status, execution_id_by_testcase)])
 
     def execute_all_test_cases(self, cycle: Cycle, status: ExecutionStatus, tcs_by_folder: dict[Folder, list[TestCase]]):
         _logger.info("executing test cases in %s folder(s) from cycle %s with status %s",
                      len(tcs_by_folder), cycle.name, status.name)
-        tcs_by_id = dict[int, TestCase]()
-        _logger.debug("collecting test cases ids")
-        for folder, tc in tcs_by_folder.items():
-            tcs_by_id.update(self.__collect_testcase_ids(folder, tc))
-
-        _logger.debug("collecting execution ids")
-        execution_id_by_testcase = self.__find_execution_ids(cycle, tcs_by_id)
-
-        if len(execution_id_by_testcase) != len(tcs_by_id):
-            missing_test_cases = list(
-                filter(
-                    lambda t_case: t_case not in execution_id_by_testcase,
-                    tcs_by_id.values(),
-                )
-            )
-            raise Exception(f'executions for some test cases were not found: {missing_test_cases}')
-
-        self.__execute_by_ids(status, execution_id_by_testcase)
+        execution_id_by_testcase = self.__resolve_execution_ids(cycle, tcs_by_folder)
+        self.__execute_by_ids([(status, execution_id_by_testcase)])
+
+    def execute_results(self, cycle: Cycle, results: dict[TestCase, ExecutionStatus]):
+        """
+        Resolves execution ids of all test cases at once and executes them grouped by status
+        """
+        _logger.info("executing %s test case(s) from cycle %s", len(results), cycle.name)
+        execution_id_by_testcase = self.__resolve_execution_ids(cycle, group_tc_by_folder(list(results.keys())))
+        self.__execute_by_ids([(status, {tc: execution_id_by_testcase[tc] for tc in tcs})
+                               for status, tcs in group_by_status(results)])
 
     def get_executions_for_test_cases(self, cycle: Cycle, folder: Folder,
                                       tcs: list[TestCase]) -> dict[TestCase, ExecutionStatus]:
@@ -299,6 +419,38 @@ class ZephyrService(Service):
     def get_executions_for_cycle(self, cycle: Cycle) -> dict[TestCase, ExecutionStatus]:
         return self.__get_executions(cycle, self.__collect_all_testcase_ids())
 
+    def preload_testcases(self, root: Folder = None) -> int:
+        """
+        Loads test cases of all folders in the release (or in the specified folder and its sub folders)
+        using release-wide requests and puts them into the cache.
+        The release-wide search cannot be limited to a sub-tree, so preloading a folder downloads
+        all test cases of the release just like preloading the whole release; only the test cases
+        of the folder are kept in the cache.
+        Returns the number of loaded test cases
+        """
+        return len(self.__load_all_testcases(root))
+
+    @property
+    def skipped_executions(self) -> int:
+        """
+        Number of executions that were not sent because their last status already equals the requested one
+        """
+        return self.__skipped_executions
+
+    @property
+    def metrics(self) -> RequestMetrics:
+        """
+        Metrics of HTTP requests sent by this service grouped by endpoint and by logical operation
+        """
+        return self.__session.metrics
+
+    def search_stats(self) -> dict[SearchEndpoint, PageStats]:
+        """
+        Returns statistics of paginated requests for each endpoint.
+        Endpoints that share the same page size share the statistics
+        """
+        return {endpoint: options.page_size.stats() for endpoint, options in self.__search_options.items()}
+
     def attache_files_to_requirements(self, attachments: dict[Requirement, list[Path]]):
         _logger.info("attaching files to %s requirements", len(attachments))
         attachment_requests = list[AttachmentRequest]()
@@ -306,7 +458,7 @@ class ZephyrService(Service):
             _logger.debug("uploading files %s for %s", files, req)
             upload_results = file_attachment.upload_files(self.__session,
                                                           file_attachment.ItemType.REQUIREMENT, files)
-            zephyr_reqs = self.__req_cache[req.folder]
+            zephyr_reqs = self.__get_zephyr_requirements(req.folder)
             zephyr_req = self.__find_req(req, zephyr_reqs)
             for file in files:
                 upload_result = upload_results[file]
@@ -330,7 +482,7 @@ class ZephyrService(Service):
             _logger.debug("uploading files %s for %s", files, tc)
             upload_results = file_attachment.upload_files(self.__session,
                                                           file_attachment.ItemType.TEST_CASE, files)
-            zephyr_tcs = self.__tc_cache[tc.folder]
+            zephyr_tcs = self.__get_zephyr_testcases(tc.folder)
             zephyr_tc = self.__find_tc(tc, zephyr_tcs)
             for file in files:
                 upload_result = upload_results[file]
@@ -340,7 +492,7 @@ class ZephyrService(Service):
                         content_type=upload_result.content_type,
                         item_type=file_attachment.ItemType.TEST_CASE.http_type,
                         temp_path=upload_result.temp_file_path,
-                        item_id=zephyr_tc.testcase.testcase_id,
+                        item_id=zephyr_tc.testcase_id,
                     )
                 )
             _logger.debug("attaching files to testcases: %s", attachment_requests)
@@ -393,7 +545,7 @@ class ZephyrService(Service):
             attach_files(attachment_requests)
 
     def get_requirement_attachments(self, req: Requirement) -> list[AttachedFile]:
-        zephyr_reqs = self.__req_cache[req.folder]
+        zephyr_reqs = self.__get_zephyr_requirements(req.folder)
         zephyr_req = self.__find_req(req, zephyr_reqs)
         files = file_attachment.get_attached_files(
             self.__session,
@@ -407,12 +559,12 @@ class ZephyrService(Service):
         file_attachment.delete_attachment(self.__session, int(old_file.id))
 
     def get_testcase_attachments(self, tc: TestCase) -> list[AttachedFile]:
-        zephyrs_tcs = self.__tc_cache[tc.folder]
+        zephyrs_tcs = self.__get_zephyr_testcases(tc.folder)
         zephyr_tc = self.__find_tc(tc, zephyrs_tcs)
         files = file_attachment.get_attached_files(
             self.__session,
             file_attachment.ItemType.TEST_CASE,
-            zephyr_tc.testcase.testcase_id,
+            zephyr_tc.testcase_id,
             is_link=False,
         )
         return self.__to_attached_files(files)
@@ -434,48 +586,108 @@ class ZephyrService(Service):
     def remove_execution_attachment(self, cycle: Cycle, tc: TestCase, old_file: AttachedFile):
         file_attachment.delete_attachment(self.__session, int(old_file.id))
 
-    def __execute_by_ids(self, status: ExecutionStatus, execution_id_by_testcase: dict[TestCase, int]):
-        _logger.debug("executing test cases")
+    def __resolve_execution_ids(self, cycle: Cycle, tcs_by_folder: dict[Folder, list[TestCase]]) -> dict[TestCase, int]:
+        tcs_by_id = dict[int, TestCase]()
+        _logger.debug("collecting test cases ids")
+        for folder, tc in tcs_by_folder.items():
+            tcs_by_id.update(self.__collect_testcase_ids(folder, tc))
 
-        def execute(ids: list[int]):
-            planning.execute_test_cases(self.__session, status.id, self.__tester_id, ids)
+        _logger.debug("collecting execution ids")
+        execution_id_by_testcase = self.__find_execution_ids(cycle, tcs_by_id)
+
+        if len(execution_id_by_testcase) != len(tcs_by_id):
+            missing_test_cases = list(
+                filter(
+                    lambda t_case: t_case not in execution_id_by_testcase,
+                    tcs_by_id.values(),
+                )
+            )
+            raise Exception(f'executions for some test cases were not found: {missing_test_cases}')
+        return execution_id_by_testcase
 
-        ids_to_execute = list[int]()
-        for exec_id in execution_id_by_testcase.values():
-            if len(ids_to_execute) >= self.__batch_size:
-                execute(ids_to_execute)
-                ids_to_execute.clear()
-            ids_to_execute.append(exec_id)
+    def __execute_by_ids(self, execution_ids_by_status: list[tuple[ExecutionStatus, dict[TestCase, int]]]):
+        _logger.debug("executing test cases")
+        batches = list[tuple[ExecutionStatus, dict[TestCase, int]]]()
+        skipped = 0
+        for status, execution_id_by_testcase in execution_ids_by_status:
+            items = list(execution_id_by_testcase.items())
+            if self.__skip_unchanged_executions:
+                items = [(tc, exec_id) for tc, exec_id in items
+                         if self.__cache.execution_status(exec_id) != status.id]
+                skipped += len(execution_id_by_testcase) - len(items)
+            for start in range(0, len(items), self.__batch_size):
+                batches.append((status, dict(items[start:start + self.__batch_size])))
+
+        if self.__skip_unchanged_executions:
+            _logger.info("skipped %s execution(s) with unchanged status", skipped)
+            with self.__skipped_executions_lock:
+                self.__skipped_executions += skipped
+
+        def execute(status: ExecutionStatus, batch: dict[TestCase, int]):
+            ids = list(batch.values())
+            planning.execute_test_cases(self.__session, status.id, self.__tester_id, ids)
+            self.__cache.set_execution_statuses(ids, status.id)
 
-        if ids_to_execute:
-            execute(ids_to_execute)
+        if self.__execution_workers == 1 or len(batches) < 2:
+            for status, batch in batches:
+                execute(status, batch)
+            return
 
-    def __get_zephyr_testcases(self, folder):
-        if folder in self.__tc_cache:
-            zephyr_testcases = self.__tc_cache[folder]
-        else:
-            tc_folder = self.__tc_tree_cache[folder]
-            zephyr_testcases = testcase.get_test_cases_for_node(self.__session, tc_folder)
-            self.__tc_cache[folder].extend(zephyr_testcases)
+        failed_test_cases = list[TestCase]()
+        with ThreadPoolExecutor(max_workers=self.__execution_workers,
+                                thread_name_prefix='zephyr-executor') as executor:
+            futures = [(batch, executor.submit(execute, status, batch)) for status, batch in batches]
+            # all batches are sent even if some of them fail
+            for batch, future in futures:
+                error = future.exception()
+                if error is not None:
+                    _logger.error("cannot execute %s test case(s)", len(batch), exc_info=error)
+                    failed_test_cases.extend(batch.keys())
+        if failed_test_cases:
+            raise Exception(f'cannot execute {len(failed_test_cases)} test case(s): {failed_test_cases}')
+
+    def __get_zephyr_testcases(self, folder: Folder) -> FolderItems[CachedTestCase]:
+        zephyr_testcases = self.__cache.testcases.get(folder)
+        if zephyr_testcases is None:
+            # threads that miss the same folder wait for one load
+            zephyr_testcases = self.__folder_loads.do(('testcases', folder),
+                                                      lambda: self.__load_zephyr_testcases(folder))
         return zephyr_testcases
 
+    def __load_zephyr_testcases(self, folder: Folder) -> FolderItems[CachedTestCase]:
+        tc_folder = self.__tc_node(folder)
+        return self.__cache.testcases.put(
+            folder,
+            map(CachedTestCase.of, testcase.iter_test_cases_for_node(
+                self.__session, tc_folder, self.__search_options[SearchEndpoint.TESTCASES])),
+        )
+
+    def __get_zephyr_requirements(self, folder: Folder) -> FolderItems[CachedRequirement]:
+        zephyr_reqs = self.__cache.requirements.get(folder)
+        if zephyr_reqs is None:
+            zephyr_reqs = self.__folder_loads.do(('requirements', folder),
+                                                 lambda: self.__load_zephyr_requirements(folder))
+        return zephyr_reqs
+
+    def __load_zephyr_requirements(self, folder: Folder) -> FolderItems[CachedRequirement]:
+        req_folder = self.__req_node(folder)
+        return self.__cache.requirements.put(
+            folder,
+            map(CachedRequirement.of, requirement.find_requirements(
+                self.__session, self.__release_id, req_folder, self.__search_options[SearchEndpoint.REQUIREMENTS])),
+        )
+
     def __get_executions(self, cycle: Cycle, tcs_by_id: dict[int, TestCase]) -> dict[TestCase, ExecutionStatus]:
-        cycle_phases = self.__phase_cache[cycle]
         tcs_last_status = dict[TestCase, ExecutionStatus]()
-        for phase_name, phase in cycle_phases.items():
-            phase_executions = planning.get_executions_for_cycle_phase(self.__session, self.__release_id, phase)
-            for execution in phase_executions:
-                testcase_id = execution.tcr_tree_testcase.testcase.id
-                if testcase_id not in tcs_by_id:
-                    continue
-                last_execution_result = execution.last_test_result
-                if last_execution_result is None:
+        for phase in self.__phases_for_testcases(cycle, tcs_by_id.values()):
+            phase_executions = self.__get_phase_executions(phase)
+            for testcase_id, tc in tcs_by_id.items():
+                last_status = phase_executions.last_status(testcase_id)
+                if last_status is None:
                     continue
-                status = self.__execution_statuses.get(last_execution_result.execution_status, None)
+                status = self.__execution_statuses.get(last_status, None)
                 if status is None:
                     continue
-
-                tc = tcs_by_id[testcase_id]
                 tcs_last_status[tc] = status
 
         return tcs_last_status
@@ -486,82 +698,450 @@ class ZephyrService(Service):
         return self.__find_execution_ids(cycle, tc_by_id)
 
     def __find_execution_ids(self, cycle: Cycle, tc_by_id: dict[int, TestCase]) -> dict[TestCase, int]:
-        cycle_phases = self.__phase_cache[cycle]
         execution_id_by_testcase: dict[TestCase, int] = {}
-        for phase_name, phase in cycle_phases.items():
-            phase_executions = planning.get_executions_for_cycle_phase(self.__session, self.__release_id, phase)
-            for execution in phase_executions:
-                testcase_id = execution.tcr_tree_testcase.testcase.id
-                if testcase_id not in tc_by_id:
-                    continue
-                tc = tc_by_id[testcase_id]
-                execution_id_by_testcase[tc] = execution.id
+        for phase in self.__phases_for_testcases(cycle, tc_by_id.values()):
+            phase_executions = self.__get_phase_executions(phase)
+            for testcase_id, tc in tc_by_id.items():
+                execution = phase_executions.find(testcase_id)
+                if execution is not None:
+                    execution_id_by_testcase[tc] = execution.id
         return execution_id_by_testcase
 
+    def __phases_for_testcases(self, cycle: Cycle, tcs: Iterable[TestCase]) -> list[Phase]:
+        """
+        Returns the phases of the cycle that can contain the test cases.
+        Free form phases that were not created by this service are always returned
+        """
+        folders = {tc.folder for tc in tcs}
+        cycle_phases = self.__cycle_phases(cycle)
+        self.__route_tree_phases(cycle_phases.values())
+        phases = [phase for phase in cycle_phases.values() if self.__cache.may_contain(phase, folders)]
+        _logger.debug("looking up executions in %s of %s phase(s)", len(phases), len(cycle_phases))
+        return phases
+
+    def __route_tree_phases(self, phases: Iterable[Phase]):
+        """
+        Links the phases created from the test case tree by other tools to their root folders.
+        Phases which root folder is not loaded are not linked and are always searched
+        """
+        not_routed = [phase for phase in phases if phase.id not in self.__cache.phase_folders
+                      and not phase.free_form and phase.tcr_catalog_tree_id is not None]
+        if not not_routed:
+            return
+        folder_by_node_id = {node.id: folder for folder, node in self.__cache.testcase_tree.items()}
+        for phase in not_routed:
+            folder = folder_by_node_id.get(phase.tcr_catalog_tree_id, None)
+            if folder is not None:
+                self.__cache.phase_folders[phase.id] = {folder}
+
+    def __get_phase_executions(self, phase: Phase) -> PhaseExecutions:
+        """
+        Returns the cached executions of the phase. The phase is loaded once and the cache is updated
+        when test cases are executed by this service or invalidated when the phase is changed
+        """
+        phase_executions = self.__cache.executions.get(phase.id, None)
+        if phase_executions is None:
+            phase_executions = self.__execution_loads.do(phase.id, lambda: self.__load_phase_executions(phase))
+        return phase_executions
+
+    def __load_phase_executions(self, phase: Phase) -> PhaseExecutions:
+        phase_executions = PhaseExecutions(map(CachedExecution.of, planning.iter_executions_for_cycle_phase(
+            self.__session, self.__release_id, phase, self.__search_options[SearchEndpoint.EXECUTIONS])))
+        self.__cache.put_executions(phase.id, phase_executions)
+        return phase_executions
+
     def __collect_testcase_ids(self, folder: Folder, testcases: list[TestCase]) -> dict[int, TestCase]:
         known_tcs = self.__get_zephyr_testcases(folder)
         tc_ids = {}
         for tc in testcases:
-            found = False
-            for zephyr_tc in known_tcs:
-                if zephyr_tc.testcase.name == tc.name and zephyr_tc.testcase.description == tc.description:
-                    found = True
-                    tc_ids[zephyr_tc.testcase.id] = tc
-                    break
-
-            if not found:
+            zephyr_tc = known_tcs.find((tc.name, tc.description))
+            if zephyr_tc is None:
                 raise KeyError(f'cannot find test case {tc}')
+            tc_ids[zephyr_tc.id] = tc
         return tc_ids
 
     def __collect_all_testcase_ids(self) -> dict[int, TestCase]:
+        if self.__bulk_testcase_loading:
+            return self.__load_all_testcases()
+        self.__ensure_testcase_tree_complete()
         result = dict[int, TestCase]()
-        for folder in self.__tc_tree_cache.keys():
+        for folder in list(self.__cache.testcase_tree.keys()):
             for tc in self.__get_zephyr_testcases(folder):
-                result[tc.testcase.id] = ZephyrService.__zephyr_tc_to_model(tc, folder)
+                result[tc.id] = ZephyrService.__zephyr_tc_to_model(tc, folder)
+        return result
+
+    def __load_all_testcases(self, root: Folder = None) -> dict[int, TestCase]:
+        self.__ensure_testcase_tree_complete()
+        folder_by_node_id = dict[int, Folder]()
+        for folder, node in self.__cache.testcase_tree.items():
+            if root is None or ZephyrService.__is_in_folder(folder, root):
+                folder_by_node_id[node.id] = folder
+
+        _logger.info("loading test cases for %s folder(s)", len(folder_by_node_id))
+        tcs_by_folder = {folder: list[CachedTestCase]() for folder in folder_by_node_id.values()}
+        result = dict[int, TestCase]()
+        for zephyr_tc in testcase.iter_test_cases_for_release(
+                self.__session, self.__release_id, options=self.__search_options[SearchEndpoint.RELEASE_TESTCASES]):
+            folder = folder_by_node_id.get(zephyr_tc.tcr_catalog_tree_id, None)
+            if folder is None:
+                continue
+            cached_tc = CachedTestCase.of(zephyr_tc)
+            tcs_by_folder[folder].append(cached_tc)
+            result[cached_tc.id] = ZephyrService.__zephyr_tc_to_model(cached_tc, folder)
+
+        for folder, zephyr_tcs in tcs_by_folder.items():
+            self.__cache.testcases.put(folder, zephyr_tcs)
+        _logger.info("loaded %s test case(s)", len(result))
         return result
 
-    def __load_existing_data(self):
+    def __ensure_testcase_tree_complete(self):
+        if not self.__tc_tree_loaded:
+            previous = dict(self.__cache.testcase_tree)
+            self.__cache.testcase_tree.clear()
+            self.__load_testcase_tree()
+            for folder, node in previous.items():
+                current = self.__cache.testcase_tree.get(folder, None)
+                if current is None or current.id != node.id:
+                    self.__cache.testcases.invalidate(folder)
+            self.__unverified_tc_folders.clear()
+            self.__tc_tree_loaded = True
+            self.__tc_tree_complete = self.__tree_loading == TreeLoadingStrategy.PER_NODE
+
+    def __load_existing_data(self, snapshot: Optional[ReleaseSnapshot]):
+        loaders = list[Callable[[Optional[ThreadPoolExecutor]], None]]()
+        if not self.__lazy or snapshot is not None:
+            known_req_folders = None if snapshot is None else snapshot.requirement_folders
+            known_tc_folders = None if snapshot is None else snapshot.testcase_folders
+            loaders.append(lambda executor: self.__load_requirement_tree(executor, known_req_folders, self.__lazy))
+            loaders.append(lambda executor: self.__load_testcase_tree(executor, known_tc_folders, self.__lazy))
+        if snapshot is None:
+            loaders.append(lambda _: self.__load_cycles())
+        else:
+            self.__add_cycles(snapshot.cycles, verified=False)
+
+        if self.__loader_workers == 1:
+            for loader in loaders:
+                loader(None)
+        else:
+            with ThreadPoolExecutor(max_workers=self.__loader_workers,
+                                    thread_name_prefix='zephyr-loader') as executor, \
+                    ThreadPoolExecutor(max_workers=3, thread_name_prefix='zephyr-loader-main') as main_executor:
+                futures = [main_executor.submit(loader, executor) for loader in loaders]
+                for future in futures:
+                    future.result()
+        _logger.info("loading existing data complete")
+
+    def __load_requirement_tree(self, executor: ThreadPoolExecutor = None,
+                                known_folders: dict[Folder, RequirementTreeNode] = None, roots_only: bool = False):
         _logger.info("loading existing requirement folders")
         root_req_nodes = requirement_tree.get_requirement_tree_root_nodes(self.__session,
                                                                           self.__project_id, self.__release_id)
+        known_by_root = ZephyrService.__group_by_root(known_folders)
+        roots = list[tuple[Folder, int]]()
         for root_node in root_req_nodes:
             folder = RootFolder(root_node.name)
-            node_id = root_node.id
-            self.__load_req_node(folder, node_id)
+            known_root = known_folders.get(folder, None) if known_folders is not None else None
+            if known_root is not None and known_root.id == root_node.id:
+                self.__cache.requirement_tree.update(known_by_root[folder])
+                self.__cache.requirement_tree[folder] = root_node
+                self.__unverified_req_folders.update(known_by_root[folder].keys() - {folder})
+            elif roots_only:
+                self.__cache.requirement_tree[folder] = root_node
+            else:
+                roots.append((folder, root_node.id))
+        self.__req_tree_expanded.add(None)
+        if self.__tree_loading == TreeLoadingStrategy.FLAT:
+            walk_breadth_first(roots, self.__load_req_node_with_categories, executor)
+        else:
+            walk_breadth_first(roots, self.__load_req_node, executor)
+        _logger.info("loaded %s requirement folder(s)", len(self.__cache.requirement_tree))
 
+    def __load_testcase_tree(self, executor: ThreadPoolExecutor = None,
+                             known_folders: dict[Folder, TestCaseTreeNode] = None, roots_only: bool = False):
         _logger.info("loading existing test case folders")
         root_tc_tree_nodes = testcase_tree.get_test_case_tree_root_nodes(self.__session, self.__release_id)
+        known_by_root = ZephyrService.__group_by_root(known_folders)
+        roots = list[tuple[Folder, TestCaseTreeNode]]()
         for root_node in root_tc_tree_nodes:
             folder = RootFolder(root_node.name)
-            self.__tc_tree_cache[folder] = root_node
-            self.__load_tc_tree_node(folder, root_node)
-
+            known_root = known_folders.get(folder, None) if known_folders is not None else None
+            if known_root is not None and known_root.id == root_node.id:
+                self.__cache.testcase_tree.update(known_by_root[folder])
+                self.__cache.testcase_tree[folder] = root_node
+                self.__unverified_tc_folders.update(known_by_root[folder].keys() - {folder})
+                continue
+            self.__cache.testcase_tree[folder] = root_node
+            if not roots_only:
+                roots.append((folder, root_node))
+        self.__tc_tree_expanded.add(None)
+        loaded = bool(roots) and self.__tree_loading == TreeLoadingStrategy.FLAT and self.__load_tc_tree_flat(roots)
+        if not loaded:
+            walk_breadth_first(roots, self.__load_tc_tree_node, executor)
+        _logger.info("loaded %s test case folder(s)", len(self.__cache.testcase_tree))
+
+    def __load_cycles(self):
         _logger.info("loading existing cycles")
-        existing_cycles = planning.get_cycles_for_release(self.__session, self.__release_id)
-        for zephyr_cycle in existing_cycles:
-            cycle = Cycle(
-                name=zephyr_cycle.name,
-                start_date=ZephyrService.__parse_date(zephyr_cycle.cycle_start_date),
-                end_date=ZephyrService.__parse_date(zephyr_cycle.cycle_end_date),
-            )
-            self.__cycle_cache[cycle] = zephyr_cycle
+        existing_cycles = planning.get_cycles_for_release(
+            self.__session,
+            self.__release_id,
+            predicate=None if self.__cycle_filter is None else self.__cycle_predicate(self.__cycle_filter),
+        )
+        self.__add_cycles(existing_cycles)
+        _logger.info("loaded %s cycle(s)", len(existing_cycles))
+
+    def __add_cycles(self, zephyr_cycles: list[ZephyrCycle], verified: bool = True):
+        for zephyr_cycle in zephyr_cycles:
+            cycle = ZephyrService.__to_model_cycle(zephyr_cycle)
+            self.__cache.cycles[cycle] = zephyr_cycle
+            phases = self.__cache.phases[cycle]
+            phases.clear()
             for zephyr_phase in zephyr_cycle.cycle_phases:
-                self.__phase_cache[cycle][zephyr_phase.name] = zephyr_phase
-        _logger.info("loading existing data complete")
+                phases[zephyr_phase.name] = zephyr_phase
+            if verified:
+                self.__verified_cycles.add(cycle)
+
+    def __find_cycle(self, cycle: Cycle) -> Optional[ZephyrCycle]:
+        zephyr_cycle = self.__cache.cycles.get(cycle, None)
+        if zephyr_cycle is not None and cycle not in self.__verified_cycles:
+            zephyr_cycle = self.__verify_cycle(cycle, zephyr_cycle)
+        if zephyr_cycle is not None or self.__cycles_complete:
+            return zephyr_cycle
+        if self.__cycle_ids is None:
+            _logger.debug("loading ids of the cycles")
+            self.__cycle_ids = planning.get_cycle_ids_for_release(self.__session, self.__release_id,
+                                                                  key=ZephyrService.__raw_cycle_key)
+        cycle_id = self.__cycle_ids.get(cycle, None)
+        if cycle_id is None:
+            return None
+        _logger.debug("loading cycle %s", cycle)
+        zephyr_cycle = self.__get_cycle(cycle_id)
+        if zephyr_cycle is None or ZephyrService.__to_model_cycle(zephyr_cycle) != cycle:
+            del self.__cycle_ids[cycle]
+            return None
+        self.__add_cycles([zephyr_cycle])
+        return zephyr_cycle
+
+    def __cycle_phases(self, cycle: Cycle) -> dict[str, Phase]:
+        if self.__find_cycle(cycle) is None:
+            return {}
+        return self.__cache.phases[cycle]
+
+    def __verify_cycle(self, cycle: Cycle, zephyr_cycle: ZephyrCycle) -> Optional[ZephyrCycle]:
+        """
+        Reloads the cycle from the snapshot with its phases.
+        Returns None if the cycle was deleted or changed on the server
+        """
+        _logger.debug("checking cycle %s from snapshot", cycle)
+        server_cycle = self.__get_cycle(zephyr_cycle.id)
+        if server_cycle is None or ZephyrService.__to_model_cycle(server_cycle) != cycle:
+            _logger.debug("cycle %s from snapshot is not found on the server", cycle)
+            self.__forget_cycle(cycle)
+            return None
+        self.__add_cycles([server_cycle])
+        return server_cycle
+
+    def __get_cycle(self, cycle_id: int) -> Optional[ZephyrCycle]:
+        """
+        Returns None if the cycle was deleted
+        """
+        try:
+            return planning.get_cycle(self.__session, cycle_id)
+        except HTTPError as e:
+            if e.response is None or e.response.status_code != 404:
+                raise
+            return None
+
+    def __forget_cycle(self, cycle: Cycle):
+        phases = self.__cache.phases.pop(cycle, {}).values()
+        for phase in phases:
+            self.__cache.phase_folders.pop(phase.id, None)
+        self.__cache.invalidate_executions(phases)
+        self.__cache.cycles.pop(cycle, None)
+        self.__verified_cycles.discard(cycle)
+        if self.__cycle_ids is not None:
+            self.__cycle_ids.pop(cycle, None)
+
+    def __find_phase(self, cycle: Cycle, phase_name: str) -> Optional[Phase]:
+        return self.__cycle_phases(cycle).get(phase_name, None)
+
+    def __save_snapshot(self):
+        if self.__snapshot_path is None:
+            return
+        _logger.debug("saving snapshot to %s", self.__snapshot_path)
+        write_snapshot(
+            self.__snapshot_path,
+            self.__zephyr_url,
+            self.__project_id,
+            self.__release_id,
+            ReleaseSnapshot(
+                requirement_folders=dict(self.__cache.requirement_tree),
+                testcase_folders=dict(self.__cache.testcase_tree),
+                cycles=[dataclasses.replace(zephyr_cycle, cycle_phases=list(self.__cache.phases[cycle].values()))
+                        for cycle, zephyr_cycle in self.__cache.cycles.items()],
+                execution_statuses=self.execution_statuses(),
+                tester_id=self.__tester_id,
+                token_digest=self.__token_digest,
+                created_at=self.__snapshot_created_at,
+            )
+        )
 
-    def __load_tc_tree_node(self, folder: Folder, root_node: TestCaseTreeNode):
-        sub_nodes = testcase_tree.get_test_case_tree_sub_nodes(self.__session, self.__release_id, root_node)
+    def __load_tc_tree_node(self, folder: Folder, node: TestCaseTreeNode) -> TreeLevel[TestCaseTreeNode]:
+        sub_nodes = testcase_tree.get_test_case_tree_sub_nodes(self.__session, self.__release_id, node)
+        children = list[tuple[Folder, TestCaseTreeNode]]()
         for sub_node in sub_nodes:
             sub_folder = folder / sub_node.name
-            self.__tc_tree_cache[sub_folder] = sub_node
-            self.__load_tc_tree_node(sub_folder, sub_node)
+            self.__cache.testcase_tree[sub_folder] = sub_node
+            children.append((sub_folder, sub_node))
+        return children
+
+    def __load_tc_tree_flat(self, roots: TreeLevel[TestCaseTreeNode]) -> bool:
+        all_sub_nodes = testcase_tree.get_all_test_case_tree_sub_nodes(self.__session, self.__release_id)
+        sub_nodes_by_parent = defaultdict[int, list[TestCaseTreeNode]](list)
+        for sub_node in all_sub_nodes:
+            if sub_node.parent_id is None:
+                _logger.warning("test case folder %s has no parent id, loading folders one by one", sub_node.name)
+                return False
+            sub_nodes_by_parent[sub_node.parent_id].append(sub_node)
+
+        def expand(folder: Folder, node: TestCaseTreeNode) -> TreeLevel[TestCaseTreeNode]:
+            children = list[tuple[Folder, TestCaseTreeNode]]()
+            for child in sub_nodes_by_parent.get(node.id, []):
+                sub_folder = folder / child.name
+                self.__cache.testcase_tree[sub_folder] = child
+                children.append((sub_folder, child))
+            return children
+
+        walk_breadth_first(roots, expand)
+        linked = {node.id for node in self.__cache.testcase_tree.values()}
+        not_linked = sum(1 for sub_node in all_sub_nodes if sub_node.id not in linked)
+        if not_linked:
+            # their folders are looked up one by one when they are used
+            _logger.warning("%s test case folder(s) cannot be linked to the tree", not_linked)
+        return True
+
+    def __load_req_node_with_categories(self, folder: Folder, node_id: int) -> TreeLevel[int]:
+        node_details = requirement_tree.get_requirement_tree_node_details(self.__session, node_id)
 
-    def __load_req_node(self, folder: Folder, node_id: int):
+        def expand(sub_folder: Folder, node: RequirementTreeNode) -> TreeLevel[RequirementTreeNode]:
+            self.__cache.requirement_tree[sub_folder] = node
+            return [(sub_folder / category.name, category) for category in node.categories]
+
+        walk_breadth_first([(folder, node_details)], expand)
+        return []
+
+    def __load_req_node(self, folder: Folder, node_id: int) -> TreeLevel[int]:
         node_details = requirement_tree.get_requirement_tree_node_details(self.__session, node_id)
-        self.__req_tree_cache[folder] = node_details
-        for sub_node in node_details.categories:
-            sub_folder = folder / sub_node.name
-            self.__load_req_node(sub_folder, sub_node.id)
+        self.__cache.requirement_tree[folder] = node_details
+        return [(folder / sub_node.name, sub_node.id) for sub_node in node_details.categories]
+
+    def __req_node(self, folder: Folder) -> RequirementTreeNode:
+        node = self.__find_req_node(folder)
+        if node is None:
+            raise KeyError(f'cannot find requirement folder {folder}')
+        return node
+
+    def __find_req_node(self, folder: Folder) -> Optional[RequirementTreeNode]:
+        if folder in self.__unverified_req_folders:
+            self.__verify_req_folder(folder)
+        node = self.__cache.requirement_tree.get(folder, None)
+        if node is not None or self.__req_tree_complete:
+            return node
+        if folder.parent is None:
+            if None not in self.__req_tree_expanded:
+                _logger.debug("loading requirement root folders")
+                for root_node in requirement_tree.get_requirement_tree_root_nodes(self.__session, self.__project_id,
+                                                                                  self.__release_id):
+                    self.__cache.requirement_tree.setdefault(RootFolder(root_node.name), root_node)
+                self.__req_tree_expanded.add(None)
+        elif folder.parent not in self.__req_tree_expanded:
+            parent = self.__find_req_node(folder.parent)
+            if parent is None:
+                return None
+            _logger.debug("loading requirement sub folders of %s", folder.parent)
+            node_details = requirement_tree.get_requirement_tree_node_details(self.__session, parent.id)
+            self.__cache.requirement_tree[folder.parent] = node_details
+            for sub_node in node_details.categories:
+                self.__cache.requirement_tree.setdefault(folder.parent / sub_node.name, sub_node)
+            self.__req_tree_expanded.add(folder.parent)
+        return self.__cache.requirement_tree.get(folder, None)
+
+    def __tc_node(self, folder: Folder) -> TestCaseTreeNode:
+        node = self.__find_tc_node(folder)
+        if node is None:
+            raise KeyError(f'cannot find test case folder {folder}')
+        return node
+
+    def __find_tc_node(self, folder: Folder) -> Optional[TestCaseTreeNode]:
+        if folder in self.__unverified_tc_folders:
+            self.__verify_tc_folder(folder)
+        node = self.__cache.testcase_tree.get(folder, None)
+        if node is not None or self.__tc_tree_complete:
+            return node
+        if folder.parent is None:
+            if None not in self.__tc_tree_expanded:
+                _logger.debug("loading test case root folders")
+                for root_node in testcase_tree.get_test_case_tree_root_nodes(self.__session, self.__release_id):
+                    self.__cache.testcase_tree.setdefault(RootFolder(root_node.name), root_node)
+                self.__tc_tree_expanded.add(None)
+        elif folder.parent not in self.__tc_tree_expanded:
+            parent = self.__find_tc_node(folder.parent)
+            if parent is None:
+                return None
+            _logger.debug("loading test case sub folders of %s", folder.parent)
+            self.__load_tc_tree_node(folder.parent, parent)
+            self.__tc_tree_expanded.add(folder.parent)
+        return self.__cache.testcase_tree.get(folder, None)
+
+    def __verify_req_folder(self, folder: Folder):
+        """
+        Replaces the sub folders of the parent from the snapshot with the ones on the server
+        """
+        parent = self.__find_req_node(folder.parent)
+        if parent is None:
+            self.__unverified_req_folders.discard(folder)
+            return
+        _logger.debug("checking requirement sub folders of %s from snapshot", folder.parent)
+        node_details = requirement_tree.get_requirement_tree_node_details(self.__session, parent.id)
+        self.__cache.requirement_tree[folder.parent] = node_details
+        ZephyrService.__replace_sub_folders(
+            self.__cache.requirement_tree, folder.parent,
+            {folder.parent / sub_node.name: sub_node for sub_node in node_details.categories},
+            self.__unverified_req_folders, self.__cache.requirements.invalidate)
+        self.__req_tree_expanded.add(folder.parent)
+
+    def __verify_tc_folder(self, folder: Folder):
+        """
+        Replaces the sub folders of the parent from the snapshot with the ones on the server
+        """
+        parent = self.__find_tc_node(folder.parent)
+        if parent is None:
+            self.__unverified_tc_folders.discard(folder)
+            return
+        _logger.debug("checking test case sub folders of %s from snapshot", folder.parent)
+        sub_nodes = testcase_tree.get_test_case_tree_sub_nodes(self.__session, self.__release_id, parent)
+        ZephyrService.__replace_sub_folders(
+            self.__cache.testcase_tree, folder.parent,
+            {folder.parent / sub_node.name: sub_node for sub_node in sub_nodes},
+            self.__unverified_tc_folders, self.__cache.testcases.invalidate)
+        self.__tc_tree_expanded.add(folder.parent)
+
+    @staticmethod
+    def __replace_sub_folders(tree: dict[Folder, T], parent: Folder, sub_folders: dict[Folder, T],
+                              unverified: set[Folder], invalidate_items: Callable[[Folder], None]):
+        """
+        Puts the sub folders received from the server into the tree.
+        Cached sub folders that were removed or recreated on the server are removed with all their sub folders
+        """
+        stale = {folder for folder, node in tree.items() if folder.parent == parent
+                 and (folder not in sub_folders or sub_folders[folder].id != node.id)}
+        if stale:
+            _logger.info("%s folder(s) in %s changed after the snapshot was saved", len(stale), parent)
+            for folder in [folder for folder in tree if ZephyrService.__is_in_any_folder(folder, stale)]:
+                del tree[folder]
+                unverified.discard(folder)
+                invalidate_items(folder)
+        tree.update(sub_folders)
+        unverified.difference_update(sub_folders.keys())
 
     def __load_execution_statuses(self) -> list[ExecutionStatus]:
         zephyr_prefs = preferences.get_system_preferences(self.__session)
@@ -580,22 +1160,94 @@ class ZephyrService(Service):
         raise Exception(f'could not found {_EXECUTION_STATUSES_PREFERENCE_NAME} preference in the list')
 
     @staticmethod
-    def __zephyr_tc_to_model(zephyr_tc_in_tree: TestCaseInTree, folder: Folder) -> TestCase:
-        return TestCase(name=zephyr_tc_in_tree.testcase.name,
-                        description=zephyr_tc_in_tree.testcase.description, folder=folder)
+    def __required_connections(loader_workers: int, execution_workers: int,
+                               search_options: dict[SearchEndpoint, SearchOptions]) -> int:
+        # loader workers and the main loading pool can run paginated requests at the same time
+        parallel_pages = max(options.parallel_pages for options in search_options.values())
+        return max(ConnectionOptions().pool_size, (loader_workers + 3) * parallel_pages, execution_workers)
 
     @staticmethod
-    def __zephyr_req_to_model(zephyr_req: ZephyrRequirement, folder: Folder) -> Requirement:
-        return Requirement(name=zephyr_req.name, description=zephyr_req.details, folder=folder)
+    def __resolve_search_options(
+            search_options: Union[SearchOptions, dict[SearchEndpoint, SearchOptions], None],
+    ) -> dict[SearchEndpoint, SearchOptions]:
+        result = dict[SearchEndpoint, SearchOptions]()
+        for endpoint, default_page_size in ZephyrService.__default_page_sizes.items():
+            options = search_options.get(endpoint, None) if isinstance(search_options, dict) else search_options
+            if options is None:
+                options = SearchOptions()
+            if options.page_size is None:
+                options = dataclasses.replace(options, page_size=PageSize(default_page_size))
+            result[endpoint] = options
+        return result
 
     @staticmethod
-    def __to_model_tcs(folder: Folder, zephyr_testcases: list[TestCaseInTree]) -> list[TestCase]:
+    def __cycle_predicate(cycle_filter: CycleFilter) -> Callable[[dict], bool]:
+        return lambda raw_cycle: cycle_filter.matches(
+            raw_cycle['name'],
+            ZephyrService.__parse_date(raw_cycle['cycleStartDate']),
+            ZephyrService.__parse_date(raw_cycle['cycleEndDate']),
+        )
+
+    @staticmethod
+    def __is_in_folder(folder: Optional[Folder], root: Folder) -> bool:
+        while folder is not None:
+            if folder == root:
+                return True
+            folder = folder.parent
+        return False
+
+    @staticmethod
+    def __is_in_any_folder(folder: Optional[Folder], roots: set[Folder]) -> bool:
+        while folder is not None:
+            if folder in roots:
+                return True
+            folder = folder.parent
+        return False
+
+    @staticmethod
+    def __group_by_root(folders: Optional[dict[Folder, T]]) -> dict[Folder, dict[Folder, T]]:
+        by_root = defaultdict[Folder, dict[Folder, T]](dict)
+        if folders is None:
+            return by_root
+        for folder, value in folders.items():
+            root = folder
+            while root.parent is not None:
+                root = root.parent
+            by_root[root][folder] = value
+        return by_root
+
+    @staticmethod
+    def __zephyr_tc_to_model(zephyr_tc: CachedTestCase, folder: Folder) -> TestCase:
+        return TestCase(name=zephyr_tc.name, description=zephyr_tc.description, folder=folder)
+
+    @staticmethod
+    def __zephyr_req_to_model(zephyr_req: CachedRequirement, folder: Folder) -> Requirement:
+        return Requirement(name=zephyr_req.name, description=zephyr_req.description, folder=folder)
+
+    @staticmethod
+    def __to_model_tcs(folder: Folder, zephyr_testcases: Iterable[CachedTestCase]) -> list[TestCase]:
         return list(map(lambda tc: ZephyrService.__zephyr_tc_to_model(tc, folder), zephyr_testcases))
 
     @staticmethod
-    def __to_model_req(folder: Folder, zephyr_reqs: list[ZephyrRequirement]) -> list[Requirement]:
+    def __to_model_req(folder: Folder, zephyr_reqs: Iterable[CachedRequirement]) -> list[Requirement]:
         return list(map(lambda req: ZephyrService.__zephyr_req_to_model(req, folder), zephyr_reqs))
 
+    @staticmethod
+    def __to_model_cycle(zephyr_cycle: ZephyrCycle) -> Cycle:
+        return Cycle(
+            name=zephyr_cycle.name,
+            start_date=ZephyrService.__parse_date(zephyr_cycle.cycle_start_date),
+            end_date=ZephyrService.__parse_date(zephyr_cycle.cycle_end_date),
+        )
+
+    @staticmethod
+    def __raw_cycle_key(raw_cycle: dict) -> Cycle:
+        return Cycle(
+            name=raw_cycle['name'],
+            start_date=ZephyrService.__parse_date(raw_cycle['cycleStartDate']),
+            end_date=ZephyrService.__parse_date(raw_cycle['cycleEndDate']),
+        )
+
     @staticmethod
     def __format_date(value: date) -> str:
         return value.strftime('%m/%d/%Y')
@@ -605,18 +1257,18 @@ class ZephyrService(Service):
         return datetime.strptime(date_str, '%m/%d/%Y').date()
 
     @staticmethod
-    def __find_req(req: Requirement, requirements: list[ZephyrRequirement]) -> ZephyrRequirement:
-        for zephyr_req in requirements:
-            if zephyr_req.name == req.name and zephyr_req.details == req.description:
-                return zephyr_req
-        raise KeyError(f'cannot find requirement {req}')
+    def __find_req(req: Requirement, requirements: FolderItems[CachedRequirement]) -> CachedRequirement:
+        zephyr_req = requirements.find((req.name, req.description))
+        if zephyr_req is None:
+            raise KeyError(f'cannot find requirement {req}')
+        return zephyr_req
 
     @staticmethod
-    def __find_tc(tc: TestCase, testcases: list[TestCaseInTree]) -> TestCaseInTree:
-        for zephyr_tc in testcases:
-            if zephyr_tc.testcase.name == tc.name and zephyr_tc.testcase.description == tc.description:
-                return zephyr_tc
-        raise KeyError(f'cannot find testcase {tc}')
+    def __find_tc(tc: TestCase, testcases: FolderItems[CachedTestCase]) -> CachedTestCase:
+        zephyr_tc = testcases.find((tc.name, tc.description))
+        if zephyr_tc is None:
+            raise KeyError(f'cannot find testcase {tc}')
+        return zephyr_tc
 
     @staticmethod
     def __to_attached_files(attachments: list[Attachment]) -> list[AttachedFile]:
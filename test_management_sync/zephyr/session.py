@@ -1,17 +1,110 @@
-from requests import Session
-from urllib.parse import urljoin
+import copy
+import gzip
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+from requests import Session, Response
+from requests.adapters import HTTPAdapter
+from urllib.parse import urljoin, urlsplit
+
+from test_management_sync.zephyr.http_cache import CacheOptions, ResponseCache
+from test_management_sync.zephyr.metrics import RequestMetrics
+from test_management_sync.zephyr.single_flight import SingleFlight
+from test_management_sync.zephyr.throttling import ThrottlingOptions, Throttler
+
+
+@dataclass(frozen=True)
+class ConnectionOptions:
+    """
+    Options of HTTP connections to Zephyr
+    """
+    # max number of connections kept open to the server.
+    # Should be not less than the number of concurrent requests, otherwise connections are reopened
+    pool_size: int = field(default=10)
+    # if set concurrent requests wait for a free connection instead of opening a new one over the limit
+    pool_block: bool = field(default=False)
+    # if not set the connection is closed after each request
+    keep_alive: bool = field(default=True)
+    # if not set the server is asked to send uncompressed responses
+    compress_responses: bool = field(default=True)
+    # JSON bodies of bulk requests (execution/bulk, testcase/bulk, attachment/list) bigger than this size in bytes
+    # are sent compressed with gzip. The server must accept gzip-encoded requests. None disables the compression
+    gzip_request_min_size: Optional[int] = field(default=None)
+    # concurrent GET requests with the same URL and parameters share one request and one response.
+    # A GET that starts while an identical one is running can get a response sent before a preceding change
+    coalesce_gets: bool = field(default=False)
+
+    def __post_init__(self):
+        if self.pool_size < 1:
+            raise ValueError(f'pool size must be positive but was {self.pool_size}')
 
 
 class ZephyrSession(Session):
-    def __init__(self, prefix_url: str, api_token: str):
+    __gzip_paths = re.compile(r'/(execution/bulk|testcase/bulk|attachment/list)/?$')
+    # GET requests with other arguments (e.g. headers or stream) are not coalesced
+    __coalesced_arguments = frozenset({'params', 'allow_redirects'})
+
+    def __init__(self, prefix_url: str, api_token: str, options: ConnectionOptions = None,
+                 throttling: ThrottlingOptions = None, cache: CacheOptions = None):
         self.prefix_url = prefix_url
+        self.options = options if options is not None else ConnectionOptions()
+        self.throttler = None if throttling is None else Throttler(throttling)
+        self.metrics = RequestMetrics()
+        self.cache = None if cache is None else ResponseCache(cache)
+        self.__in_flight = SingleFlight[Response]()
         super(ZephyrSession, self).__init__()
         self.headers.update(
             {
                 'Authorization': f'Bearer {api_token}'
             }
         )
+        if not self.options.keep_alive:
+            self.headers['Connection'] = 'close'
+        if not self.options.compress_responses:
+            self.headers['Accept-Encoding'] = 'identity'
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.options.pool_size,
+                              pool_block=self.options.pool_block)
+        self.mount('http://', adapter)
+        self.mount('https://', adapter)
 
     def request(self, method, url, *args, **kwargs):
         url = urljoin(self.prefix_url, url)
-        return super(ZephyrSession, self).request(method, url, *args, **kwargs)
+        if self.options.gzip_request_min_size is not None and kwargs.get('json', None) is not None \
+                and ZephyrSession.__gzip_paths.search(urlsplit(url).path) is not None:
+            self.__compress_json(kwargs)
+        if not self.options.coalesce_gets or method.upper() != 'GET' or args \
+                or not ZephyrSession.__coalesced_arguments.issuperset(kwargs.keys()):
+            return self.__request(method, url, args, kwargs)
+        key = (url, repr(kwargs.get('params', None)), kwargs.get('allow_redirects', True))
+        response = self.__in_flight.do(key, lambda: self.__request(method, url, args, kwargs))
+        # callers can change the response (e.g. set encoding), so each of them gets its own copy
+        return copy.copy(response)
+
+    def __request(self, method: str, url: str, args: tuple, kwargs: dict) -> Response:
+        if self.cache is None:
+            return self.__send(method, url, args, kwargs)
+        return self.cache.request(method, url, kwargs,
+                                  lambda request_kwargs: self.__send(method, url, args, request_kwargs))
+
+    def __send(self, method: str, url: str, args: tuple, kwargs: dict) -> Response:
+        def send() -> Response:
+            return self.metrics.measure(method, url,
+                                        lambda: super(ZephyrSession, self).request(method, url, *args, **kwargs),
+                                        stream=kwargs.get('stream', False))
+
+        if self.throttler is None:
+            return send()
+        return self.throttler.send(method, send)
+
+    def __compress_json(self, kwargs: dict):
+        body = json.dumps(kwargs['json'], allow_nan=False).encode()
+        if len(body) < self.options.gzip_request_min_size:
+            return
+        del kwargs['json']
+        kwargs['data'] = gzip.compress(body)
+        headers = dict(kwargs.get('headers', None) or {})
+        headers['Content-Type'] = 'application/json'
+        headers['Content-Encoding'] = 'gzip'
+        kwargs['headers'] = headers
@@ -0,0 +1,37 @@
+import threading
+from concurrent.futures import Future
+from typing import TypeVar, Generic, Callable, Hashable
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    Runs one call per key at a time.
+    Callers that request the same key while the call is running wait for it and get the same result or exception
+    """
+
+    def __init__(self):
+        self.__calls = dict[Hashable, Future]()
+        self.__lock = threading.Lock()
+
+    def do(self, key: Hashable, call: Callable[[], T]) -> T:
+        with self.__lock:
+            future = self.__calls.get(key, None)
+            running = future is not None
+            if not running:
+                future = Future()
+                self.__calls[key] = future
+        if running:
+            return future.result()
+
+        try:
+            result = call()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.__lock:
+                del self.__calls[key]
@@ -0,0 +1,143 @@
+import dataclasses
+import json
+import logging
+import sqlite3
+import time
+import zlib
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from typing import Optional
+
+from test_management_sync.model import Folder, RootFolder, ExecutionStatus
+from test_management_sync.zephyr.model.planning import Cycle
+from test_management_sync.zephyr.model.requirements import RequirementTreeNode
+from test_management_sync.zephyr.model.testcases import TestCaseTreeNode
+
+_SNAPSHOT_VERSION = 1
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReleaseSnapshot:
+    """
+    State of a Zephyr release that is stored between runs
+    """
+    requirement_folders: dict[Folder, RequirementTreeNode] = field(default_factory=dict)
+    testcase_folders: dict[Folder, TestCaseTreeNode] = field(default_factory=dict)
+    cycles: list[Cycle] = field(default_factory=list)
+    execution_statuses: list[ExecutionStatus] = field(default_factory=list)
+    tester_id: Optional[int] = field(default=None)
+    token_digest: Optional[str] = field(default=None)
+    created_at: float = field(default_factory=time.time)
+
+
+def read_snapshot(path: Path, zephyr_url: str, project_id: int, release_id: int,
+                  max_age: timedelta = None) -> Optional[ReleaseSnapshot]:
+    if not path.exists():
+        return None
+    try:
+        with closing(sqlite3.connect(path)) as connection:
+            _create_table(connection)
+            row = connection.execute(
+                'SELECT version, created_at, payload FROM release_snapshot '
+                'WHERE zephyr_url = ? AND project_id = ? AND release_id = ?',
+                (zephyr_url, project_id, release_id),
+            ).fetchone()
+    except sqlite3.Error as e:
+        _logger.warning('cannot read snapshot from %s: %s', path, e)
+        return None
+    if row is None:
+        return None
+    version, created_at, payload = row
+    if version != _SNAPSHOT_VERSION:
+        _logger.info('ignoring snapshot with version %s', version)
+        return None
+    if max_age is not None and time.time() - created_at > max_age.total_seconds():
+        _logger.info('ignoring snapshot created %.0f second(s) ago', time.time() - created_at)
+        return None
+    return _decode(json.loads(zlib.decompress(payload)), created_at)
+
+
+def write_snapshot(path: Path, zephyr_url: str, project_id: int, release_id: int, snapshot: ReleaseSnapshot):
+    payload = zlib.compress(json.dumps(_encode(snapshot), separators=(',', ':')).encode())
+    try:
+        with closing(sqlite3.connect(path)) as connection:
+            _create_table(connection)
+            with connection:
+                connection.execute(
+                    'INSERT OR REPLACE INTO release_snapshot '
+                    '(zephyr_url, project_id, release_id, version, created_at, payload) VALUES (?, ?, ?, ?, ?, ?)',
+                    (zephyr_url, project_id, release_id, _SNAPSHOT_VERSION, snapshot.created_at, payload),
+                )
+    except sqlite3.Error as e:
+        _logger.warning('cannot write snapshot to %s: %s', path, e)
+
+
+def _create_table(connection: sqlite3.Connection):
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS release_snapshot ('
+        'zephyr_url TEXT NOT NULL, '
+        'project_id INTEGER NOT NULL, '
+        'release_id INTEGER NOT NULL, '
+        'version INTEGER NOT NULL, '
+        'created_at REAL NOT NULL, '
+        'payload BLOB NOT NULL, '
+        'PRIMARY KEY (zephyr_url, project_id, release_id))'
+    )
+
+
+def _encode(snapshot: ReleaseSnapshot) -> dict:
+    return {
+        'requirementFolders': [
+            # nested categories are not needed because every folder is stored separately
+            [_folder_to_path(folder), dataclasses.replace(node, categories=[]).to_dict()]
+            for folder, node in snapshot.requirement_folders.items()
+        ],
+        'testcaseFolders': [
+            [_folder_to_path(folder), node.to_dict()]
+            for folder, node in snapshot.testcase_folders.items()
+        ],
+        # the schema of the cycle cannot encode nested phases
+        'cycles': [cycle.to_dict() for cycle in snapshot.cycles],
+        'executionStatuses': [[status.id, status.name] for status in snapshot.execution_statuses],
+        'testerId': snapshot.tester_id,
+        'tokenDigest': snapshot.token_digest,
+    }
+
+
+def _decode(payload: dict, created_at: float) -> ReleaseSnapshot:
+    return ReleaseSnapshot(
+        requirement_folders={
+            _path_to_folder(path): RequirementTreeNode.from_dict(node)
+            for path, node in payload['requirementFolders']
+        },
+        testcase_folders={
+            _path_to_folder(path): TestCaseTreeNode.from_dict(node)
+            for path, node in payload['testcaseFolders']
+        },
+        cycles=[Cycle.from_dict(cycle) for cycle in payload['cycles']],
+        execution_statuses=[ExecutionStatus(id=status_id, name=name)
+                            for status_id, name in payload['executionStatuses']],
+        tester_id=payload['testerId'],
+        token_digest=payload['tokenDigest'],
+        created_at=created_at,
+    )
+
+
+def _folder_to_path(folder: Folder) -> list[str]:
+    path = []
+    while folder is not None:
+        path.append(folder.name)
+        folder = folder.parent
+    path.reverse()
+    return path
+
+
+def _path_to_folder(path: list[str]) -> Folder:
+    folder = RootFolder(path[0])
+    for name in path[1:]:
+        folder = folder / name
+    return folder
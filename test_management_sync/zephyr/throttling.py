@@ -0,0 +1,166 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Callable, Collection
+
+from requests import Response
+
+# Zephyr writes are not idempotent (e.g. every bulk execution update adds a test result), so only reads are retried
+_RETRIED_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ThrottlingOptions:
+    """
+    Limits the rate and the number of concurrent requests to Zephyr.
+    The concurrency limit is increased by one per limit of requests that are fast
+    and decreased by decrease_factor when the server responds slowly or signals overload
+    """
+    # max number of requests per second, None means that the rate is not limited
+    rate: Optional[float] = field(default=None)
+    # max number of requests that can be sent at once after the rate limit was not used
+    burst: int = field(default=10)
+    initial_concurrency: int = field(default=8)
+    min_concurrency: int = field(default=1)
+    max_concurrency: int = field(default=64)
+    # responses slower than this (in seconds) are treated as a sign of overload
+    target_latency: float = field(default=5.0)
+    decrease_factor: float = field(default=0.5)
+    # responses with these statuses are treated as overload and GET requests are retried
+    retry_statuses: Collection[int] = field(default=frozenset({429, 503}))
+    max_retries: int = field(default=5)
+    # delay before the first retry in seconds if the server does not send Retry-After. Doubled for each next retry
+    backoff: float = field(default=1.0)
+    max_backoff: float = field(default=60.0)
+
+    def __post_init__(self):
+        if self.rate is not None and self.rate <= 0:
+            raise ValueError(f'rate must be positive but was {self.rate}')
+        if self.burst < 1:
+            raise ValueError(f'burst must be positive but was {self.burst}')
+        if not 1 <= self.min_concurrency <= self.initial_concurrency <= self.max_concurrency:
+            raise ValueError(f'concurrency must satisfy 1 <= min ({self.min_concurrency}) <= '
+                             f'initial ({self.initial_concurrency}) <= max ({self.max_concurrency})')
+        if not 0 < self.decrease_factor < 1:
+            raise ValueError(f'decrease factor must be in range (0, 1) but was {self.decrease_factor}')
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: int):
+        self.__rate = rate
+        self.__capacity = capacity
+        self.__tokens = float(capacity)
+        self.__updated = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.__lock:
+                now = time.monotonic()
+                self.__tokens = min(self.__capacity, self.__tokens + (now - self.__updated) * self.__rate)
+                self.__updated = now
+                if self.__tokens >= 1:
+                    self.__tokens -= 1
+                    return
+                wait = (1 - self.__tokens) / self.__rate
+            time.sleep(wait)
+
+
+class ConcurrencyLimiter:
+    """
+    Additive-increase/multiplicative-decrease limit of concurrent requests
+    """
+
+    def __init__(self, options: ThrottlingOptions):
+        self.__options = options
+        self.__limit = float(options.initial_concurrency)
+        self.__active = 0
+        self.__last_decrease = 0.0
+        self.__condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self.__limit)
+
+    def acquire(self):
+        with self.__condition:
+            while self.__active >= int(self.__limit):
+                self.__condition.wait()
+            self.__active += 1
+
+    def release(self, latency: float, overloaded: bool):
+        with self.__condition:
+            self.__active -= 1
+            if overloaded or latency > self.__options.target_latency:
+                now = time.monotonic()
+                # requests that were sent before the previous decrease do not decrease the limit again
+                if now - self.__last_decrease > latency:
+                    self.__limit = max(self.__options.min_concurrency, self.__limit * self.__options.decrease_factor)
+                    self.__last_decrease = now
+                    _logger.info('concurrency limit decreased to %s', self.limit)
+            else:
+                self.__limit = min(self.__options.max_concurrency, self.__limit + 1 / self.__limit)
+            self.__condition.notify_all()
+
+
+class Throttler:
+    def __init__(self, options: ThrottlingOptions):
+        self.__options = options
+        self.__bucket = None if options.rate is None else TokenBucket(options.rate, options.burst)
+        self.__limiter = ConcurrencyLimiter(options)
+
+    @property
+    def concurrency_limit(self) -> int:
+        return self.__limiter.limit
+
+    def send(self, method: str, send: Callable[[], Response]) -> Response:
+        """
+        Sends the request when the rate and concurrency limits allow it.
+        GET requests are retried if the server signals overload
+        """
+        retries = self.__options.max_retries if method.upper() in _RETRIED_METHODS else 0
+        attempt = 0
+        while True:
+            if self.__bucket is not None:
+                self.__bucket.acquire()
+            self.__limiter.acquire()
+            start = time.monotonic()
+            response = None
+            try:
+                response = send()
+            finally:
+                overloaded = response is not None and response.status_code in self.__options.retry_statuses
+                self.__limiter.release(time.monotonic() - start, overloaded)
+
+            if not overloaded or attempt >= retries:
+                return response
+            delay = self.__retry_delay(response, attempt)
+            _logger.info('%s %s returned %s, retrying in %.1f second(s)',
+                         method, response.url, response.status_code, delay)
+            response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def __retry_delay(self, response: Response, attempt: int) -> float:
+        delay = Throttler.__parse_retry_after(response.headers.get('Retry-After', None))
+        if delay is None:
+            delay = self.__options.backoff * 2 ** attempt
+        return min(max(delay, 0.0), self.__options.max_backoff)
+
+    @staticmethod
+    def __parse_retry_after(value: Optional[str]) -> Optional[float]:
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        try:
+            return (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
@@ -0,0 +1,32 @@
+import enum
+from concurrent.futures import Executor
+from typing import TypeVar, Callable, Iterable, Optional
+
+from test_management_sync.model import Folder
+
+T = TypeVar("T")
+
+TreeLevel = list[tuple[Folder, T]]
+
+
+class TreeLoadingStrategy(enum.Enum):
+    # sub folders are requested for each folder separately
+    PER_NODE = 'per_node'
+    # the whole tree is requested in as few requests as possible and assembled locally
+    FLAT = 'flat'
+
+
+def walk_breadth_first(roots: TreeLevel, expand: Callable[[Folder, T], TreeLevel],
+                       executor: Optional[Executor] = None):
+    """
+    Walks the tree level by level starting from the roots.
+    The expand function is called for every item in the level and must return the items of the next level.
+    If executor is provided all items of one level are expanded concurrently.
+    """
+    level = roots
+    while level:
+        if executor is None:
+            expanded: Iterable[TreeLevel] = [expand(folder, item) for folder, item in level]
+        else:
+            expanded = executor.map(lambda folder_and_item: expand(*folder_and_item), level)
+        level = [child for children in expanded for child in children]
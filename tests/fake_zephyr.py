@@ -0,0 +1,347 @@
+"""
+In-memory fake of the Zephyr Enterprise REST endpoints used by the services
+"""
+import gzip
+import json
+import re
+import threading
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Any, Iterator, Optional
+from urllib.parse import urlsplit, parse_qsl
+
+PREFIX = '/flex/services/rest/'
+
+TESTER_ID = 7
+
+STATUSES = [{'id': 1, 'value': 'Pass'}, {'id': 2, 'value': 'Fail'}]
+
+
+class FakeZephyr:
+    """
+    Keeps the state of one release. Requests are handled by handle, the log of requests is kept in requests
+    """
+
+    def __init__(self, project_id: int = 3, release_id: int = 5):
+        self.project_id = project_id
+        self.release_id = release_id
+        self.tc_nodes = dict[int, dict]()
+        self.req_nodes = dict[int, dict]()
+        self.testcases = dict[int, dict]()
+        self.requirements = dict[int, dict]()
+        # test case folders that are missing when all folders of the release are requested at once
+        self.unlisted_tc_nodes = set[int]()
+        # searches with larger pages fail with a server error
+        self.max_page_size: Optional[int] = None
+        self.cycles = dict[int, dict]()
+        # executions by phase id
+        self.executions = dict[int, list[dict]]()
+        self.executed = list[tuple[str, list[int]]]()
+        self.mappings = list[dict]()
+        self.requests = list[tuple[str, str, dict]]()
+        self.__next_id = 100
+        self.__lock = threading.RLock()
+        self.__routes = [
+            ('GET', r'latest/user/current', self.__current_user),
+            ('GET', r'v4/admin/preference/all/system', self.__preferences),
+            ('GET', r'v4/requirementtree', self.__req_roots),
+            ('GET', r'v4/requirementtree/(\d+)', self.__req_node_details),
+            ('POST', r'v3/requirementtree/add', self.__new_req_node),
+            ('POST', r'v3/requirement/', self.__new_requirement),
+            ('GET', r'v3/requirement', self.__find_requirements),
+            ('PUT', r'v3/requirement/allocate/testcase', self.__map_requirement),
+            ('GET', r'v3/testcasetree/lite', self.__tc_nodes),
+            ('POST', r'v3/testcasetree', self.__new_tc_node),
+            ('POST', r'v3/testcase/bulk', self.__new_testcases),
+            ('GET', r'v3/testcase/tree/(\d+)', self.__find_testcases_in_node),
+            ('GET', r'v3/testcase', self.__find_testcases_in_release),
+            ('GET', r'v3/cycle/release/(\d+)', self.__release_cycles),
+            ('GET', r'v3/cycle/(\d+)', self.__get_cycle),
+            ('POST', r'v3/cycle', self.__new_cycle),
+            ('DELETE', r'v3/cycle/(\d+)', self.__delete_cycle),
+            ('POST', r'v3/cycle/(\d+)/phase', self.__new_phase),
+            ('GET', r'v3/assignmenttree/(\d+)', self.__assignment_tree),
+            ('POST', r'v3/assignmenttree/(\d+)/assign/bytree/(\d+)', self.__assign_by_tree),
+            ('PUT', r'v3/assignmenttree/(\d+)/bulk/tree/.*', self.__assign_to_user),
+            ('GET', r'v3/execution', self.__find_executions),
+            ('PUT', r'v3/execution/bulk', self.__execute),
+        ]
+
+    def handle(self, method: str, path: str, query: dict[str, str], body: Any) -> tuple[int, Any]:
+        with self.__lock:
+            self.requests.append((method, path, query))
+            if path.startswith(PREFIX):
+                relative = path[len(PREFIX):]
+                for route_method, pattern, handler in self.__routes:
+                    match = re.fullmatch(pattern, relative)
+                    if route_method == method and match is not None:
+                        return handler(query, body, *map(int, match.groups()))
+            return 404, {'error': f'{method} {path} is not found'}
+
+    def count(self, method: str, pattern: str) -> int:
+        """
+        Number of received requests which path matches the pattern
+        """
+        with self.__lock:
+            return sum(1 for m, path, _ in self.requests if m == method and re.search(pattern, path) is not None)
+
+    def add_tc_folder(self, name: str, parent_id: int = None) -> int:
+        with self.__lock:
+            node_id = self.__new_id()
+            self.tc_nodes[node_id] = {'id': node_id, 'name': name, 'description': '', 'releaseId': self.release_id,
+                                      'type': 'Phase' if parent_id is None else 'Module', 'parentId': parent_id}
+            return node_id
+
+    def delete_tc_folder(self, node_id: int):
+        with self.__lock:
+            for child_id in [child['id'] for child in self.tc_nodes.values() if child['parentId'] == node_id]:
+                self.delete_tc_folder(child_id)
+            del self.tc_nodes[node_id]
+            for tc_id in [tc_id for tc_id, tc in self.testcases.items() if tc['tcrCatalogTreeId'] == node_id]:
+                del self.testcases[tc_id]
+
+    def add_testcase(self, node_id: int, name: str, description: str = '') -> int:
+        with self.__lock:
+            tc_id = self.__new_id()
+            self.testcases[tc_id] = {
+                'tcrCatalogTreeId': node_id,
+                'testcase': {'id': tc_id, 'testcaseId': tc_id + 100_000, 'name': name, 'description': description,
+                             'projectId': self.project_id},
+            }
+            return tc_id
+
+    def add_req_folder(self, name: str, parent_id: int = 0) -> int:
+        with self.__lock:
+            node_id = self.__new_id()
+            self.req_nodes[node_id] = {'id': node_id, 'name': name, 'description': '', 'projectId': self.project_id,
+                                       'type': 'req', 'parentId': parent_id, 'releaseIds': [str(self.release_id)]}
+            return node_id
+
+    def add_requirement(self, node_id: int, name: str, details: str = '') -> int:
+        with self.__lock:
+            req_id = self.__new_id()
+            self.requirements[req_id] = {'id': req_id, 'name': name, 'details': details, 'requirementTreeId': node_id}
+            return req_id
+
+    def add_cycle(self, name: str, start: str = '01/01/2024', end: str = '01/31/2024') -> int:
+        with self.__lock:
+            cycle_id = self.__new_id()
+            self.cycles[cycle_id] = {'id': cycle_id, 'name': name, 'cycleStartDate': start, 'cycleEndDate': end,
+                                     'releaseId': self.release_id, 'cyclePhases': []}
+            return cycle_id
+
+    def add_phase(self, cycle_id: int, name: str, tree_id: int = None) -> int:
+        """
+        Adds a phase from the test case tree if tree_id is set, otherwise a free form phase.
+        Executions of a phase from the tree are created for all test cases in the tree
+        """
+        with self.__lock:
+            cycle = self.cycles[cycle_id]
+            phase_id = self.__new_id()
+            phase = {'id': phase_id, 'name': name, 'phaseStartDate': cycle['cycleStartDate'],
+                     'phaseEndDate': cycle['cycleEndDate'], 'cycleId': cycle_id, 'releaseId': self.release_id,
+                     'tcrCatalogTreeId': self.__new_id() if tree_id is None else tree_id,
+                     'freeForm': tree_id is None}
+            cycle['cyclePhases'].append(phase)
+            self.executions[phase_id] = []
+            if tree_id is not None:
+                subtree = self.__subtree(tree_id)
+                self.add_executions(phase_id, [tc_id for tc_id, tc in self.testcases.items()
+                                               if tc['tcrCatalogTreeId'] in subtree])
+            return phase_id
+
+    def add_executions(self, phase_id: int, testcase_ids: list[int], status: str = None) -> list[int]:
+        with self.__lock:
+            ids = []
+            for tc_id in testcase_ids:
+                execution = {'id': self.__new_id(), 'testerId': TESTER_ID, 'tcrTreeTestcase': self.testcases[tc_id]}
+                if status is not None:
+                    execution['lastTestResult'] = {'executionStatus': status}
+                self.executions[phase_id].append(execution)
+                ids.append(execution['id'])
+            return ids
+
+    def execution_status(self, execution_id: int) -> Optional[str]:
+        with self.__lock:
+            for executions in self.executions.values():
+                for execution in executions:
+                    if execution['id'] == execution_id:
+                        return execution.get('lastTestResult', {}).get('executionStatus', None)
+            raise KeyError(execution_id)
+
+    def __new_id(self) -> int:
+        self.__next_id += 1
+        return self.__next_id
+
+    def __subtree(self, node_id: int) -> set[int]:
+        ids = {node_id}
+        for child in self.tc_nodes.values():
+            if child['parentId'] == node_id:
+                ids.update(self.__subtree(child['id']))
+        return ids
+
+    def __page(self, query: dict[str, str], items: list) -> tuple[int, dict]:
+        offset, size = int(query['offset']), int(query['pagesize'])
+        if self.max_page_size is not None and size > self.max_page_size:
+            return 500, {'error': f'page size {size} is too large'}
+        return 200, {'firstResult': offset, 'resultSize': len(items), 'pageNumber': offset // size,
+                     'results': items[offset:offset + size]}
+
+    def __current_user(self, query: dict, body: Any):
+        return 200, {'id': TESTER_ID, 'username': 'tester'}
+
+    def __preferences(self, query: dict, body: Any):
+        return 200, [{'name': 'testresult.testresultStatus.LOV', 'value': json.dumps(STATUSES)}]
+
+    def __req_roots(self, query: dict, body: Any):
+        return 200, [node for node in self.req_nodes.values() if node['parentId'] == 0]
+
+    def __req_node_details(self, query: dict, body: Any, node_id: int):
+        if node_id not in self.req_nodes:
+            return 404, {}
+
+        def with_categories(node: dict) -> dict:
+            children = [child for child in self.req_nodes.values() if child['parentId'] == node['id']]
+            return dict(node, categories=list(map(with_categories, children)))
+
+        return 200, with_categories(self.req_nodes[node_id])
+
+    def __new_req_node(self, query: dict, body: dict):
+        node_id = self.add_req_folder(body['name'], body.get('parentId', 0))
+        return 200, self.req_nodes[node_id]
+
+    def __new_requirement(self, query: dict, body: dict):
+        req_id = self.add_requirement(body['requirementTreeId'], body['name'], body['details'])
+        return 200, self.requirements[req_id]
+
+    def __find_requirements(self, query: dict, body: Any):
+        node_id = int(query['requirementtreeid'])
+        return self.__page(query, [req for req in self.requirements.values() if req['requirementTreeId'] == node_id])
+
+    def __map_requirement(self, query: dict, body: dict):
+        self.mappings.append(body)
+        return 200, {}
+
+    def __tc_nodes(self, query: dict, body: Any):
+        if query['type'] == 'Phase':
+            return 200, [node for node in self.tc_nodes.values() if node['parentId'] is None]
+        if 'parentid' not in query:
+            return 200, [node for node in self.tc_nodes.values() if node['parentId'] is not None
+                         and node['id'] not in self.unlisted_tc_nodes]
+        parent_id = int(query['parentid'])
+        return 200, [node for node in self.tc_nodes.values() if node['parentId'] == parent_id]
+
+    def __new_tc_node(self, query: dict, body: dict):
+        parent_id = int(query['parentid'])
+        node_id = self.add_tc_folder(body['name'], parent_id if parent_id != 0 else None)
+        return 200, self.tc_nodes[node_id]
+
+    def __new_testcases(self, query: dict, body: list):
+        created = []
+        for tc in body:
+            if tc['tcrCatalogTreeId'] not in self.tc_nodes:
+                return 400, {'error': f'tree node {tc["tcrCatalogTreeId"]} does not exist'}
+            tc_id = self.add_testcase(tc['tcrCatalogTreeId'], tc['testcase']['name'], tc['testcase']['description'])
+            created.append(self.testcases[tc_id])
+        return 200, created
+
+    def __find_testcases_in_node(self, query: dict, body: Any, node_id: int):
+        return self.__page(query, [tc for tc in self.testcases.values() if tc['tcrCatalogTreeId'] == node_id])
+
+    def __find_testcases_in_release(self, query: dict, body: Any):
+        return self.__page(query, list(self.testcases.values()))
+
+    def __release_cycles(self, query: dict, body: Any, release_id: int):
+        return 200, [cycle for cycle in self.cycles.values() if cycle['releaseId'] == release_id]
+
+    def __get_cycle(self, query: dict, body: Any, cycle_id: int):
+        if cycle_id not in self.cycles:
+            return 404, {}
+        return 200, self.cycles[cycle_id]
+
+    def __new_cycle(self, query: dict, body: dict):
+        cycle_id = self.add_cycle(body['name'], body['cycleStartDate'], body['cycleEndDate'])
+        return 200, self.cycles[cycle_id]
+
+    def __delete_cycle(self, query: dict, body: Any, cycle_id: int):
+        cycle = self.cycles.pop(cycle_id)
+        for phase in cycle['cyclePhases']:
+            self.executions.pop(phase['id'], None)
+        return 200, {}
+
+    def __new_phase(self, query: dict, body: dict, cycle_id: int):
+        phase_id = self.add_phase(cycle_id, body['name'], None if body.get('freeForm', False)
+                                  else body['tcrCatalogTreeId'])
+        return 200, next(phase for phase in self.cycles[cycle_id]['cyclePhases'] if phase['id'] == phase_id)
+
+    def __assignment_tree(self, query: dict, body: Any, phase_id: int):
+        return 200, {'id': phase_id, 'type': 'Phase', 'name': 'assignment', 'categories': [],
+                     'releaseId': self.release_id, 'testcaseCount': len(self.executions.get(phase_id, []))}
+
+    def __assign_by_tree(self, query: dict, body: list, phase_id: int, tree_id: int):
+        assigned = {execution['tcrTreeTestcase']['testcase']['id'] for execution in self.executions[phase_id]}
+        for assignment in body:
+            self.add_executions(phase_id, [tc_id for tc_id in assignment['tctIds'] if tc_id not in assigned])
+        return 200, {}
+
+    def __assign_to_user(self, query: dict, body: Any, phase_id: int):
+        return 200, {}
+
+    def __find_executions(self, query: dict, body: Any):
+        return self.__page(query, self.executions.get(int(query['cyclephaseid']), []))
+
+    def __execute(self, query: dict, body: dict):
+        ids = set(body['ids'])
+        for executions in self.executions.values():
+            for execution in executions:
+                if execution['id'] in ids:
+                    execution['lastTestResult'] = {'executionStatus': query['status']}
+        self.executed.append((query['status'], body['ids']))
+        return 200, {}
+
+
+@contextmanager
+def serve(fake: FakeZephyr) -> Iterator[str]:
+    """
+    Serves the fake on a local port and yields its URL
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.__handle()
+
+        def do_POST(self):
+            self.__handle()
+
+        def do_PUT(self):
+            self.__handle()
+
+        def do_DELETE(self):
+            self.__handle()
+
+        def log_message(self, format, *args):
+            pass
+
+        def __handle(self):
+            url = urlsplit(self.path)
+            length = int(self.headers.get('Content-Length', 0))
+            raw_body = self.rfile.read(length) if length else b''
+            if self.headers.get('Content-Encoding', None) == 'gzip':
+                raw_body = gzip.decompress(raw_body)
+            body = json.loads(raw_body) if raw_body else None
+            status, payload = fake.handle(self.command, url.path, dict(parse_qsl(url.query)), body)
+            content = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_address[1]}'
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,118 @@
+import asyncio
+import gzip
+import json
+from datetime import date
+
+import pytest
+
+from test_management_sync.async_manager import AsyncManager
+from test_management_sync.model import RootFolder, TestCase as ModelTestCase, Cycle, ExecutionStatus, Requirement
+from test_management_sync.zephyr import SearchOptions, PageSize
+from tests.fake_zephyr import FakeZephyr
+
+web = pytest.importorskip('aiohttp.web')
+
+from test_management_sync.zephyr.aio import AsyncZephyrService  # noqa: E402
+
+CYCLE = Cycle(name='Nightly', start_date=date(2024, 1, 1), end_date=date(2024, 1, 31))
+PASSED = ExecutionStatus(name='Pass', id='1')
+
+
+async def start_server(fake: FakeZephyr) -> tuple[web.AppRunner, str]:
+    async def handle(request: web.Request) -> web.Response:
+        raw_body = await request.read()
+        if request.headers.get('Content-Encoding', None) == 'gzip':
+            raw_body = gzip.decompress(raw_body)
+        body = json.loads(raw_body) if raw_body else None
+        status, payload = fake.handle(request.method, request.path, dict(request.query), body)
+        return web.json_response(payload, status=status)
+
+    app = web.Application()
+    app.router.add_route('*', '/{path:.*}', handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    return runner, f'http://127.0.0.1:{port}'
+
+
+def run_with_server(fake: FakeZephyr, test):
+    async def run():
+        runner, url = await start_server(fake)
+        try:
+            await test(url)
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(run())
+
+
+def page_offsets(fake: FakeZephyr, pattern: str) -> list[int]:
+    return sorted(int(query['offset']) for method, path, query in fake.requests
+                  if method == 'GET' and path.endswith(pattern))
+
+
+def test_loads_existing_data_on_start():
+    fake = FakeZephyr()
+    root = fake.add_tc_folder('R')
+    fake.add_testcase(fake.add_tc_folder('F', root), 'TC 1')
+    fake.add_req_folder('A', fake.add_req_folder('Q'))
+    fake.add_cycle(CYCLE.name)
+
+    async def test(url: str):
+        service = await AsyncZephyrService.create(url, 'token', 3, 5)
+        async with AsyncManager(service) as manager:
+            tc = ModelTestCase(name='TC 1', description='', folder=RootFolder('R') / 'F')
+            assert (await manager.create_test_cases([tc])).present == [tc]
+            await manager.create_requirements([Requirement(name='Req 1', description='',
+                                                           folder=RootFolder('Q') / 'A')])
+            await manager.create_cycle(CYCLE)
+            assert await manager.execution_statuses() == [PASSED, ExecutionStatus(name='Fail', id='2')]
+
+    run_with_server(fake, test)
+    assert fake.count('POST', 'testcasetree$') == 0
+    assert fake.count('POST', 'requirementtree/add$') == 0
+    assert fake.count('POST', 'cycle$') == 0
+    assert [req['requirementTreeId'] for req in fake.requirements.values()] == \
+           [node_id for node_id, node in fake.req_nodes.items() if node['name'] == 'A']
+
+
+def test_requests_all_pages():
+    fake = FakeZephyr()
+    folder = fake.add_tc_folder('R')
+    for i in range(7):
+        fake.add_testcase(folder, f'TC {i}')
+
+    async def test(url: str):
+        options = SearchOptions(page_size=PageSize(2), parallel_pages=2)
+        service = await AsyncZephyrService.create(url, 'token', 3, 5, search_options=options)
+        async with AsyncManager(service) as manager:
+            assert [tc.name for tc in await service.get_testcases(RootFolder('R'))] == [f'TC {i}' for i in range(7)]
+            tc = ModelTestCase(name='TC 6', description='', folder=RootFolder('R'))
+            assert (await manager.create_test_cases([tc])).present == [tc]
+
+    run_with_server(fake, test)
+    assert page_offsets(fake, f'testcase/tree/{folder}') == [0, 2, 4, 6]
+
+
+def test_creates_and_executes_test_cases():
+    fake = FakeZephyr()
+
+    async def test(url: str):
+        service = await AsyncZephyrService.create(url, 'token', 3, 5)
+        async with AsyncManager(service) as manager:
+            tcs = [ModelTestCase(name=f'TC {i}', description='', folder=RootFolder('R') / 'F') for i in range(3)]
+            assert (await manager.create_test_cases(tcs)).to_create == tcs
+            await manager.create_cycle(CYCLE)
+            await manager.create_phase_from_testcase_tree(CYCLE, RootFolder('R'))
+            await manager.execute_testcases(CYCLE, PASSED, tcs[:2])
+            assert await manager.get_last_execution_status_for_testcases(CYCLE, tcs) == \
+                   {tc: PASSED for tc in tcs[:2]}
+
+    run_with_server(fake, test)
+    (phase_executions,) = fake.executions.values()
+    statuses = {execution['tcrTreeTestcase']['testcase']['name']: fake.execution_status(execution['id'])
+                for execution in phase_executions}
+    assert statuses == {'TC 0': PASSED.id, 'TC 1': PASSED.id, 'TC 2': None}
+
@@ -0,0 +1,106 @@
+import asyncio
+from datetime import date
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from test_management_sync.async_manager import AsyncManager
+from test_management_sync.async_service import AsyncService
+from test_management_sync.model import Requirement, RootFolder, TestCase as ModelTestCase, Cycle, ExecutionStatus
+
+
+def test_create_requirements():
+    service_mock: AsyncService = AsyncMock()
+
+    async def run():
+        async with AsyncManager(service_mock) as manager:
+            service_mock.get_requirements.return_value = []
+            requirement = Requirement(name='Req 1', description='Descr 1', folder=RootFolder('A') / 'B' / 'C')
+            await manager.create_requirements(
+                requirements=[requirement]
+            )
+            service_mock.create_requirement_folder_if_not_exists.assert_awaited_with(RootFolder('A') / 'B' / 'C')
+            service_mock.create_requirements.assert_awaited_with(
+                RootFolder('A') / 'B' / 'C',
+                [requirement]
+            )
+
+    asyncio.run(run())
+    service_mock.close.assert_awaited_once()
+
+
+def test_returns_test_cases_reconciliation():
+    service_mock: AsyncService = AsyncMock()
+    existing = ModelTestCase(name='TC 1', description='Descr 1', folder=RootFolder('A'))
+    new = ModelTestCase(name='TC 2', description='Descr 2', folder=RootFolder('A') / 'B')
+    not_requested = ModelTestCase(name='TC 3', description='Descr 3', folder=RootFolder('A'))
+    service_mock.get_testcases.side_effect = lambda folder: [existing, not_requested] \
+        if folder == RootFolder('A') else []
+
+    async def run():
+        async with AsyncManager(service_mock) as manager:
+            return await manager.create_test_cases(test_cases=[existing, new])
+
+    result = asyncio.run(run())
+    service_mock.create_testcases.assert_awaited_once_with(RootFolder('A') / 'B', [new])
+    assert result.to_create == [new]
+    assert result.present == [existing]
+    assert result.extra == [not_requested]
+
+
+def test_processes_folders_concurrently():
+    service_mock: AsyncService = AsyncMock()
+    folders = [RootFolder('A'), RootFolder('B')]
+    requested = list[RootFolder]()
+
+    async def get_testcases(folder):
+        requested.append(folder)
+        # completes only if the other folder is requested while this one is in progress
+        while len(requested) < len(folders):
+            await asyncio.sleep(0)
+        return []
+
+    service_mock.get_testcases.side_effect = get_testcases
+
+    async def run():
+        async with AsyncManager(service_mock) as manager:
+            test_cases = [ModelTestCase(name='TC', description='', folder=folder) for folder in folders]
+            await asyncio.wait_for(manager.create_test_cases(test_cases), timeout=5)
+
+    asyncio.run(run())
+    assert set(requested) == set(folders)
+    assert service_mock.create_testcases.await_count == 2
+
+
+def test_executes_test_cases_grouped_by_folder():
+    service_mock: AsyncService = AsyncMock()
+    cycle = Cycle(name='Cycle', start_date=date(2024, 1, 1), end_date=date(2024, 1, 31))
+    status = ExecutionStatus(name='Pass', id='1')
+    tc_a = ModelTestCase(name='TC 1', description='', folder=RootFolder('A'))
+    tc_b = ModelTestCase(name='TC 2', description='', folder=RootFolder('B'))
+
+    async def run():
+        async with AsyncManager(service_mock) as manager:
+            await manager.execute_testcases(cycle, status, [tc_a, tc_b])
+
+    asyncio.run(run())
+    service_mock.execute_all_test_cases.assert_awaited_once_with(
+        cycle, status, {RootFolder('A'): [tc_a], RootFolder('B'): [tc_b]})
+
+
+def test_raises_error_if_duplicated_files_provided():
+    service_mock: AsyncService = AsyncMock()
+    testcase = ModelTestCase(name='TC 1', description='Descr 1', folder=RootFolder('A'))
+
+    async def run():
+        async with AsyncManager(service_mock) as manager:
+            await manager.attach_files_to_testcases(
+                attachments={
+                    testcase: [Path("test1.txt"), Path("test2.txt"), Path("test1.txt")]
+                }
+            )
+
+    with pytest.raises(ValueError, match=r"duplicated files in attachments: \['test1.txt'\]"):
+        asyncio.run(run())
+    service_mock.attache_files_to_testcases.assert_not_awaited()
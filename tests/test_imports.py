@@ -0,0 +1,18 @@
+import subprocess
+import sys
+from pathlib import Path
+
+
+def test_imports_without_async_extra():
+    script = '\n'.join([
+        'import sys',
+        "sys.modules['aiohttp'] = None",
+        'import test_management_sync, test_management_sync.zephyr',
+        'try:',
+        '    import test_management_sync.zephyr.aio',
+        'except ImportError as e:',
+        "    assert 'async' in str(e), e",
+        'else:',
+        "    raise AssertionError('aio backend is imported without aiohttp')",
+    ])
+    subprocess.run([sys.executable, '-c', script], check=True, cwd=Path(__file__).parent.parent)
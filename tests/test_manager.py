@@ -1,9 +1,10 @@
 import unittest
+from datetime import date
 from pathlib import Path
 from unittest.mock import MagicMock
 
 from test_management_sync.manager import Manager
-from test_management_sync.model import Requirement, RootFolder, TestCase as ModelTestCase
+from test_management_sync.model import Requirement, RootFolder, TestCase as ModelTestCase, Cycle, ExecutionStatus
 from test_management_sync.service import Service
 
 
@@ -146,6 +147,79 @@ def test_removes_old_test_cases():
     service_mock.close.assert_called_once()
 
 
+def test_returns_requirements_reconciliation():
+    service_mock: Service = MagicMock()
+    with Manager(service_mock) as manager:
+        folder = RootFolder('A') / 'B'
+        existing = Requirement(name='Req 1', description='Descr 1', folder=folder)
+        new = Requirement(name='Req 2', description='Descr 2', folder=folder)
+        not_requested = Requirement(name='Req 3', description='Descr 3', folder=folder)
+        service_mock.get_requirements.return_value = [existing, not_requested]
+        result = manager.create_requirements(
+            requirements=[existing, new, new]
+        )
+        service_mock.create_requirements.assert_called_once_with(folder, [new])
+        assert result.to_create == [new]
+        assert result.present == [existing]
+        assert result.extra == [not_requested]
+    service_mock.close.assert_called_once()
+
+
+def test_returns_test_cases_reconciliation():
+    service_mock: Service = MagicMock()
+    with Manager(service_mock) as manager:
+        existing = ModelTestCase(name='TC 1', description='Descr 1', folder=RootFolder('A'))
+        new = ModelTestCase(name='TC 2', description='Descr 2', folder=RootFolder('A') / 'B')
+        not_requested = ModelTestCase(name='TC 3', description='Descr 3', folder=RootFolder('A'))
+        service_mock.get_testcases.side_effect = lambda folder: [existing, not_requested] \
+            if folder == RootFolder('A') else []
+        result = manager.create_test_cases(
+            test_cases=[existing, new],
+        )
+        service_mock.create_testcases.assert_called_once_with(RootFolder('A') / 'B', [new])
+        assert result.to_create == [new]
+        assert result.present == [existing]
+        assert result.extra == [not_requested]
+    service_mock.close.assert_called_once()
+
+
+def test_executes_results_with_different_statuses():
+    service_mock: Service = MagicMock()
+    cycle = Cycle(name='Cycle', start_date=date(2024, 1, 1), end_date=date(2024, 1, 31))
+    passed = ExecutionStatus(name='Pass', id='1')
+    results = {
+        ModelTestCase(name='TC 1', description='', folder=RootFolder('A')): passed,
+        ModelTestCase(name='TC 2', description='', folder=RootFolder('B')): ExecutionStatus(name='Fail', id='2'),
+    }
+    with Manager(service_mock) as manager:
+        manager.execute_results(cycle, results)
+    service_mock.execute_results.assert_called_once_with(cycle, results)
+
+
+def test_service_executes_results_grouped_by_status():
+    class RecordingService(Service):
+        def __init__(self):
+            self.executions = []
+
+        def execute_all_test_cases(self, cycle, status, tcs_by_folder):
+            self.executions.append((status.name, tcs_by_folder))
+
+    cycle = Cycle(name='Cycle', start_date=date(2024, 1, 1), end_date=date(2024, 1, 31))
+    tc_1 = ModelTestCase(name='TC 1', description='', folder=RootFolder('A'))
+    tc_2 = ModelTestCase(name='TC 2', description='', folder=RootFolder('B'))
+    tc_3 = ModelTestCase(name='TC 3', description='', folder=RootFolder('A'))
+    service = RecordingService()
+    service.execute_results(cycle, {
+        tc_1: ExecutionStatus(name='Pass', id='1'),
+        tc_2: ExecutionStatus(name='Fail', id='2'),
+        tc_3: ExecutionStatus(name='Pass', id='1'),
+    })
+    assert service.executions == [
+        ('Pass', {RootFolder('A'): [tc_1, tc_3]}),
+        ('Fail', {RootFolder('B'): [tc_2]}),
+    ]
+
+
 class InvalidUploadTestCase(unittest.TestCase):
 
     def test_raises_error_if_duplicated_files_provided_for_one_test_case(self):
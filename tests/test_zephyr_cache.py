@@ -0,0 +1,170 @@
+from test_management_sync.model import RootFolder
+from test_management_sync.zephyr.cache import (FolderItems, CachedTestCase, CachedRequirement, CachedExecution,
+                                               PhaseExecutions, ZephyrCache, FolderItemsCache, item_key)
+from test_management_sync.zephyr.model.planning import Phase, Execution
+from test_management_sync.zephyr.model.requirements import Requirement as ZephyrRequirement
+from test_management_sync.zephyr.model.testcases import TestCaseInTree as ZephyrTestCaseInTree
+
+
+def cached_tc(tc_id: int, name: str, description: str = '') -> CachedTestCase:
+    return CachedTestCase(id=tc_id, testcase_id=tc_id + 100, tcr_catalog_tree_id=1, name=name, description=description)
+
+
+def test_finds_first_item_with_key():
+    first, second = cached_tc(1, 'TC 1'), cached_tc(2, 'TC 1')
+    items = FolderItems([first, second, cached_tc(3, 'TC 2')], item_key)
+    assert items.find(('TC 1', '')) is first
+    assert items.find(('TC 1', 'other')) is None
+
+
+def test_finds_all_items_with_key():
+    first, second, third = cached_tc(1, 'TC 1'), cached_tc(2, 'TC 1'), cached_tc(3, 'TC 2')
+    items = FolderItems([first, second], item_key)
+    items.extend([third, cached_tc(4, 'TC 1', 'other')])
+    assert items.find_all(('TC 1', '')) == [first, second]
+    assert items.find_all(('TC 2', '')) == [third]
+    assert items.find_all(('TC 3', '')) == []
+    assert len(items) == 4
+
+
+def test_finds_last_execution_of_test_case():
+    executions = PhaseExecutions([CachedExecution(id=1, testcase_id=10, status='1'),
+                                  CachedExecution(id=2, testcase_id=10, status=None),
+                                  CachedExecution(id=3, testcase_id=11, status='2')])
+    assert len(executions) == 2
+    assert executions.find(10) == CachedExecution(id=2, testcase_id=10, status=None)
+    assert executions.find(12) is None
+    assert executions.status(1) is None
+    assert executions.status(3) == '2'
+
+
+def test_takes_last_status_from_last_execution_with_result():
+    executions = PhaseExecutions([CachedExecution(id=1, testcase_id=10, status='1'),
+                                  CachedExecution(id=2, testcase_id=10, status=None),
+                                  CachedExecution(id=3, testcase_id=11, status=None)])
+    assert executions.last_status(10) == '1'
+    assert executions.last_status(11) is None
+    executions.set_status(2, '2')
+    assert executions.last_status(10) == '2'
+
+
+def test_ignores_status_of_not_last_execution():
+    executions = PhaseExecutions([CachedExecution(id=1, testcase_id=10, status=None),
+                                  CachedExecution(id=2, testcase_id=10, status=None)])
+    executions.set_status(1, '1')
+    executions.set_status(4, '1')
+    assert executions.find(10) == CachedExecution(id=2, testcase_id=10, status=None)
+    executions.set_status(2, '2')
+    assert executions.find(10) == CachedExecution(id=2, testcase_id=10, status='2')
+    assert executions.status(2) == '2'
+
+
+def test_phase_may_contain_test_cases_of_its_folders_and_sub_folders():
+    cache = ZephyrCache()
+    tree_phase, free_phase, unknown_phase = (Phase(phase_start_date='', phase_end_date='', cycle_id=1, name=name, id=i)
+                                             for i, name in enumerate(['R', 'P', 'Q']))
+    cache.phase_folders[tree_phase.id] = {RootFolder('R') / 'F'}
+    cache.phase_folders[free_phase.id] = set()
+    assert cache.may_contain(tree_phase, [RootFolder('R') / 'F'])
+    assert cache.may_contain(tree_phase, [RootFolder('S'), RootFolder('R') / 'F' / 'G'])
+    assert not cache.may_contain(tree_phase, [RootFolder('R'), RootFolder('R') / 'E'])
+    assert not cache.may_contain(free_phase, [RootFolder('R')])
+    assert cache.may_contain(unknown_phase, [RootFolder('R')])
+
+
+def test_finds_cached_executions_by_id():
+    cache = ZephyrCache()
+    first_phase, second_phase = (Phase(phase_start_date='', phase_end_date='', cycle_id=1, name=name, id=i)
+                                 for i, name in enumerate(['R', 'S']))
+    cache.put_executions(first_phase.id, PhaseExecutions([CachedExecution(id=1, testcase_id=10, status='1')]))
+    cache.put_executions(second_phase.id, PhaseExecutions([CachedExecution(id=2, testcase_id=10, status=None)]))
+    cache.set_execution_statuses([2, 3], '2')
+    assert [cache.execution_status(execution_id) for execution_id in (1, 2, 3)] == ['1', '2', None]
+
+    cache.put_executions(first_phase.id, PhaseExecutions([CachedExecution(id=4, testcase_id=10, status='2')]))
+    assert [cache.execution_status(execution_id) for execution_id in (1, 4)] == [None, '2']
+    cache.invalidate_executions([second_phase])
+    assert cache.execution_status(2) is None
+    cache.set_execution_statuses([2], '1')
+    assert second_phase.id not in cache.executions
+
+
+def cached_tcs(first_id: int, count: int) -> list[CachedTestCase]:
+    return [cached_tc(tc_id, f'TC {tc_id}') for tc_id in range(first_id, first_id + count)]
+
+
+def test_evicts_least_recently_used_folder():
+    cache = FolderItemsCache(item_key, max_items=4)
+    a, b, c = RootFolder('A'), RootFolder('B'), RootFolder('R') / 'C'
+    cache.put(a, cached_tcs(1, 2))
+    cache.put(b, cached_tcs(3, 2))
+    assert cache.get(a) is not None
+    cache.put(c, cached_tcs(5, 2))
+    assert (a in cache, b in cache, c in cache) == (True, False, True)
+    assert (len(cache), cache.evictions) == (4, 1)
+
+
+def test_keeps_loaded_folder_bigger_than_limit():
+    cache = FolderItemsCache(item_key, max_items=3)
+    a, b = RootFolder('A'), RootFolder('B')
+    cache.put(a, cached_tcs(1, 2))
+    loaded = cache.put(b, cached_tcs(3, 5))
+    assert cache.get(b) is loaded
+    assert a not in cache
+    assert (len(cache), cache.evictions) == (5, 1)
+
+
+def test_evicts_other_folders_when_items_are_added():
+    cache = FolderItemsCache(item_key, max_items=4)
+    a, b = RootFolder('A'), RootFolder('B')
+    cache.put(a, cached_tcs(1, 2))
+    cache.put(b, cached_tcs(3, 2))
+    cache.add(a, cached_tcs(5, 1))
+    assert len(cache.get(a)) == 3
+    assert b not in cache
+    assert (len(cache), cache.evictions) == (3, 1)
+
+
+def test_does_not_count_invalidated_folders_as_evicted():
+    cache = FolderItemsCache(item_key, max_items=4)
+    a = RootFolder('A')
+    cache.put(a, cached_tcs(1, 2))
+    cache.put(a, cached_tcs(3, 3))
+    cache.invalidate(a)
+    assert (len(cache), cache.evictions) == (0, 0)
+
+
+def test_keeps_ids_of_test_case():
+    zephyr_tc = ZephyrTestCaseInTree.from_dict({
+        'id': 500, 'tcrCatalogTreeId': 42,
+        'testcase': {'id': 100, 'testcaseId': 200, 'name': 'TC 1', 'description': 'checks', 'projectId': 3,
+                     'releaseId': 5, 'automated': True, 'requirementIds': [1]},
+    })
+    cached = CachedTestCase.of(zephyr_tc)
+    assert cached == CachedTestCase(id=100, testcase_id=200, tcr_catalog_tree_id=42, name='TC 1', description='checks')
+    restored = cached.to_zephyr(3)
+    assert (restored.tcr_catalog_tree_id, restored.testcase.id, restored.testcase.testcase_id) == (42, 100, 200)
+    assert (restored.testcase.name, restored.testcase.description, restored.testcase.project_id) == \
+           ('TC 1', 'checks', 3)
+    assert CachedTestCase.of(restored) == cached
+
+
+def test_keeps_ids_of_requirement():
+    zephyr_req = ZephyrRequirement.from_dict({'id': 300, 'name': 'Req 1', 'details': 'must work',
+                                              'requirementTreeId': 5, 'releaseIds': [2],
+                                              'customProperties': {'component': 'core'}})
+    cached = CachedRequirement.of(zephyr_req)
+    assert cached == CachedRequirement(id=300, requirement_tree_id=5, name='Req 1', description='must work')
+    restored = cached.to_zephyr()
+    assert (restored.id, restored.requirement_tree_id, restored.name, restored.details) == \
+           (300, 5, 'Req 1', 'must work')
+    assert CachedRequirement.of(restored) == cached
+
+
+def test_keeps_ids_and_status_of_execution():
+    testcase = {'tcrCatalogTreeId': 42, 'testcase': {'id': 100, 'name': 'TC 1', 'description': '', 'projectId': 3}}
+    executed = Execution.from_dict({'id': 900, 'testerId': 7, 'tcrTreeTestcase': testcase,
+                                    'lastTestResult': {'executionStatus': '2'}})
+    not_executed = Execution.from_dict({'id': 901, 'testerId': 7, 'tcrTreeTestcase': testcase})
+    assert CachedExecution.of(executed) == CachedExecution(id=900, testcase_id=100, status='2')
+    assert CachedExecution.of(not_executed) == CachedExecution(id=901, testcase_id=100, status=None)
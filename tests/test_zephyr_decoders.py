@@ -0,0 +1,100 @@
+import dataclasses
+from typing import Any
+
+import pytest
+
+from test_management_sync.zephyr.model.decoders import decode_search_result, decode_execution, \
+    decode_testcase_in_tree, decode_requirement
+from test_management_sync.zephyr.model.planning import Execution
+from test_management_sync.zephyr.model.requirements import Requirement
+from test_management_sync.zephyr.model.search import SearchResult
+from test_management_sync.zephyr.model.testcases import TestCaseInTree as ZephyrTestCaseInTree
+
+FULL_TESTCASE = {
+    'id': 500,
+    'tcrCatalogTreeId': 42,
+    'testcase': {
+        'id': 100,
+        'testcaseId': 200,
+        'name': 'TC 1',
+        'description': 'checks the feature',
+        'projectId': 1,
+        'releaseId': 2,
+        'writerId': 3,
+        'automated': True,
+        'requirementIds': [1, 2],
+        'comments': 'created by test-management-sync',
+        'customProperties': {'component': 'core'},
+    },
+    'revision': 1,
+}
+
+MINIMAL_TESTCASE = {
+    'tcrCatalogTreeId': 42,
+    'testcase': {'name': 'TC 1', 'description': '', 'projectId': 1},
+}
+
+FULL_EXECUTION = {
+    'id': 900,
+    'testerId': 7,
+    'cyclePhaseId': 11,
+    'tcrTreeTestcase': FULL_TESTCASE,
+    'lastTestResult': {'id': 800, 'executionStatus': '1', 'executionDate': 1700000000000},
+}
+
+MINIMAL_EXECUTION = {
+    'id': 900,
+    'testerId': 7,
+    'tcrTreeTestcase': MINIMAL_TESTCASE,
+}
+
+FULL_REQUIREMENT = {
+    'id': 300,
+    'name': 'Req 1',
+    'details': 'the feature must work',
+    'requirementTreeId': 5,
+    'releaseIds': [2],
+    'requirementTreeIds': [5],
+    'customProperties': {'component': 'core'},
+}
+
+MINIMAL_REQUIREMENT = {
+    'name': 'Req 1',
+    'details': '',
+}
+
+
+def skip_unused(value: Any) -> Any:
+    """
+    Resets the fields that the decoders do not read
+    """
+    if isinstance(value, Execution):
+        return dataclasses.replace(value, tcr_tree_testcase=skip_unused(value.tcr_tree_testcase))
+    if isinstance(value, ZephyrTestCaseInTree):
+        return dataclasses.replace(value, testcase=dataclasses.replace(value.testcase, requirement_ids=[]))
+    if isinstance(value, Requirement):
+        return dataclasses.replace(value, release_ids=[], requirement_tree_ids=[], custom_properties={})
+    return value
+
+
+@pytest.mark.parametrize('raw, decode, expected_decode', [
+    (FULL_EXECUTION, decode_execution, Execution.from_dict),
+    (MINIMAL_EXECUTION, decode_execution, Execution.from_dict),
+    (FULL_TESTCASE, decode_testcase_in_tree, ZephyrTestCaseInTree.from_dict),
+    (MINIMAL_TESTCASE, decode_testcase_in_tree, ZephyrTestCaseInTree.from_dict),
+    (FULL_REQUIREMENT, decode_requirement, Requirement.from_dict),
+    (MINIMAL_REQUIREMENT, decode_requirement, Requirement.from_dict),
+])
+def test_decodes_same_as_dataclasses_json(raw: dict, decode, expected_decode):
+    assert skip_unused(decode(raw)) == skip_unused(expected_decode(raw))
+
+
+def test_decodes_search_result_same_as_dataclasses_json():
+    raw = {'firstResult': 0, 'resultSize': 2, 'pageNumber': 1, 'results': [FULL_EXECUTION, MINIMAL_EXECUTION]}
+    assert decode_search_result(raw) == SearchResult.from_dict(raw)
+
+
+def test_falls_back_to_dataclasses_json():
+    raw = {'firstResult': 0, 'resultSize': 1, 'pageNumber': 1, 'results': (MINIMAL_REQUIREMENT,)}
+    assert decode_search_result(raw) == SearchResult.from_dict(raw)
+    assert decode_search_result(raw).result_size == 1
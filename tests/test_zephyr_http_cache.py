@@ -0,0 +1,144 @@
+import io
+from typing import Callable, Optional
+
+import pytest
+from requests import Response
+
+from test_management_sync.zephyr import http_cache
+from test_management_sync.zephyr.http_cache import CacheOptions, ResponseCache
+
+URL = 'http://zephyr/flex/services/rest/v3'
+TREE = f'{URL}/testcasetree/lite'
+USER = f'{URL}/user/current'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class FakeServer:
+    def __init__(self):
+        self.sent = list[dict]()
+        self.status = 200
+        self.etag: Optional[str] = None
+        self.body = b'[]'
+        self.on_send: Optional[Callable[[], None]] = None
+
+    def send(self, kwargs: dict) -> Response:
+        self.sent.append(kwargs)
+        if self.on_send is not None:
+            self.on_send()
+        r = Response()
+        r.status_code = self.status
+        r.raw = io.BytesIO(self.body)
+        if self.etag is not None:
+            r.headers['ETag'] = self.etag
+        return r
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(http_cache, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def server() -> FakeServer:
+    return FakeServer()
+
+
+def get(cache: ResponseCache, server: FakeServer, url: str = TREE, **kwargs) -> Response:
+    return cache.request('GET', url, kwargs, server.send)
+
+
+def test_returns_cached_response_until_ttl_expires(clock: FakeClock, server: FakeServer):
+    cache = ResponseCache(CacheOptions(ttl=10))
+    assert get(cache, server).json() == []
+    server.body = b'[1]'
+    clock.now += 9
+    assert get(cache, server).json() == []
+    assert (len(server.sent), cache.hits) == (1, 1)
+
+    clock.now += 2
+    assert get(cache, server).json() == [1]
+    assert len(server.sent) == 2
+
+
+def test_caches_responses_by_params(clock: FakeClock, server: FakeServer):
+    cache = ResponseCache(CacheOptions())
+    get(cache, server, params={'parentid': 1, 'releaseid': 2})
+    get(cache, server, params={'releaseid': 2, 'parentid': 1})
+    get(cache, server, params={'parentid': 3, 'releaseid': 2})
+    assert len(server.sent) == 2
+
+
+def test_does_not_cache_other_paths(clock: FakeClock, server: FakeServer):
+    cache = ResponseCache(CacheOptions())
+    get(cache, server, f'{URL}/cycle/release/1')
+    get(cache, server, f'{URL}/cycle/release/1')
+    assert len(server.sent) == 2
+
+
+def test_revalidates_expired_response_with_etag(clock: FakeClock, server: FakeServer):
+    cache = ResponseCache(CacheOptions(ttl=10))
+    server.etag = '"v1"'
+    get(cache, server)
+    clock.now += 11
+    server.status = 304
+    server.body = b''
+    assert get(cache, server).json() == []
+    assert server.sent[1]['headers'] == {'If-None-Match': '"v1"'}
+    assert cache.revalidations == 1
+
+    # the revalidated response is fresh again
+    assert get(cache, server).json() == []
+    assert len(server.sent) == 2
+
+
+def test_replaces_modified_response_on_revalidation(clock: FakeClock, server: FakeServer):
+    cache = ResponseCache(CacheOptions(ttl=10))
+    server.etag = '"v1"'
+    get(cache, server)
+    clock.now += 11
+    server.etag = '"v2"'
+    server.body = b'[1]'
+    assert get(cache, server).json() == [1]
+    assert cache.revalidations == 0
+
+
+def test_write_invalidates_responses_of_same_family(clock: FakeClock, server: FakeServer):
+    cache = ResponseCache(CacheOptions())
+    get(cache, server, TREE)
+    get(cache, server, USER)
+    cache.request('POST', f'{URL}/testcasetree', {}, server.send)
+    get(cache, server, TREE)
+    get(cache, server, USER)
+    # the tree is requested again after the write, the current user is not
+    assert len(server.sent) == 4
+    assert cache.hits == 1
+
+
+def test_does_not_store_response_requested_before_write(clock: FakeClock, server: FakeServer):
+    cache = ResponseCache(CacheOptions())
+    # the write is sent by another thread while the GET is in flight
+    server.on_send = lambda: cache.request('PUT', f'{URL}/testcasetree/1', {}, lambda kwargs: Response())
+    get(cache, server)
+    server.on_send = None
+    get(cache, server)
+    get(cache, server)
+    assert len(server.sent) == 2
+    assert cache.hits == 1
+
+
+def test_evicts_least_recently_used_response(clock: FakeClock, server: FakeServer):
+    cache = ResponseCache(CacheOptions(max_entries=2))
+    for parent_id in (1, 2, 1, 3):
+        get(cache, server, params={'parentid': parent_id})
+    get(cache, server, params={'parentid': 1})
+    get(cache, server, params={'parentid': 2})
+    assert len(server.sent) == 4
@@ -0,0 +1,122 @@
+import io
+
+import pytest
+from requests import Response, ConnectionError
+
+from test_management_sync.model import RootFolder
+from test_management_sync.zephyr import ZephyrService, SearchOptions, PageSize, metrics
+from test_management_sync.zephyr.metrics import RequestMetrics, endpoint_template, operation, current_operation
+from tests.fake_zephyr import FakeZephyr, serve
+
+URL = 'http://zephyr/flex/services/rest/v3'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(metrics, 'time', clock)
+    return clock
+
+
+def responding(clock: FakeClock, status: int, latency: float = 0.0, body: bytes = b'{}'):
+    def send() -> Response:
+        clock.now += latency
+        r = Response()
+        r.status_code = status
+        r.raw = io.BytesIO(body)
+        return r
+
+    return send
+
+
+def test_replaces_ids_in_path_with_template():
+    assert endpoint_template(f'{URL}/assignmenttree/12/bulk/tree/5/from/-1/to/7?cascade=true') == \
+           '/flex/services/rest/v3/assignmenttree/{id}/bulk/tree/{id}/from/{id}/to/{id}'
+    assert endpoint_template(f'{URL}/testcasetree/lite') == '/flex/services/rest/v3/testcasetree/lite'
+
+
+def test_groups_requests_by_endpoint_template(clock: FakeClock):
+    request_metrics = RequestMetrics()
+    request_metrics.measure('get', f'{URL}/cycle/1', responding(clock, 200))
+    request_metrics.measure('get', f'{URL}/cycle/2', responding(clock, 200))
+    request_metrics.measure('delete', f'{URL}/cycle/2', responding(clock, 200))
+    snapshot = request_metrics.snapshot()
+    assert {key: endpoint.calls for key, endpoint in snapshot.endpoints.items()} == {
+        'GET /flex/services/rest/v3/cycle/{id}': 2,
+        'DELETE /flex/services/rest/v3/cycle/{id}': 1,
+    }
+    assert snapshot.operations == {}
+
+
+def test_records_operation_label(clock: FakeClock):
+    request_metrics = RequestMetrics()
+    with operation('load cycles'):
+        assert current_operation() == 'load cycles'
+        request_metrics.measure('GET', f'{URL}/cycle/1', responding(clock, 200))
+        request_metrics.measure('GET', f'{URL}/cycle/release/5', responding(clock, 200))
+    request_metrics.measure('GET', f'{URL}/cycle/2', responding(clock, 200))
+    assert current_operation() is None
+    assert {name: endpoint.calls for name, endpoint in request_metrics.snapshot().operations.items()} == \
+           {'load cycles': 2}
+
+
+def test_counts_errors(clock: FakeClock):
+    request_metrics = RequestMetrics()
+    request_metrics.measure('GET', f'{URL}/cycle/1', responding(clock, 200))
+    request_metrics.measure('GET', f'{URL}/cycle/1', responding(clock, 404))
+
+    def fail() -> Response:
+        raise ConnectionError('refused')
+
+    with pytest.raises(ConnectionError):
+        request_metrics.measure('GET', f'{URL}/cycle/1', fail)
+    endpoint = request_metrics.snapshot().endpoints['GET /flex/services/rest/v3/cycle/{id}']
+    assert (endpoint.calls, endpoint.errors) == (3, 2)
+
+
+def test_tracks_latency_and_sizes(clock: FakeClock):
+    request_metrics = RequestMetrics()
+    request_metrics.measure('GET', f'{URL}/cycle/1', responding(clock, 200, 0.3, b'[1, 2]'))
+    request_metrics.measure('GET', f'{URL}/cycle/1', responding(clock, 200, 40.0, b'[]'))
+    endpoint = request_metrics.snapshot().endpoints['GET /flex/services/rest/v3/cycle/{id}']
+    assert endpoint.latency == pytest.approx(40.3)
+    assert endpoint.mean_latency == pytest.approx(20.15)
+    assert endpoint.latency_histogram == (0, 0, 0, 1, 0, 0, 0, 0, 0, 1)
+    assert endpoint.response_bytes == 8
+
+
+def test_calls_listeners_even_if_one_fails(clock: FakeClock):
+    request_metrics = RequestMetrics()
+    records = []
+
+    def fail(record):
+        raise ValueError('failed')
+
+    request_metrics.add_listener(fail)
+    request_metrics.add_listener(records.append)
+    request_metrics.measure('GET', f'{URL}/cycle/1', responding(clock, 200))
+    request_metrics.remove_listener(records.append)
+    request_metrics.measure('GET', f'{URL}/cycle/1', responding(clock, 200))
+    assert [(record.endpoint, record.status) for record in records] == [('/flex/services/rest/v3/cycle/{id}', 200)]
+
+
+def test_labels_pages_requested_by_other_threads():
+    fake = FakeZephyr()
+    folder = fake.add_tc_folder('R')
+    for i in range(5):
+        fake.add_testcase(folder, f'TC {i}')
+    with serve(fake) as url:
+        service = ZephyrService(url, 'token', 3, 5, search_options=SearchOptions(page_size=PageSize(2),
+                                                                                 parallel_pages=2))
+        service.get_testcases(RootFolder('R'))
+    snapshot = service.metrics.snapshot()
+    assert snapshot.endpoints['GET /flex/services/rest/v3/testcase/tree/{id}'].calls == 3
+    assert snapshot.operations['find /flex/services/rest/v3/testcase/tree/{id}'].calls == 3
@@ -0,0 +1,136 @@
+import io
+import json
+import threading
+import time
+from typing import Callable, Optional
+
+import pytest
+from requests import Response, HTTPError
+
+from test_management_sync.zephyr import SearchOptions, AdaptivePageSize
+from test_management_sync.zephyr.actions.search import iter_find
+
+URI = '/flex/services/rest/v3/testcase/tree/1'
+
+
+class FakeSession:
+    """
+    Returns pages of the given number of items. on_get is called before a page is returned.
+    Pages larger than max_page_size fail with a server error
+    """
+
+    def __init__(self, total: int, max_page_size: int = None):
+        self.items = [{'id': i} for i in range(total)]
+        self.max_page_size = max_page_size
+        self.requested = list[tuple[int, int]]()
+        self.on_get: Optional[Callable[[int], None]] = None
+        self.__lock = threading.Lock()
+
+    @property
+    def offsets(self) -> list[int]:
+        with self.__lock:
+            return sorted(offset for offset, _ in self.requested)
+
+    def get(self, uri: str, params: dict) -> Response:
+        offset, size = params['offset'], params['pagesize']
+        with self.__lock:
+            self.requested.append((offset, size))
+        if self.on_get is not None:
+            self.on_get(offset)
+        r = Response()
+        r.url = uri
+        if self.max_page_size is not None and size > self.max_page_size:
+            r.status_code = 500
+            r.raw = io.BytesIO(b'{}')
+            return r
+        r.status_code = 200
+        r.raw = io.BytesIO(json.dumps({'firstResult': offset, 'resultSize': len(self.items),
+                                       'pageNumber': offset // size,
+                                       'results': self.items[offset:offset + size]}).encode())
+        return r
+
+
+def find(session: FakeSession, options: SearchOptions, page_size: int = 2):
+    return iter_find(session, URI, {}, lambda item: item['id'], page_size, options)
+
+
+def test_prefetches_next_page_while_current_one_is_consumed():
+    session = FakeSession(7)
+    requested = threading.Event()
+    session.on_get = lambda offset: requested.set() if offset == 2 else None
+    items = find(session, SearchOptions(prefetch=True))
+    assert next(items) == 0
+    assert requested.wait(5)
+    assert list(items) == list(range(1, 7))
+    assert session.offsets == [0, 2, 4, 6]
+
+
+def test_stops_prefetching_when_consumer_stops():
+    session = FakeSession(20)
+    items = find(session, SearchOptions(prefetch=True))
+    assert [next(items) for _ in range(3)] == [0, 1, 2]
+    items.close()
+    # only the page after the consumed one could be prefetched
+    assert set(session.offsets) <= {0, 2, 4}
+    for thread in threading.enumerate():
+        if thread.name.startswith('zephyr-find'):
+            thread.join(5)
+            assert not thread.is_alive()
+
+
+def test_requests_pages_concurrently_and_yields_them_in_order():
+    session = FakeSession(7)
+    # the remaining pages are sent at once and the later ones are received first
+    barrier = threading.Barrier(3)
+
+    def on_get(offset: int):
+        if offset > 0:
+            barrier.wait(5)
+            time.sleep((6 - offset) * 0.05)
+
+    session.on_get = on_get
+    assert list(find(session, SearchOptions(parallel_pages=3))) == list(range(7))
+    # the last page is not full, so no page is requested after the total number of results
+    assert session.offsets == [0, 2, 4, 6]
+
+
+def test_requests_results_added_after_first_page():
+    session = FakeSession(8)
+    session.on_get = lambda offset: session.items.extend({'id': i} for i in (8, 9)) if offset == 4 else None
+    assert list(find(session, SearchOptions(parallel_pages=4), page_size=4)) == list(range(10))
+    # the total from the first page is checked again only because the last page is full
+    assert session.offsets == [0, 4, 8]
+
+
+def test_stops_requesting_pages_concurrently_when_consumer_stops():
+    session = FakeSession(20)
+    items = find(session, SearchOptions(parallel_pages=2))
+    assert [next(items) for _ in range(3)] == [0, 1, 2]
+    items.close()
+    # the first two pages and the two pages requested ahead
+    assert set(session.offsets) <= {0, 2, 4, 6}
+
+
+def test_requests_page_again_with_smaller_size_after_server_error():
+    session = FakeSession(30, max_page_size=50)
+    page_size = AdaptivePageSize(initial_size=100, min_size=25)
+    assert list(find(session, SearchOptions(page_size=page_size))) == list(range(30))
+    assert session.requested == [(0, 100), (0, 50)]
+    stats = page_size.stats()
+    assert (stats.page_size, stats.pages, stats.items, stats.errors) == (50, 1, 30, 1)
+
+
+def test_does_not_increase_page_size_up_to_failed_one():
+    session = FakeSession(1000, max_page_size=50)
+    page_size = AdaptivePageSize(initial_size=100, min_size=25, max_size=400, stable_pages=1)
+    assert len(list(find(session, SearchOptions(page_size=page_size)))) == 1000
+    assert {size for _, size in session.requested} == {100, 50}
+
+
+def test_fails_when_page_size_cannot_be_decreased():
+    session = FakeSession(30, max_page_size=10)
+    page_size = AdaptivePageSize(initial_size=100, min_size=25)
+    with pytest.raises(HTTPError):
+        list(find(session, SearchOptions(page_size=page_size)))
+    assert [size for _, size in session.requested] == [100, 50, 25]
+    assert page_size.stats().errors == 3
@@ -0,0 +1,386 @@
+from datetime import date
+
+import pytest
+from requests import HTTPError
+
+from test_management_sync.manager import Manager
+from test_management_sync.model import Cycle, Requirement, RootFolder, TestCase as ModelTestCase, ExecutionStatus
+from test_management_sync.zephyr import ZephyrService, CycleFilter, TreeLoadingStrategy, SearchOptions, \
+    SearchEndpoint, AdaptivePageSize
+from test_management_sync.zephyr.actions import planning
+from test_management_sync.zephyr.snapshot import read_snapshot
+from tests.fake_zephyr import FakeZephyr, serve
+
+
+@pytest.fixture
+def fake() -> FakeZephyr:
+    return FakeZephyr()
+
+
+@pytest.fixture
+def url(fake: FakeZephyr):
+    with serve(fake) as fake_url:
+        yield fake_url
+
+
+CYCLE = Cycle(name='Nightly', start_date=date(2024, 1, 1), end_date=date(2024, 1, 31))
+PASSED = ExecutionStatus(name='Pass', id='1')
+FAILED = ExecutionStatus(name='Fail', id='2')
+
+
+def nightly(name: str) -> Cycle:
+    return Cycle(name=name, start_date=date(2024, 1, 1), end_date=date(2024, 1, 31))
+
+
+def test_loads_cycle_list_once_for_cycles_not_loaded_on_start(fake: FakeZephyr, url: str):
+    cycles = [nightly(f'Nightly {i}') for i in range(3)]
+    for cycle in cycles:
+        fake.add_cycle(cycle.name)
+    with Manager(ZephyrService(url, 'token', 3, 5, cycle_filter=CycleFilter(names=['Other']))) as manager:
+        fake.requests.clear()
+        for cycle in cycles:
+            manager.create_cycle(cycle)
+        manager.create_cycle(nightly('Absent'))
+        manager.create_cycle(cycles[0])
+    assert fake.count('GET', r'cycle/release/\d+$') == 1
+    assert fake.count('GET', r'cycle/\d+$') == len(cycles)
+    assert len(fake.cycles) == len(cycles) + 1
+
+
+def test_maps_requirement_to_all_test_cases_with_same_name(fake: FakeZephyr, url: str):
+    folder = fake.add_tc_folder('R')
+    duplicates = [fake.add_testcase(folder, 'TC 1'), fake.add_testcase(folder, 'TC 1')]
+    fake.add_testcase(folder, 'TC 2')
+    fake.add_requirement(fake.add_req_folder('Q'), 'Req 1')
+    req = Requirement(name='Req 1', description='', folder=RootFolder('Q'))
+    with Manager(ZephyrService(url, 'token', 3, 5)) as manager:
+        tc = ModelTestCase(name='TC 1', description='', folder=RootFolder('R'))
+        manager.map_test_cases_to_requirements({req: [tc]})
+    (mapping,) = fake.mappings
+    assert sorted(testcase_id for _, testcase_id in mapping['modTestcase']) == [tc_id + 100000 for tc_id in duplicates]
+
+
+def execution_requests(fake: FakeZephyr, phase_id: int) -> int:
+    return sum(1 for method, path, query in fake.requests
+               if method == 'GET' and path.endswith('/execution') and query['cyclephaseid'] == str(phase_id))
+
+
+def only_phase(fake: FakeZephyr, cycle_id: int, name: str) -> int:
+    (phase_id,) = [phase['id'] for phase in fake.cycles[cycle_id]['cyclePhases'] if phase['name'] == name]
+    return phase_id
+
+
+def test_reloads_executions_after_test_cases_are_added_to_phase(fake: FakeZephyr, url: str):
+    folder = fake.add_tc_folder('R')
+    fake.add_testcase(folder, 'TC 1')
+    fake.add_testcase(folder, 'TC 2')
+    tc1, tc2 = (ModelTestCase(name=name, description='', folder=RootFolder('R')) for name in ('TC 1', 'TC 2'))
+    service = ZephyrService(url, 'token', 3, 5)
+    with Manager(service) as manager:
+        manager.create_cycle(CYCLE)
+        manager.create_phase_from_testcases(CYCLE, 'P', [tc1])
+        manager.execute_testcases(CYCLE, PASSED, [tc1])
+        phase_id = only_phase(fake, *fake.cycles.keys(), 'P')
+        assert execution_requests(fake, phase_id) == 1
+
+        service.create_free_phase_if_not_exist(CYCLE, 'P', [tc2])
+        manager.execute_testcases(CYCLE, PASSED, [tc2])
+        assert execution_requests(fake, phase_id) == 2
+
+        service.assign_test_cases_in_phase(CYCLE, 'P')
+        assert manager.get_last_execution_status_for_testcases(CYCLE, [tc1, tc2]) == {tc1: PASSED, tc2: PASSED}
+        assert execution_requests(fake, phase_id) == 3
+
+
+def test_finds_executions_of_phase_created_after_executions_are_loaded(fake: FakeZephyr, url: str):
+    fake.add_testcase(fake.add_tc_folder('R'), 'TC 1')
+    fake.add_testcase(fake.add_tc_folder('S'), 'TC 2')
+    tc1 = ModelTestCase(name='TC 1', description='', folder=RootFolder('R'))
+    tc2 = ModelTestCase(name='TC 2', description='', folder=RootFolder('S'))
+    with Manager(ZephyrService(url, 'token', 3, 5)) as manager:
+        manager.create_cycle(CYCLE)
+        manager.create_phase_from_testcase_tree(CYCLE, RootFolder('R'))
+        manager.execute_testcases(CYCLE, PASSED, [tc1])
+        manager.create_phase_from_testcase_tree(CYCLE, RootFolder('S'))
+        manager.execute_testcases(CYCLE, PASSED, [tc2])
+        assert manager.get_last_execution_status_for_testcases(CYCLE, [tc1, tc2]) == {tc1: PASSED, tc2: PASSED}
+    (cycle_id,) = fake.cycles.keys()
+    assert execution_requests(fake, only_phase(fake, cycle_id, 'R')) == 1
+
+
+def test_uses_executions_of_recreated_cycle(fake: FakeZephyr, url: str):
+    fake.add_testcase(fake.add_tc_folder('R'), 'TC 1')
+    tc = ModelTestCase(name='TC 1', description='', folder=RootFolder('R'))
+    with Manager(ZephyrService(url, 'token', 3, 5)) as manager:
+        manager.create_cycle(CYCLE)
+        manager.create_phase_from_testcase_tree(CYCLE, RootFolder('R'))
+        manager.execute_testcases(CYCLE, PASSED, [tc])
+        assert manager.get_last_execution_status_for_testcases(CYCLE, [tc]) == {tc: PASSED}
+
+        manager.create_cycle(CYCLE, force=True)
+        manager.create_phase_from_testcase_tree(CYCLE, RootFolder('R'))
+        assert manager.get_last_execution_status_for_testcases(CYCLE, [tc]) == {}
+        manager.execute_testcases(CYCLE, FAILED, [tc])
+        assert manager.get_last_execution_status_for_testcases(CYCLE, [tc]) == {tc: FAILED}
+    (cycle_id,) = fake.cycles.keys()
+    (execution,) = fake.executions[only_phase(fake, cycle_id, 'R')]
+    assert fake.execution_status(execution['id']) == FAILED.id
+
+
+def test_looks_up_executions_only_in_phases_that_can_contain_test_cases(fake: FakeZephyr, url: str):
+    root = fake.add_tc_folder('R')
+    sub_folder = fake.add_tc_folder('F', root)
+    fake.add_testcase(root, 'TC 1')
+    fake.add_testcase(sub_folder, 'TC 2')
+    other_root = fake.add_tc_folder('S')
+    fake.add_testcase(other_root, 'TC 3')
+    cycle_id = fake.add_cycle(CYCLE.name)
+    root_phase = fake.add_phase(cycle_id, 'R', tree_id=root)
+    sub_folder_phase = fake.add_phase(cycle_id, 'F', tree_id=sub_folder)
+    other_phase = fake.add_phase(cycle_id, 'S', tree_id=other_root)
+    free_phase = fake.add_phase(cycle_id, 'P')
+    tc1 = ModelTestCase(name='TC 1', description='', folder=RootFolder('R'))
+    tc2 = ModelTestCase(name='TC 2', description='', folder=RootFolder('R') / 'F')
+    with Manager(ZephyrService(url, 'token', 3, 5)) as manager:
+        manager.execute_testcases(CYCLE, PASSED, [tc1])
+        assert [execution_requests(fake, phase_id) for phase_id in (root_phase, sub_folder_phase, other_phase)] == \
+               [1, 0, 0]
+        manager.execute_testcases(CYCLE, PASSED, [tc2])
+        assert [execution_requests(fake, phase_id) for phase_id in (root_phase, sub_folder_phase, other_phase)] == \
+               [1, 1, 0]
+    assert execution_requests(fake, free_phase) == 1
+
+
+def test_sends_all_execution_batches_when_one_fails(fake: FakeZephyr, url: str, monkeypatch):
+    folder = fake.add_tc_folder('R')
+    for i in range(5):
+        fake.add_testcase(folder, f'TC {i}')
+    tcs = [ModelTestCase(name=f'TC {i}', description='', folder=RootFolder('R')) for i in range(5)]
+    monkeypatch.setattr(ZephyrService, '_ZephyrService__batch_size', 2)
+    execute_test_cases = planning.execute_test_cases
+    batches = list[list[int]]()
+
+    def execute_or_fail(session, status_id: str, tester_id: int, ids: list[int]):
+        batches.append(ids)
+        if len(batches) == 1:
+            raise HTTPError('batch failed')
+        execute_test_cases(session, status_id, tester_id, ids)
+
+    with Manager(ZephyrService(url, 'token', 3, 5, execution_workers=3, skip_unchanged_executions=True)) as manager:
+        manager.create_cycle(CYCLE)
+        manager.create_phase_from_testcase_tree(CYCLE, RootFolder('R'))
+        monkeypatch.setattr(planning, 'execute_test_cases', execute_or_fail)
+        with pytest.raises(Exception) as error:
+            manager.execute_testcases(CYCLE, PASSED, tcs)
+        assert sorted(map(len, batches)) == [1, 2, 2]
+        assert sorted(batches[1:]) == sorted(ids for _, ids in fake.executed)
+        failed_ids = set(batches[0])
+        (phase_executions,) = fake.executions.values()
+        failed_tcs = [tc for tc in tcs if any(execution['id'] in failed_ids and
+                                              execution['tcrTreeTestcase']['testcase']['name'] == tc.name
+                                              for execution in phase_executions)]
+        assert str(error.value) == f'cannot execute {len(failed_tcs)} test case(s): {failed_tcs}'
+
+        monkeypatch.setattr(planning, 'execute_test_cases', execute_test_cases)
+        fake.executed.clear()
+        manager.execute_testcases(CYCLE, PASSED, tcs)
+    assert [sorted(ids) for _, ids in fake.executed] == [sorted(failed_ids)]
+
+
+def test_skips_executions_with_requested_status(fake: FakeZephyr, url: str):
+    folder = fake.add_tc_folder('R')
+    tc_ids = [fake.add_testcase(folder, f'TC {i}') for i in range(3)]
+    cycle_id = fake.add_cycle(CYCLE.name)
+    phase_id = fake.add_phase(cycle_id, 'P')
+    fake.add_executions(phase_id, tc_ids[:1], status=PASSED.id)
+    fake.add_executions(phase_id, tc_ids[1:], status=FAILED.id)
+    tcs = [ModelTestCase(name=f'TC {i}', description='', folder=RootFolder('R')) for i in range(3)]
+    service = ZephyrService(url, 'token', 3, 5, skip_unchanged_executions=True)
+    with Manager(service) as manager:
+        manager.execute_testcases(CYCLE, PASSED, tcs)
+        assert service.skipped_executions == 1
+        manager.execute_results(CYCLE, {tcs[0]: PASSED, tcs[1]: FAILED, tcs[2]: PASSED})
+        assert service.skipped_executions == 3
+    assert [(status, len(ids)) for status, ids in fake.executed] == [(PASSED.id, 2), (FAILED.id, 1)]
+
+
+def test_returns_status_of_last_executed_run(fake: FakeZephyr, url: str):
+    tc_id = fake.add_testcase(fake.add_tc_folder('R'), 'TC 1')
+    phase_id = fake.add_phase(fake.add_cycle(CYCLE.name), 'P')
+    fake.add_executions(phase_id, [tc_id], status=PASSED.id)
+    fake.add_executions(phase_id, [tc_id])
+    tc = ModelTestCase(name='TC 1', description='', folder=RootFolder('R'))
+    with Manager(ZephyrService(url, 'token', 3, 5)) as manager:
+        assert manager.get_last_execution_status_for_testcases(CYCLE, [tc]) == {tc: PASSED}
+        assert manager.get_last_execution_status_for_cycle_testcases(CYCLE) == {tc: PASSED}
+
+
+def sub_folder_requests(fake: FakeZephyr) -> int:
+    return sum(1 for method, path, query in fake.requests
+               if path.endswith('/testcasetree/lite') and 'parentid' in query)
+
+
+def test_loads_test_case_tree_with_one_request(fake: FakeZephyr, url: str):
+    root = fake.add_tc_folder('R')
+    fake.add_testcase(fake.add_tc_folder('G', fake.add_tc_folder('F', root)), 'TC 1')
+    fake.add_tc_folder('S')
+    with Manager(ZephyrService(url, 'token', 3, 5, tree_loading=TreeLoadingStrategy.FLAT)) as manager:
+        tc = ModelTestCase(name='TC 1', description='', folder=RootFolder('R') / 'F' / 'G')
+        assert manager.create_test_cases([tc]).present == [tc]
+    assert sub_folder_requests(fake) == 0
+    assert fake.count('POST', 'testcasetree$') == 0
+
+
+def test_looks_up_test_case_folders_missing_from_flat_tree(fake: FakeZephyr, url: str):
+    root = fake.add_tc_folder('R')
+    folder = fake.add_tc_folder('F', root)
+    sub_folder = fake.add_tc_folder('G', folder)
+    fake.add_testcase(sub_folder, 'TC 1')
+    fake.unlisted_tc_nodes.add(folder)
+    with Manager(ZephyrService(url, 'token', 3, 5, tree_loading=TreeLoadingStrategy.FLAT)) as manager:
+        tc = ModelTestCase(name='TC 1', description='', folder=RootFolder('R') / 'F' / 'G')
+        assert manager.create_test_cases([tc]).present == [tc]
+        manager.create_test_cases([ModelTestCase(name='TC 2', description='', folder=RootFolder('R') / 'F')])
+    assert fake.count('POST', 'testcasetree$') == 0
+    assert sorted(tc['tcrCatalogTreeId'] for tc in fake.testcases.values()) == sorted([sub_folder, folder])
+
+
+def test_requests_page_again_with_smaller_size_after_server_error(fake: FakeZephyr, url: str):
+    folder = fake.add_tc_folder('R')
+    for i in range(30):
+        fake.add_testcase(folder, f'TC {i}')
+    fake.max_page_size = 50
+    options = SearchOptions(page_size=AdaptivePageSize(initial_size=100, min_size=25))
+    service = ZephyrService(url, 'token', 3, 5, search_options={SearchEndpoint.TESTCASES: options})
+    assert len(service.get_testcases(RootFolder('R'))) == 30
+    assert [int(query['pagesize']) for method, path, query in fake.requests
+            if path.endswith(f'testcase/tree/{folder}')] == [100, 50]
+    stats = service.search_stats()[SearchEndpoint.TESTCASES]
+    assert (stats.page_size, stats.pages, stats.items, stats.errors) == (50, 1, 30, 1)
+    assert service.search_stats()[SearchEndpoint.REQUIREMENTS].errors == 0
+
+
+def add_release_tree(fake: FakeZephyr):
+    for r in range(3):
+        tc_root, req_root = fake.add_tc_folder(f'R{r}'), fake.add_req_folder(f'Q{r}')
+        for f in range(3):
+            tc_folder, req_folder = fake.add_tc_folder(f'F{f}', tc_root), fake.add_req_folder(f'A{f}', req_root)
+            for g in range(2):
+                fake.add_tc_folder(f'G{g}', tc_folder)
+                fake.add_req_folder(f'B{g}', req_folder)
+        fake.add_cycle(f'Nightly {r}')
+
+
+def test_loads_same_tree_with_concurrent_loaders(fake: FakeZephyr, url: str, tmp_path):
+    add_release_tree(fake)
+    snapshots = []
+    for loader_workers in (1, 4):
+        path = tmp_path / f'snapshot-{loader_workers}.db'
+        ZephyrService(url, 'token', 3, 5, loader_workers=loader_workers, snapshot_path=path).close()
+        snapshots.append(read_snapshot(path, url, 3, 5))
+    sequential, concurrent = snapshots
+    assert len(sequential.testcase_folders) == len(sequential.requirement_folders) == 3 + 9 + 18
+    assert concurrent.testcase_folders == sequential.testcase_folders
+    assert concurrent.requirement_folders == sequential.requirement_folders
+    assert len(sequential.cycles) == 3
+    assert concurrent.cycles == sequential.cycles
+
+
+def test_resolves_lazy_folders_on_first_use(fake: FakeZephyr, url: str):
+    root = fake.add_tc_folder('R')
+    fake.add_testcase(fake.add_tc_folder('F', root), 'TC 1')
+    fake.add_tc_folder('S')
+    fake.add_req_folder('A', fake.add_req_folder('Q'))
+    with Manager(ZephyrService(url, 'token', 3, 5, lazy=True)) as manager:
+        assert sub_folder_requests(fake) == 0
+        tc = ModelTestCase(name='TC 1', description='', folder=RootFolder('R') / 'F')
+        assert manager.create_test_cases([tc]).present == [tc]
+        assert sub_folder_requests(fake) == 1
+        new_tcs = [ModelTestCase(name='TC 2', description='', folder=RootFolder('R') / 'N')]
+        assert manager.create_test_cases(new_tcs).to_create == new_tcs
+        assert manager.create_test_cases(new_tcs).present == new_tcs
+        assert manager.create_test_cases([tc]).present == [tc]
+        req = Requirement(name='Req 1', description='', folder=RootFolder('Q') / 'A')
+        manager.create_requirements([req])
+        manager.create_requirements([req])
+    assert sub_folder_requests(fake) == 1
+    assert [node['name'] for node in fake.tc_nodes.values()] == ['R', 'F', 'S', 'N']
+    assert fake.count('POST', 'requirementtree/add$') == 0
+    assert [req['requirementTreeId'] for req in fake.requirements.values()] == \
+           [node_id for node_id, node in fake.req_nodes.items() if node['name'] == 'A']
+
+
+def folder_requests(fake: FakeZephyr) -> int:
+    return fake.count('GET', r'testcase/tree/\d+$')
+
+
+def add_test_case_folders(fake: FakeZephyr) -> list[ModelTestCase]:
+    """
+    Adds R/F, R/G and S with two test cases each and returns the test cases
+    """
+    root = fake.add_tc_folder('R')
+    folders = {RootFolder('R') / 'F': fake.add_tc_folder('F', root),
+               RootFolder('R') / 'G': fake.add_tc_folder('G', root),
+               RootFolder('S'): fake.add_tc_folder('S')}
+    tcs = list[ModelTestCase]()
+    for folder, node_id in folders.items():
+        for i in range(2):
+            tc = ModelTestCase(name=f'TC {folder.name} {i}', description='', folder=folder)
+            fake.add_testcase(node_id, tc.name)
+            tcs.append(tc)
+    return tcs
+
+
+def test_fills_all_folders_with_one_release_wide_load(fake: FakeZephyr, url: str):
+    tcs = add_test_case_folders(fake)
+    with Manager(ZephyrService(url, 'token', 3, 5)) as manager:
+        assert manager.service.preload_testcases() == len(tcs)
+        assert fake.count('GET', 'testcase$') == 1
+        assert manager.create_test_cases(tcs).present == tcs
+    assert folder_requests(fake) == 0
+
+
+def test_keeps_only_preloaded_folder(fake: FakeZephyr, url: str):
+    tcs = add_test_case_folders(fake)
+    with Manager(ZephyrService(url, 'token', 3, 5)) as manager:
+        assert manager.service.preload_testcases(RootFolder('R')) == 4
+        assert manager.create_test_cases(tcs).present == tcs
+    # only the test cases outside of the preloaded folder are requested per folder
+    assert folder_requests(fake) == 1
+
+
+def test_loads_test_cases_of_cycle_with_one_release_wide_load(fake: FakeZephyr, url: str):
+    tcs = add_test_case_folders(fake)
+    cycle_id = fake.add_cycle(CYCLE.name)
+    for node_id, node in list(fake.tc_nodes.items()):
+        if node['parentId'] is None:
+            fake.add_phase(cycle_id, node['name'], node_id)
+    for execution in fake.executions[only_phase(fake, cycle_id, 'R')]:
+        execution['lastTestResult'] = {'executionStatus': PASSED.id}
+    with Manager(ZephyrService(url, 'token', 3, 5, bulk_testcase_loading=True)) as manager:
+        assert manager.get_last_execution_status_for_cycle_testcases(CYCLE) == \
+               {tc: PASSED for tc in tcs if tc.folder.parent == RootFolder('R')}
+        assert manager.create_test_cases(tcs).present == tcs
+    assert fake.count('GET', 'testcase$') == 1
+    assert folder_requests(fake) == 0
+
+
+def test_resolves_ids_from_cached_records(fake: FakeZephyr, url: str):
+    root = fake.add_tc_folder('R')
+    folder = fake.add_tc_folder('F', root)
+    tc_ids = [fake.add_testcase(folder, f'TC {i}') for i in range(2)]
+    req_id = fake.add_requirement(fake.add_req_folder('Q'), 'Req 1')
+    cycle_id = fake.add_cycle(CYCLE.name)
+    fake.add_phase(cycle_id, 'R', root)
+    tcs = [ModelTestCase(name=f'TC {i}', description='', folder=RootFolder('R') / 'F') for i in range(2)]
+    with Manager(ZephyrService(url, 'token', 3, 5)) as manager:
+        req = Requirement(name='Req 1', description='', folder=RootFolder('Q'))
+        manager.map_test_cases_to_requirements({req: tcs})
+        manager.execute_testcases(CYCLE, PASSED, tcs[:1])
+    (mapping,) = fake.mappings
+    assert mapping['requirementId'] == req_id
+    assert mapping['modTCRCatalogTree'] == [[root, 0], [folder, 0]]
+    assert mapping['modTestcase'] == [[folder, tc_id + 100000] for tc_id in tc_ids]
+    (execution,) = [execution for execution in fake.executions[only_phase(fake, cycle_id, 'R')]
+                    if execution['tcrTreeTestcase']['testcase']['id'] == tc_ids[0]]
+    assert fake.executed == [(PASSED.id, [execution['id']])]
@@ -0,0 +1,122 @@
+import gzip
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from test_management_sync.zephyr import ConnectionOptions
+from test_management_sync.zephyr.session import ZephyrSession
+from tests.fake_zephyr import FakeZephyr, serve
+
+CALLERS = 5
+
+
+@pytest.fixture
+def fake() -> FakeZephyr:
+    return FakeZephyr()
+
+
+@pytest.fixture
+def slow_fake(fake: FakeZephyr) -> FakeZephyr:
+    handle = fake.handle
+
+    def slow_handle(*args):
+        # concurrent requests reach the session while the first one is in flight
+        time.sleep(0.3)
+        return handle(*args)
+
+    fake.handle = slow_handle
+    return fake
+
+
+@pytest.fixture
+def url(fake: FakeZephyr):
+    with serve(fake) as fake_url:
+        yield fake_url
+
+
+def send_concurrently(send) -> list:
+    barrier = threading.Barrier(CALLERS)
+
+    def call():
+        barrier.wait(5)
+        return send()
+
+    with ThreadPoolExecutor(max_workers=CALLERS) as executor:
+        futures = [executor.submit(call) for _ in range(CALLERS)]
+        return [future.result() for future in futures]
+
+
+def test_coalesces_concurrent_identical_gets(slow_fake: FakeZephyr, url: str):
+    with ZephyrSession(url, 'token', ConnectionOptions(coalesce_gets=True)) as session:
+        responses = send_concurrently(lambda: session.get('/flex/services/rest/latest/user/current'))
+    assert slow_fake.count('GET', 'user/current$') == 1
+    assert [r.json()['id'] for r in responses] == [7] * CALLERS
+    # each caller gets its own response object
+    assert len({id(r) for r in responses}) == CALLERS
+
+
+def test_does_not_coalesce_gets_with_other_params(slow_fake: FakeZephyr, url: str):
+    with ZephyrSession(url, 'token', ConnectionOptions(coalesce_gets=True)) as session:
+        sizes = iter(range(CALLERS))
+        send_concurrently(lambda: session.get('/flex/services/rest/v3/testcase',
+                                              params={'offset': 0, 'pagesize': next(sizes) + 1}))
+    assert slow_fake.count('GET', 'testcase$') == CALLERS
+
+
+def test_does_not_coalesce_gets_by_default(slow_fake: FakeZephyr, url: str):
+    with ZephyrSession(url, 'token') as session:
+        send_concurrently(lambda: session.get('/flex/services/rest/latest/user/current'))
+    assert slow_fake.count('GET', 'user/current$') == CALLERS
+
+
+def test_does_not_coalesce_writes(slow_fake: FakeZephyr, url: str):
+    with ZephyrSession(url, 'token', ConnectionOptions(coalesce_gets=True)) as session:
+        cycle = {'name': 'Nightly', 'cycleStartDate': '01/01/2024', 'cycleEndDate': '01/31/2024'}
+        send_concurrently(lambda: session.post('/flex/services/rest/v3/cycle', json=cycle))
+    assert slow_fake.count('POST', 'cycle$') == CALLERS
+    assert len(slow_fake.cycles) == CALLERS
+
+
+def test_sizes_connection_pool(url: str):
+    with ZephyrSession(url, 'token', ConnectionOptions(pool_size=4, pool_block=True)) as session:
+        for prefix in ('http://', 'https://'):
+            assert session.get_adapter(prefix).poolmanager.connection_pool_kw == {'maxsize': 4, 'block': True}
+
+
+def test_keeps_connections_alive_by_default(url: str):
+    with ZephyrSession(url, 'token') as session:
+        headers = session.get('/flex/services/rest/latest/user/current').request.headers
+    assert headers['Connection'] == 'keep-alive'
+    assert 'gzip' in headers['Accept-Encoding']
+
+
+def test_closes_connection_after_each_request(url: str):
+    options = ConnectionOptions(keep_alive=False, compress_responses=False)
+    with ZephyrSession(url, 'token', options) as session:
+        headers = session.get('/flex/services/rest/latest/user/current').request.headers
+    assert headers['Connection'] == 'close'
+    assert headers['Accept-Encoding'] == 'identity'
+
+
+def test_compresses_big_bulk_request_bodies(fake: FakeZephyr, url: str):
+    body = {'ids': list(range(100)), 'testStepUpdate': False}
+    with ZephyrSession(url, 'token', ConnectionOptions(gzip_request_min_size=100)) as session:
+        request = session.put('/flex/services/rest/v3/execution/bulk', params={'status': '1'}, json=body).request
+    assert request.headers['Content-Encoding'] == 'gzip'
+    assert request.headers['Content-Type'] == 'application/json'
+    assert json.loads(gzip.decompress(request.body)) == body
+    assert fake.executed == [('1', list(range(100)))]
+
+
+def test_sends_small_or_other_request_bodies_uncompressed(fake: FakeZephyr, url: str):
+    cycle = {'name': 'Nightly ' * 20, 'cycleStartDate': '01/01/2024', 'cycleEndDate': '01/31/2024'}
+    with ZephyrSession(url, 'token', ConnectionOptions(gzip_request_min_size=100)) as session:
+        requests = [
+            session.put('/flex/services/rest/v3/execution/bulk', params={'status': '1'}, json={'ids': [1]}).request,
+            session.post('/flex/services/rest/v3/cycle', json=cycle).request,
+        ]
+    assert [request.headers.get('Content-Encoding', None) for request in requests] == [None, None]
+    assert [json.loads(request.body) for request in requests] == [{'ids': [1]}, cycle]
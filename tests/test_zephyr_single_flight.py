@@ -0,0 +1,71 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from test_management_sync.zephyr.single_flight import SingleFlight
+
+CALLERS = 5
+
+
+def call_concurrently(flight: SingleFlight, key: str, call) -> list:
+    """
+    Calls the flight with the same key from several threads at once. Exceptions are returned as results
+    """
+    barrier = threading.Barrier(CALLERS)
+
+    def do():
+        barrier.wait(5)
+        try:
+            return flight.do(key, call)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=CALLERS) as executor:
+        futures = [executor.submit(do) for _ in range(CALLERS)]
+        return [future.result() for future in futures]
+
+
+def slow(result):
+    calls = list[int]()
+
+    def call():
+        calls.append(1)
+        # the other callers join the running call meanwhile
+        time.sleep(0.3)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return call, calls
+
+
+def test_runs_one_call_for_concurrent_callers():
+    call, calls = slow(['result'])
+    results = call_concurrently(SingleFlight(), 'key', call)
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_passes_exception_to_every_caller():
+    error = ValueError('failed')
+    call, calls = slow(error)
+    results = call_concurrently(SingleFlight(), 'key', call)
+    assert len(calls) == 1
+    assert all(result is error for result in results)
+
+
+def test_runs_calls_with_different_keys_separately():
+    flight = SingleFlight()
+    assert flight.do('a', lambda: 1) == 1
+    assert flight.do('b', lambda: 2) == 2
+
+
+def test_runs_call_again_after_previous_one_finished():
+    flight = SingleFlight()
+    assert flight.do('key', lambda: 1) == 1
+    assert flight.do('key', lambda: 2) == 2
+    with pytest.raises(ValueError):
+        flight.do('key', lambda: int('x'))
+    assert flight.do('key', lambda: 3) == 3
@@ -0,0 +1,122 @@
+from datetime import date
+
+import pytest
+
+from test_management_sync.manager import Manager
+from test_management_sync.model import RootFolder, TestCase as ModelTestCase, Cycle, ExecutionStatus, Requirement
+from test_management_sync.zephyr import ZephyrService
+from tests.fake_zephyr import FakeZephyr, serve
+
+CYCLE = Cycle(name='Nightly', start_date=date(2024, 1, 1), end_date=date(2024, 1, 31))
+PASSED = ExecutionStatus(name='Pass', id='1')
+
+
+@pytest.fixture
+def fake() -> FakeZephyr:
+    return FakeZephyr()
+
+
+@pytest.fixture
+def url(fake: FakeZephyr):
+    with serve(fake) as fake_url:
+        yield fake_url
+
+
+def create_service(url: str, tmp_path, **kwargs) -> ZephyrService:
+    return ZephyrService(url, 'token', 3, 5, snapshot_path=tmp_path / 'snapshot.db', **kwargs)
+
+
+def sub_folder_requests(fake: FakeZephyr) -> int:
+    return sum(1 for method, path, query in fake.requests
+               if path.endswith('/testcasetree/lite') and query['type'] == 'Module')
+
+
+def test_checks_sub_folders_from_snapshot_once(fake: FakeZephyr, url: str, tmp_path):
+    root = fake.add_tc_folder('R')
+    fake.add_testcase(fake.add_tc_folder('F', root), 'TC 1')
+    create_service(url, tmp_path).close()
+
+    fake.requests.clear()
+    with Manager(create_service(url, tmp_path)) as manager:
+        assert sub_folder_requests(fake) == 0
+        tc = ModelTestCase(name='TC 1', description='', folder=RootFolder('R') / 'F')
+        assert manager.create_test_cases([tc]).present == [tc]
+        assert manager.create_test_cases([tc]).present == [tc]
+    assert sub_folder_requests(fake) == 1
+
+
+def test_uses_sub_folder_recreated_after_snapshot(fake: FakeZephyr, url: str, tmp_path):
+    root = fake.add_tc_folder('R')
+    old_folder = fake.add_tc_folder('F', root)
+    fake.add_testcase(old_folder, 'TC 1')
+    create_service(url, tmp_path).close()
+    fake.delete_tc_folder(old_folder)
+    new_folder = fake.add_tc_folder('F', root)
+
+    with Manager(create_service(url, tmp_path)) as manager:
+        tc = ModelTestCase(name='TC 1', description='', folder=RootFolder('R') / 'F')
+        assert manager.create_test_cases([tc]).to_create == [tc]
+    assert [tc['tcrCatalogTreeId'] for tc in fake.testcases.values()] == [new_folder]
+
+
+def test_creates_sub_folder_deleted_after_snapshot(fake: FakeZephyr, url: str, tmp_path):
+    root = fake.add_tc_folder('R')
+    folder = fake.add_tc_folder('F', root)
+    fake.add_tc_folder('G', folder)
+    create_service(url, tmp_path).close()
+    fake.delete_tc_folder(folder)
+
+    with Manager(create_service(url, tmp_path)) as manager:
+        manager.create_test_cases([ModelTestCase(name='TC 1', description='', folder=RootFolder('R') / 'F' / 'G')])
+    names = {node['id']: node['name'] for node in fake.tc_nodes.values()}
+    (created,) = fake.testcases.values()
+    leaf = fake.tc_nodes[created['tcrCatalogTreeId']]
+    assert leaf['name'] == 'G'
+    assert names[leaf['parentId']] == 'F'
+    assert fake.tc_nodes[leaf['parentId']]['parentId'] == root
+
+
+def test_uses_requirement_folder_recreated_after_snapshot(fake: FakeZephyr, url: str, tmp_path):
+    root = fake.add_req_folder('Q')
+    old_folder = fake.add_req_folder('A', root)
+    create_service(url, tmp_path).close()
+    del fake.req_nodes[old_folder]
+    new_folder = fake.add_req_folder('A', root)
+
+    with Manager(create_service(url, tmp_path)) as manager:
+        manager.create_requirements([Requirement(name='Req 1', description='', folder=RootFolder('Q') / 'A')])
+    assert [req['requirementTreeId'] for req in fake.requirements.values()] == [new_folder]
+
+
+def test_finds_phase_added_after_snapshot(fake: FakeZephyr, url: str, tmp_path):
+    fake.add_testcase(fake.add_tc_folder('R'), 'TC 1')
+    other_root = fake.add_tc_folder('S')
+    fake.add_testcase(other_root, 'TC 2')
+    with Manager(create_service(url, tmp_path)) as manager:
+        manager.create_cycle(CYCLE)
+        manager.create_phase_from_testcase_tree(CYCLE, RootFolder('R'))
+    (cycle_id,) = fake.cycles.keys()
+    phase_id = fake.add_phase(cycle_id, 'S', tree_id=other_root)
+
+    with Manager(create_service(url, tmp_path)) as manager:
+        manager.execute_testcases(CYCLE, PASSED, [ModelTestCase(name='TC 2', description='', folder=RootFolder('S'))])
+    (execution,) = fake.executions[phase_id]
+    assert fake.execution_status(execution['id']) == PASSED.id
+
+
+def test_uses_cycle_recreated_after_snapshot(fake: FakeZephyr, url: str, tmp_path):
+    root = fake.add_tc_folder('R')
+    fake.add_testcase(root, 'TC 1')
+    with Manager(create_service(url, tmp_path)) as manager:
+        manager.create_cycle(CYCLE)
+    (old_cycle_id,) = fake.cycles.keys()
+    del fake.cycles[old_cycle_id]
+    new_cycle_id = fake.add_cycle(CYCLE.name)
+    phase_id = fake.add_phase(new_cycle_id, 'R', tree_id=root)
+
+    with Manager(create_service(url, tmp_path)) as manager:
+        manager.create_cycle(CYCLE)
+        manager.execute_testcases(CYCLE, PASSED, [ModelTestCase(name='TC 1', description='', folder=RootFolder('R'))])
+    assert list(fake.cycles.keys()) == [new_cycle_id]
+    (execution,) = fake.executions[phase_id]
+    assert fake.execution_status(execution['id']) == PASSED.id
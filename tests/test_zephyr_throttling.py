@@ -0,0 +1,129 @@
+import io
+from typing import Optional
+
+import pytest
+from requests import Response
+
+from test_management_sync.zephyr import throttling
+from test_management_sync.zephyr.throttling import ThrottlingOptions, Throttler, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = list[float]()
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(throttling, 'time', clock)
+    return clock
+
+
+def response(status: int, retry_after: Optional[str] = None) -> Response:
+    r = Response()
+    r.status_code = status
+    r.raw = io.BytesIO()
+    r.url = 'http://zephyr/flex/services/rest/v3/cycle'
+    if retry_after is not None:
+        r.headers['Retry-After'] = retry_after
+    return r
+
+
+def responses(*statuses: int):
+    remaining = [response(status) for status in statuses]
+    sent = list[Response]()
+
+    def send() -> Response:
+        sent.append(remaining.pop(0))
+        return sent[-1]
+
+    return send, sent
+
+
+def test_token_bucket_paces_requests_after_burst(clock: FakeClock):
+    bucket = TokenBucket(rate=2, capacity=2)
+    for _ in range(5):
+        bucket.acquire()
+    assert clock.sleeps == [0.5, 0.5, 0.5]
+
+
+def test_token_bucket_refills_while_idle(clock: FakeClock):
+    bucket = TokenBucket(rate=2, capacity=2)
+    bucket.acquire()
+    bucket.acquire()
+    clock.now += 10
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.sleeps == []
+
+
+@pytest.mark.parametrize('status', [429, 503])
+def test_decreases_concurrency_on_overload(clock: FakeClock, status: int):
+    throttler = Throttler(ThrottlingOptions(initial_concurrency=8))
+    send, _ = responses(status)
+    assert throttler.send('POST', send).status_code == status
+    assert throttler.concurrency_limit == 4
+
+
+def test_decreases_concurrency_on_slow_response(clock: FakeClock):
+    throttler = Throttler(ThrottlingOptions(initial_concurrency=8, target_latency=1.0))
+
+    def send() -> Response:
+        clock.now += 2
+        return response(200)
+
+    throttler.send('GET', send)
+    assert throttler.concurrency_limit == 4
+
+
+def test_does_not_decrease_concurrency_again_for_requests_sent_before_decrease(clock: FakeClock):
+    throttler = Throttler(ThrottlingOptions(initial_concurrency=8))
+    send, _ = responses(503, 503)
+    throttler.send('POST', send)
+    throttler.send('POST', send)
+    assert throttler.concurrency_limit == 4
+
+
+def test_increases_concurrency_on_success(clock: FakeClock):
+    throttler = Throttler(ThrottlingOptions(initial_concurrency=2, max_concurrency=3))
+    send, _ = responses(503, 200, 200, 200, 200, 200)
+    throttler.send('POST', send)
+    assert throttler.concurrency_limit == 1
+    throttler.send('POST', send)
+    assert throttler.concurrency_limit == 2
+    for _ in range(4):
+        throttler.send('POST', send)
+    assert throttler.concurrency_limit == 3
+
+
+def test_waits_retry_after_before_retry(clock: FakeClock):
+    throttler = Throttler(ThrottlingOptions())
+    sent = [response(429, retry_after='3'), response(200)]
+    assert throttler.send('GET', lambda: sent.pop(0)).status_code == 200
+    assert clock.sleeps == [3.0]
+
+
+def test_backs_off_exponentially_without_retry_after(clock: FakeClock):
+    throttler = Throttler(ThrottlingOptions(backoff=1.0, max_backoff=3.0, max_retries=3))
+    send, sent = responses(503, 503, 503, 503)
+    assert throttler.send('GET', send).status_code == 503
+    assert len(sent) == 4
+    assert clock.sleeps == [1.0, 2.0, 3.0]
+
+
+@pytest.mark.parametrize('method', ['POST', 'PUT', 'DELETE'])
+def test_retries_only_get_requests(clock: FakeClock, method: str):
+    throttler = Throttler(ThrottlingOptions())
+    send, sent = responses(503, 200)
+    assert throttler.send(method, send).status_code == 503
+    assert len(sent) == 1
+    assert clock.sleeps == []